@@ -0,0 +1,228 @@
+"""
+Client-side admission control for Bedrock.
+Requests-per-minute and tokens-per-minute token buckets sized to the
+account's quotas, with a priority queue in front of them so interactive
+planner turns are admitted before background work. The admitted rate backs
+off multiplicatively when Bedrock throttles and recovers additively on
+success (AIMD), keeping traffic just under the quota.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from backend.config import get_settings
+from backend.history import estimate_tokens
+from backend.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Seconds of quota a full bucket holds (the largest burst admitted at once)
+_BURST_SECONDS = 10.0
+# AIMD: rate multiplier after a throttle, recovery per successful call, lowest rate
+_DECREASE_FACTOR = 0.7
+_INCREASE_STEP = 0.02
+_MIN_RATE = 0.1
+# Throttles within this many seconds of a decrease count as the same event
+_DECREASE_COOLDOWN = 1.0
+
+
+class AdmissionTimeout(Exception):
+    """A request waited longer than its queue-time limit for admission."""
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """Tokens a Converse request may use: its text plus the output cap."""
+    blocks = list(request.get("system") or [])
+    for message in request.get("messages") or []:
+        blocks.extend(message.get("content") or [])
+    text_tokens = sum(estimate_tokens(block["text"]) for block in blocks if "text" in block)
+    if "toolConfig" in request:
+        text_tokens += estimate_tokens(str(request["toolConfig"]))
+    return text_tokens + int(request.get("inferenceConfig", {}).get("maxTokens", 0))
+
+
+def usage_tokens(usage: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Tokens a Converse response counted against the quota, if it reported usage."""
+    if not usage:
+        return None
+    return int(usage.get("totalTokens") or (usage.get("inputTokens", 0) + usage.get("outputTokens", 0)))
+
+
+class Ticket:
+    """One admitted request; its token estimate is settled against actual usage."""
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.used_tokens: Optional[int] = None
+
+
+class AdmissionController:
+    """
+    RPM/TPM token buckets with a strict priority queue.
+
+    Waiters are served by priority, then arrival order; a waiter that can't
+    be admitted yet blocks everyone behind it, so a large planner turn isn't
+    starved by small background calls. Each priority has its own queue-time
+    limit, after which AdmissionTimeout is raised.
+    """
+
+    def __init__(
+        self,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None,
+        max_queue_time: Optional[float] = None,
+        background_max_queue_time: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.rpm_limit = rpm_limit or settings.bedrock_rpm_limit
+        self.tpm_limit = tpm_limit or settings.bedrock_tpm_limit
+        self.max_queue_time = settings.bedrock_admission_max_queue_time if max_queue_time is None else max_queue_time
+        self.background_max_queue_time = (
+            settings.bedrock_admission_background_max_queue_time
+            if background_max_queue_time is None else background_max_queue_time
+        )
+        self.metrics = get_metrics()
+        self.rate = 1.0
+        self.requests = self._capacity(self.rpm_limit)
+        self.tokens = self._capacity(self.tpm_limit)
+        self._refilled_at = time.monotonic()
+        self._decreased_at = 0.0
+        self._queue: List[Tuple[int, int, asyncio.Future, int]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def _capacity(self, limit: int) -> float:
+        return max(1.0, limit * self.rate * _BURST_SECONDS / 60)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self.requests = min(self._capacity(self.rpm_limit), self.requests + elapsed * self.rpm_limit * self.rate / 60)
+        self.tokens = min(self._capacity(self.tpm_limit), self.tokens + elapsed * self.tpm_limit * self.rate / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until a request of this size can be admitted (0 if it can now)."""
+        # Oversized requests only wait for a full bucket
+        tokens = min(tokens, self._capacity(self.tpm_limit))
+        request_wait = max(0.0, 1 - self.requests) * 60 / (self.rpm_limit * self.rate)
+        token_wait = max(0.0, tokens - self.tokens) * 60 / (self.tpm_limit * self.rate)
+        return max(request_wait, token_wait)
+
+    def _take(self, tokens: int) -> None:
+        self.requests -= 1
+        self.tokens -= min(tokens, self._capacity(self.tpm_limit))
+
+    def _drain(self) -> None:
+        """Admit queued waiters in priority order while the buckets allow it."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        while self._queue:
+            _, _, future, tokens = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._drain)
+                break
+            heapq.heappop(self._queue)
+            self._take(tokens)
+            future.set_result(None)
+        self.metrics.set_gauge("bedrock.admission.queued", len(self._queue))
+
+    async def acquire(self, tokens: int, priority: int = PRIORITY_INTERACTIVE) -> Ticket:
+        """
+        Wait until a request may be sent.
+
+        Args:
+            tokens: Estimated tokens of the request
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND (lower is served first)
+
+        Returns:
+            A ticket to settle with the actual usage
+
+        Raises:
+            AdmissionTimeout: If the queue-time limit for the priority passed
+        """
+        ticket = self.try_acquire(tokens)
+        if ticket is not None:
+            self.metrics.observe("bedrock.admission.queue_time", 0.0)
+            return ticket
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future, tokens))
+        self._drain()
+
+        limit = self.max_queue_time if priority <= PRIORITY_INTERACTIVE else self.background_max_queue_time
+        started = time.monotonic()
+        try:
+            await asyncio.wait({future}, timeout=limit)
+        finally:
+            if not future.done():
+                # Give up the place in the queue; whoever was behind may fit now
+                future.cancel()
+                self._drain()
+        self.metrics.observe("bedrock.admission.queue_time", time.monotonic() - started)
+        if future.cancelled():
+            self.metrics.increment("bedrock.admission.timeouts")
+            logger.warning(f"Bedrock request (priority {priority}) not admitted within {limit}s")
+            raise AdmissionTimeout("Request throttled. Please try again in a moment.")
+        return Ticket(tokens)
+
+    def try_acquire(self, tokens: int) -> Optional[Ticket]:
+        """
+        Admit a request only if it can be sent right away.
+
+        Returns:
+            A ticket, or None if the request would have to queue
+        """
+        self._refill()
+        if self._queue or self._wait_time(tokens) > 0:
+            return None
+        self._take(tokens)
+        return Ticket(tokens)
+
+    def settle(self, ticket: Ticket) -> None:
+        """Correct the token bucket with the request's actual usage and count a success."""
+        if ticket.used_tokens is not None:
+            self._refill()
+            self.tokens = min(self._capacity(self.tpm_limit), self.tokens + ticket.tokens - ticket.used_tokens)
+        self.rate = min(1.0, self.rate + _INCREASE_STEP)
+
+    def on_throttle(self) -> None:
+        """Back off multiplicatively after Bedrock throttled a request."""
+        now = time.monotonic()
+        if now - self._decreased_at < _DECREASE_COOLDOWN:
+            return
+        self._decreased_at = now
+        self._refill()
+        self.rate = max(_MIN_RATE, self.rate * _DECREASE_FACTOR)
+        self.requests = min(self.requests, self._capacity(self.rpm_limit))
+        self.tokens = min(self.tokens, self._capacity(self.tpm_limit))
+        self.metrics.increment("bedrock.admission.throttles")
+        self.metrics.set_gauge("bedrock.admission.rate", self.rate)
+        logger.warning(f"Bedrock throttled, admitting {self.rate:.0%} of the configured quota")
+
+    @asynccontextmanager
+    async def admit(self, request: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[Ticket]:
+        """
+        Hold admission for one Converse request.
+
+        Set ``ticket.used_tokens`` from the response usage inside the block;
+        the ticket is settled when the block exits without an error.
+        """
+        ticket = await self.acquire(estimate_request_tokens(request), priority)
+        yield ticket
+        self.settle(ticket)
+
@@ -1,52 +1,273 @@
 """
 AWS Bedrock client for interacting with Claude models.
-Handles conversation requests and responses using boto3.
+Handles conversation requests and responses (complete or streamed) natively on
+asyncio (SigV4-signed HTTP, see bedrock_http) with the blocking boto3 client
+kept as a fallback.
 """
 
+import asyncio
+import itertools
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, AsyncIterator, Optional, Set, Tuple
 import boto3
+import httpx
 from botocore.exceptions import ClientError, BotoCoreError
 
+from backend.admission import PRIORITY_INTERACTIVE, AdmissionController, Ticket, estimate_request_tokens, usage_tokens
+from backend.bedrock_http import AsyncBedrockRuntime, BedrockAPIError
+from backend.cache import SingleFlight
 from backend.config import get_settings
+from backend.content_types import ContentTypeMemo, get_content_type_memo, match_content_type, memo_key
+from backend.hedging import HedgePolicy, hedged_call, hedged_stream
+from backend.history import estimate_tokens, get_history_builder
+from backend.metrics import get_metrics
+from backend.model_router import TASK_MAPPER, TASK_PLANNER, ModelRouter
 from backend.models import Message
+from backend.planner_cache import PlannerCache, context_digest
+from backend.prompts import ALL_EXAMPLES, assemble_prompt, select_examples
+from backend.streaming import JSONFieldStreamer
 
 logger = logging.getLogger(__name__)
 
+# Tool the planner must call with its decision (Converse toolConfig)
+PLANNER_TOOL_NAME = "respond"
+PLANNER_ACTIONS = ["search", "analyze", "list_analyzed", "clarify", "refine", "chat"]
+
+
+def build_planner_tool(max_limit: int) -> Dict[str, Any]:
+    """
+    Converse toolSpec for the planner's decision.
+
+    ``response`` is the last property so the model emits the action fields
+    first, which lets early dispatch start the search before the text.
+    """
+    return {
+        "toolSpec": {
+            "name": PLANNER_TOOL_NAME,
+            "description": (
+                "Reply to the user and choose the action to take for this turn. "
+                "Set confidence low when the request is ambiguous."
+            ),
+            "inputSchema": {"json": {
+                "type": "object",
+                "properties": {
+                    "action": {"type": "string", "enum": PLANNER_ACTIONS},
+                    "confidence": {
+                        "type": "number", "minimum": 0, "maximum": 1,
+                        "description": "How sure you are that action and term are right"
+                    },
+                    "term": {"type": "string", "description": "Search term (search, analyze)"},
+                    "limit": {
+                        "type": "integer", "minimum": 1, "maximum": max_limit,
+                        "description": "Number of results (search, list_analyzed)"
+                    },
+                    "content_type": {"type": "string", "description": "Exact content type name, if any"},
+                    "analysis_type": {"type": "string", "enum": ["count"]},
+                    "filter_term": {"type": "string", "description": "Filter criteria (refine)"},
+                    "clarify_field": {"type": "string", "enum": ["content_type"]},
+                    "options": {"type": "array", "items": {"type": "string"}},
+                    "response": {"type": "string", "description": "Conversational message for the user"},
+                },
+                "required": ["action", "response"],
+                "additionalProperties": False,
+            }},
+        }
+    }
+
 
 class BedrockClient:
-    """Client for AWS Bedrock Converse API using boto3."""
+    """Client for AWS Bedrock Converse API (async transport plus boto3 fallback)."""
 
     def __init__(self):
         self.settings = get_settings()
         self.model_id = self.settings.bedrock_model_id
         self.timeout = self.settings.request_timeout
+        self.metrics = get_metrics()
 
-        # Initialize boto3 client for Bedrock Runtime
+        # Initialize boto3 session and client for Bedrock Runtime
         # Use credentials from settings if provided, otherwise fall back to AWS defaults
         try:
-            client_config = {
-                'service_name': 'bedrock-runtime',
+            session_config = {
                 'region_name': self.settings.aws_region
             }
 
             # Add credentials if they are provided in settings
             if self.settings.aws_access_key_id and self.settings.aws_secret_access_key:
-                client_config['aws_access_key_id'] = self.settings.aws_access_key_id
-                client_config['aws_secret_access_key'] = self.settings.aws_secret_access_key
+                session_config['aws_access_key_id'] = self.settings.aws_access_key_id
+                session_config['aws_secret_access_key'] = self.settings.aws_secret_access_key
                 if self.settings.aws_session_token:
-                    client_config['aws_session_token'] = self.settings.aws_session_token
+                    session_config['aws_session_token'] = self.settings.aws_session_token
                 logger.info(f"Using credentials from settings for region {self.settings.aws_region}")
             else:
                 logger.info(f"Using default AWS credential chain for region {self.settings.aws_region}")
 
-            self.client = boto3.client(**client_config)
+            self.session = boto3.Session(**session_config)
+            self.client = self.session.client('bedrock-runtime')
+            self.async_runtime = AsyncBedrockRuntime(
+                self.session,
+                region=self.settings.aws_region,
+                timeout=self.timeout,
+                max_connections=self.settings.bedrock_max_connections
+            )
+            self.hedge_runtimes: List[AsyncBedrockRuntime] = []
+            if self.settings.bedrock_hedge_enabled:
+                self.hedge_runtimes = [
+                    AsyncBedrockRuntime(
+                        self.session,
+                        region=region,
+                        timeout=self.timeout,
+                        max_connections=self.settings.bedrock_max_connections
+                    )
+                    for region in self.settings.bedrock_hedge_regions
+                    if region != self.settings.aws_region
+                ]
+            self._hedge_rotation = itertools.cycle(self.hedge_runtimes)
+            self._hedge_policies: Dict[Tuple[str, str], HedgePolicy] = {}
+            self._concurrency = asyncio.Semaphore(max(1, self.settings.bedrock_max_concurrency))
+            self._in_flight = 0
+            self.prompt_cache_enabled = self.settings.bedrock_prompt_cache_enabled
+            self._uncached_models: Set[str] = set()
+            # Older botocore releases reject cachePoint blocks client-side
+            self._boto_cache_points = "cachePoint" in self._boto_system_block_members()
+            self.router = ModelRouter()
+            self._system_variants: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            self.content_types: List[str] = []
+            self._content_type_memo: Optional[ContentTypeMemo] = None
+            self._mapping_flights = SingleFlight("content_type")
+            self.admission: Optional[AdmissionController] = None
+            if self.settings.bedrock_admission_enabled:
+                self.admission = AdmissionController()
+            self.planner_cache: Optional[PlannerCache] = None
+            if self.settings.planner_cache_enabled:
+                self.planner_cache = PlannerCache()
             logger.info(f"Initialized Bedrock client for region {self.settings.aws_region}")
         except Exception as e:
             logger.error(f"Failed to initialize Bedrock client: {str(e)}")
             raise
 
+    @property
+    def system_blocks(self) -> List[Dict[str, Any]]:
+        """System content blocks with every example block (see _system_blocks_for)."""
+        return self._system_blocks_for(ALL_EXAMPLES)
+
+    def _system_blocks_for(self, examples: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        """
+        System content blocks for a prompt variant (a set of example blocks).
+
+        Each variant is built once per client. Unless prompt caching is off,
+        it is followed by a ``cachePoint`` so Bedrock can reuse the processed
+        prompt across turns that use the same variant (stripped per call for
+        models that reject it).
+        """
+        blocks = self._system_variants.get(examples)
+        if blocks is None:
+            blocks = [{"text": self._build_system_prompt(examples)}]
+            if self.prompt_cache_enabled:
+                blocks.append({"cachePoint": {"type": "default"}})
+            self._system_variants[examples] = blocks
+            self.metrics.set_gauge("bedrock.prompt.variants", len(self._system_variants))
+        return blocks
+
+    def _boto_system_block_members(self) -> Set[str]:
+        """System content block types the installed botocore can serialize."""
+        try:
+            return set(self.client.meta.service_model.shape_for("SystemContentBlock").members)
+        except Exception as e:
+            logger.warning(f"Could not read the Converse system block shape from botocore: {e}")
+            return set()
+
+    def supports_prompt_cache(self, model_id: str) -> bool:
+        """Whether requests to this model are sent with cache points."""
+        return self.prompt_cache_enabled and model_id not in self._uncached_models
+
+    def _for_model(self, request: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+        """The request as sent to a model: without cache points if the model rejected them."""
+        if self.supports_prompt_cache(model_id):
+            return request
+        return self._without_cache_points(request)
+
+    @staticmethod
+    def _without_cache_points(request: Dict[str, Any]) -> Dict[str, Any]:
+        """The request with any cachePoint system blocks removed."""
+        system = request.get("system") or []
+        if not any("cachePoint" in block for block in system):
+            return request
+        return {**request, "system": [block for block in system if "cachePoint" not in block]}
+
+    def _cache_fallback(
+        self,
+        error_code: str,
+        error_message: str,
+        request: Dict[str, Any],
+        model_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Handle a model that doesn't support prompt caching.
+
+        If Bedrock rejected the request because of its cache points, prompt
+        caching is turned off for that model and the request is returned
+        without them so it can be retried once.
+
+        Returns:
+            The request without cache points, or None if the error is unrelated
+        """
+        system = request.get("system") or []
+        if error_code != "ValidationException" or "cach" not in (error_message or "").lower():
+            return None
+        if not any("cachePoint" in block for block in system):
+            return None
+        logger.warning(f"Model {model_id} rejected prompt caching, disabling it for that model: {error_message}")
+        self._uncached_models.add(model_id)
+        self.metrics.increment("bedrock.prompt_cache.disabled")
+        return self._for_model(request, model_id)
+
+    def _retry_plan(
+        self,
+        error_code: str,
+        error_message: str,
+        request: Dict[str, Any],
+        model_id: str
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Decide how to retry a failed Converse call once.
+
+        The same model is retried without cache points if it rejected them; a
+        routed model that is missing or not enabled in the account is dropped
+        and the call goes to the default model instead.
+
+        Returns:
+            (model ID, request) to retry with, or None to raise the error
+        """
+        retry_request = self._cache_fallback(error_code, error_message, request, model_id)
+        if retry_request is not None:
+            return model_id, retry_request
+        model_rejected = error_code in ("ResourceNotFoundException", "AccessDeniedException") or (
+            error_code == "ValidationException" and "model identifier" in (error_message or "").lower()
+        )
+        if model_rejected and self.router.mark_unavailable(model_id):
+            default_model = self.router.default_model
+            return default_model, self._for_model(request, default_model)
+        return None
+
+    def _record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """Record token usage, including prompt cache reads and writes, from a Converse response."""
+        if not usage:
+            return
+        for key, name in (
+            ("inputTokens", "input"),
+            ("outputTokens", "output"),
+            ("cacheReadInputTokens", "cache_read"),
+            ("cacheWriteInputTokens", "cache_write"),
+        ):
+            self.metrics.increment(f"bedrock.tokens.{name}", int(usage.get(key) or 0))
+        logger.info(
+            f"Bedrock usage: input={usage.get('inputTokens', 0)}, output={usage.get('outputTokens', 0)}, "
+            f"cache_read={usage.get('cacheReadInputTokens', 0)}, cache_write={usage.get('cacheWriteInputTokens', 0)}"
+        )
+
     def _format_messages(self, conversation_history: List[Message], current_message: str) -> List[Dict[str, Any]]:
         """
         Format conversation history and current message for Bedrock API.
@@ -75,146 +296,56 @@ class BedrockClient:
 
         return messages
 
-    def _build_system_prompt(self) -> str:
-        """Build the system prompt for the Claude model."""
-        return """You are an AI assistant helping users discover and analyze content in Storyblok.
-
-Your role:
-- Help users search for content using natural language
-- Analyze content (count, identify patterns, summarize)
-- Ask clarifying questions when needed (especially about content types)
-- Interpret their search queries and convert them to search terms
-- Extract the number of results the user wants (if specified)
-- Filter and refine previous search results based on follow-up questions
-- Present search results in a clear, conversational way
-- Help users refine their searches through follow-up questions
-- Be concise but friendly and helpful
-
-IMPORTANT: You MUST respond ONLY with valid JSON. No extra text before or after the JSON.
-
-## Action Types
-
-### 1. NEW SEARCH (action: "search")
-When a user asks to search for NEW content (e.g., "find marketing stories", "show blog posts"):
-- Extract the key search terms from their query
-- Extract the number of results if specified
-- DO NOT include content_type unless absolutely necessary - search broadly by default
-- Return: {"action": "search", "term": "search term", "limit": 10, "response": "message"}
-
-Examples:
-- "find all marketing stories" → {"action": "search", "term": "marketing", "limit": 10, "response": "Here are the marketing stories I found:"}
-- "find the first 5 articles about marketing" → {"action": "search", "term": "marketing articles", "limit": 5, "response": "Here are 5 marketing articles:"}
-- "show me blog posts about AI" → {"action": "search", "term": "AI blog posts", "limit": 10, "response": "Here are blog posts about AI:"}
-- "find articles mentioning Drupal" → {"action": "search", "term": "Drupal", "limit": 10, "response": "Here are the stories mentioning Drupal:"}
-
-### 2. ANALYZE/COUNT (action: "analyze")
-When a user wants to COUNT or ANALYZE content WITHOUT immediately listing results:
-- Extract the search term and what to analyze
-- Return: {"action": "analyze", "term": "search term", "analysis_type": "count", "response": "I'll check how many articles mention that..."}
-
-Examples:
-- "how many articles mention drupal?" → {"action": "analyze", "term": "drupal", "content_type": "article", "analysis_type": "count", "response": "Let me check how many articles mention Drupal..."}
-- "do we have any blog posts about React?" → {"action": "analyze", "term": "React", "content_type": "blog_post", "analysis_type": "count", "response": "Let me see if we have blog posts about React..."}
-
-After analysis shows results, if user says "yes please" or "show them" or "list them":
-→ {"action": "list_analyzed", "limit": 10, "response": "Here are the articles:"}
-
-If user specifies a limit when confirming:
-- "yes, but limit to 10" → {"action": "list_analyzed", "limit": 10, "response": "Here are the first 10:"}
-- "show me the first 5" → {"action": "list_analyzed", "limit": 5, "response": "Here are the first 5:"}
-- "just show 3" → {"action": "list_analyzed", "limit": 3, "response": "Here are 3 of them:"}
-
-### 3. CLARIFY CONTENT TYPE (action: "clarify")
-When the query is ambiguous about content type, ask for clarification:
-- Return: {"action": "clarify", "clarify_field": "content_type", "options": ["article", "blog_post", "page"], "response": "message"}
-
-Examples:
-- "find stories about marketing" → {"action": "clarify", "clarify_field": "content_type", "options": ["article", "blog_post", "page"], "response": "What type of content are you looking for? Articles, blog posts, pages, or all types?"}
-
-### 4. REFINE/FILTER PREVIOUS RESULTS (action: "refine")
-When a user wants to FILTER or NARROW DOWN results from the previous search (e.g., "out of those", "from these", "which one"):
-- Extract the filter criteria (keywords, topics, attributes)
-- Return: {"action": "refine", "filter_term": "criteria", "response": "message"}
-
-Examples:
-- Previous: [10 marketing stories shown]
-  User: "out of those stories, give me the one which mentions omnichannel"
-  → {"action": "refine", "filter_term": "omnichannel", "response": "Here's the story that mentions omnichannel:"}
-
-- Previous: [8 blog posts shown]
-  User: "from these, show me only the ones about AI"
-  → {"action": "refine", "filter_term": "AI", "response": "Here are the posts about AI:"}
-
-### 5. CHAT (action: "chat")
-When just chatting or acknowledging: {"action": "chat", "response": "your response"}
-
-## Content Types
-Common content types in Storyblok:
+    def _build_system_prompt(self, examples: Optional[Tuple[str, ...]] = None) -> str:
+        """Build the system prompt for the Claude model with the given example blocks (all by default)."""
+        if self.settings.bedrock_tool_use_enabled:
+            output_format = (
+                f"IMPORTANT: Always answer by calling the {PLANNER_TOOL_NAME} tool. "
+                "Its input is the JSON object described below; do not write any other text."
+            )
+        else:
+            output_format = "IMPORTANT: You MUST respond ONLY with valid JSON. No extra text before or after the JSON."
+        return assemble_prompt(output_format, self._content_types_section(), examples)
+
+    def _content_types_section(self) -> str:
+        """Content types listed in the system prompt: the space's catalog once loaded."""
+        if not self.content_types:
+            return """Common content types in Storyblok:
 - "article" - news articles, blog articles
 - "blog_post" - blog posts
 - "page" - regular pages
 - "landing_page" - landing pages
 - "post" - generic posts
+"""
+        limit = self.settings.component_catalog_max_prompt_types
+        lines = "\n".join(f'- "{name}"' for name in self.content_types[:limit])
+        return f"""This space's content types (Storyblok components):
+{lines}
 
-## How to Distinguish Actions
-
-Use "analyze" when:
-- User asks "how many", "do we have", "are there"
-- User wants to know about content WITHOUT seeing the list first
-- Analytical/counting questions
-
-Use "clarify" when:
-- Content type is ambiguous or not specified
-- User says "stories" without specifying type
-- You need more information to proceed accurately
-
-Use "refine" when:
-- User references previous results: "out of those", "from these", "which one"
-- User wants to filter/narrow: "only the ones", "just show"
-- Context indicates they're working with existing results
-
-Use "search" when:
-- User asks for new/different content with clear intent
-- Content type is specified or obvious from context
-- Direct search request
-
-Use "list_analyzed" when:
-- User confirms they want to see the analyzed results
-- Follow-up to analyze action
-
-## Important Rules
-- limit field is REQUIRED for "search" actions (default to 10)
-- filter_term field is REQUIRED for "refine" actions
-- content_type is OPTIONAL but recommended for "search" and "analyze"
-- The response field should be conversational and natural
-- Always check conversation history to understand context
-- When unclear about content type, use "clarify" action
+When you set content_type (or offer content type options), use one of these exact names.
+"""
 
-Always be helpful and accessible. Remember that some users may have disabilities and rely on voice interaction."""
+    def set_content_types(self, content_types: List[str]) -> None:
+        """
+        Use the space's content types in the system prompt (see ComponentCatalog).
 
-    def converse(
+        The prompt variants are rebuilt on the next turns, which also starts
+        new prompt cache entries.
+        """
+        content_types = list(content_types)
+        if content_types == self.content_types:
+            return
+        self.content_types = content_types
+        self._system_variants.clear()
+        logger.info(f"System prompt now lists {len(content_types)} content types from the component catalog")
+
+    def _build_context_message(
         self,
         message: str,
-        conversation_history: List[Message],
         previous_results: Optional[List[Dict[str, Any]]] = None,
         previous_analysis: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """
-        Send a message to Claude and get a response.
-
-        Args:
-            message: The user's message
-            conversation_history: Previous conversation messages
-            previous_results: Optional list of previous search results for context
-            previous_analysis: Optional previous analysis data for context
-
-        Returns:
-            Dict containing the response and any extracted actions
-
-        Raises:
-            Exception: If the API request fails
-        """
-        # Add context about previous results and analysis if available
+    ) -> str:
+        """Append previous results and analysis context to the user's message."""
         context_message = message
         if previous_results:
             # Add results context to help Claude understand what to refine
@@ -224,146 +355,626 @@ Always be helpful and accessible. Remember that some users may have disabilities
                 results_summary += f" and {len(previous_results) - 10} more"
             results_summary += "]"
             context_message = message + results_summary
-        
+
         if previous_analysis:
             # Add analysis context
             analysis_summary = f"\n\n[PREVIOUS ANALYSIS: {previous_analysis.get('description', 'Analysis performed')}. "
             analysis_summary += f"Count: {previous_analysis.get('count', 0)} items]"
             context_message = context_message + analysis_summary
-        
-        messages = self._format_messages(conversation_history, context_message)
 
-        request_body = {
-            "messages": messages,
-            "system": [{"text": self._build_system_prompt()}],
+        return context_message
+
+    def _build_converse_request(
+        self,
+        message: str,
+        conversation_history: List[Message],
+        previous_results: Optional[List[Dict[str, Any]]] = None,
+        previous_analysis: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the Converse request body (without modelId) for a conversation turn."""
+        context_message = self._build_context_message(message, previous_results, previous_analysis)
+        # Fit the history (and the result context above) to the input token budget
+        history, context_message, _ = get_history_builder().fit(conversation_history, context_message)
+        # Only the example blocks this turn is likely to need
+        examples = ALL_EXAMPLES
+        if self.settings.planner_dynamic_examples_enabled:
+            examples = select_examples(message, bool(previous_results), bool(previous_analysis))
+        system = self._system_blocks_for(examples)
+        self.metrics.observe("bedrock.prompt.system_tokens", estimate_tokens(system[0]["text"]))
+        request = {
+            "messages": self._format_messages(history, context_message),
+            "system": system,
             "inferenceConfig": {
-                "maxTokens": 2048,
+                "maxTokens": self.settings.bedrock_planner_max_tokens,
                 "temperature": 0.7,
                 "topP": 0.9
             }
         }
+        if self.settings.bedrock_tool_use_enabled:
+            request["toolConfig"] = {
+                "tools": [build_planner_tool(self.settings.search_max_results)],
+                "toolChoice": {"tool": {"name": PLANNER_TOOL_NAME}},
+            }
+        return request
 
-        logger.info(f"Sending request to Bedrock with {len(messages)} messages")
+    def _parse_converse_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a Converse response into the action dict returned by converse().
+
+        Args:
+            response: Converse API response body
+
+        Returns:
+            Dict containing the response and any extracted actions
+        """
+        # Extract the response text
+        output = response.get("output", {})
+        message_data = output.get("message", {})
+        content_blocks = message_data.get("content", [])
+
+        if not content_blocks:
+            logger.error("No content in Bedrock response")
+            return {
+                "action": "error",
+                "term": None,
+                "filter_term": None,
+                "limit": 10,
+                "content_type": None,
+                "analysis_type": None,
+                "clarify_field": None,
+                "options": None,
+                "response": "I apologize, but I couldn't generate a response. Please try again."
+            }
 
+        if response.get("stopReason") == "max_tokens":
+            self.metrics.increment("bedrock.planner.truncated")
+            logger.warning(f"Planner output hit maxTokens ({self.settings.bedrock_planner_max_tokens})")
+
+        # Structured output: the planner tool's input is already parsed JSON
+        tool_input = next(
+            (
+                block["toolUse"].get("input") for block in content_blocks
+                if "toolUse" in block and block["toolUse"].get("name") == PLANNER_TOOL_NAME
+            ),
+            None
+        )
+        if isinstance(tool_input, dict):
+            return self._decision_from_json(tool_input, json.dumps(tool_input))
+
+        response_text = next((block["text"] for block in content_blocks if "text" in block), "")
+        logger.info(f"Raw Claude response: {response_text[:200]}...")
+
+        # Try to parse JSON from the response
         try:
-            # Call Bedrock Converse API
-            response = self.client.converse(
-                modelId=self.model_id,
-                messages=request_body["messages"],
-                system=request_body["system"],
-                inferenceConfig=request_body["inferenceConfig"]
-            )
+            # Check if response contains JSON
+            if "{" in response_text and "}" in response_text:
+                # Extract JSON portion
+                start_idx = response_text.find("{")
+                end_idx = response_text.rfind("}") + 1
+                json_str = response_text[start_idx:end_idx]
+                parsed_response = json.loads(json_str)
+                return self._decision_from_json(parsed_response, response_text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Could not parse JSON from response: {e}, treating as chat")
+            logger.debug(f"Failed to parse: {response_text}")
+
+        # Default to chat action if no JSON found
+        logger.warning("No valid JSON found in response, defaulting to chat action")
+        return {
+            "action": "chat",
+            "term": None,
+            "filter_term": None,
+            "limit": 10,
+            "content_type": None,
+            "analysis_type": None,
+            "clarify_field": None,
+            "options": None,
+            "response": response_text,
+            "raw_response": response_text,
+            "parse_failed": True
+        }
 
-            logger.info("Received response from Bedrock")
-
-            # Extract the response text
-            output = response.get("output", {})
-            message_data = output.get("message", {})
-            content_blocks = message_data.get("content", [])
-
-            if content_blocks and len(content_blocks) > 0:
-                response_text = content_blocks[0].get("text", "")
-                logger.info(f"Raw Claude response: {response_text[:200]}...")
-
-                # Try to parse JSON from the response
-                try:
-                    # Check if response contains JSON
-                    if "{" in response_text and "}" in response_text:
-                        # Extract JSON portion
-                        start_idx = response_text.find("{")
-                        end_idx = response_text.rfind("}") + 1
-                        json_str = response_text[start_idx:end_idx]
-                        parsed_response = json.loads(json_str)
-                        
-                        action = parsed_response.get("action", "chat")
-                        logger.info(f"Parsed action: {action}, term: {parsed_response.get('term')}, filter_term: {parsed_response.get('filter_term')}, limit: {parsed_response.get('limit')}")
-
-                        return {
-                            "action": action,
-                            "term": parsed_response.get("term"),
-                            "filter_term": parsed_response.get("filter_term"),
-                            "limit": parsed_response.get("limit", 10),
-                            "content_type": parsed_response.get("content_type"),
-                            "analysis_type": parsed_response.get("analysis_type"),
-                            "clarify_field": parsed_response.get("clarify_field"),
-                            "options": parsed_response.get("options"),
-                            "response": parsed_response.get("response", response_text),
-                            "raw_response": response_text
-                        }
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Could not parse JSON from response: {e}, treating as chat")
-                    logger.debug(f"Failed to parse: {response_text}")
-
-                # Default to chat action if no JSON found
-                logger.warning("No valid JSON found in response, defaulting to chat action")
-                return {
-                    "action": "chat",
-                    "term": None,
-                    "filter_term": None,
-                    "limit": 10,
-                    "content_type": None,
-                    "analysis_type": None,
-                    "clarify_field": None,
-                    "options": None,
-                    "response": response_text,
-                    "raw_response": response_text
-                }
-            else:
-                logger.error("No content in Bedrock response")
-                return {
-                    "action": "error",
-                    "term": None,
-                    "filter_term": None,
-                    "limit": 10,
-                    "content_type": None,
-                    "analysis_type": None,
-                    "clarify_field": None,
-                    "options": None,
-                    "response": "I apologize, but I couldn't generate a response. Please try again."
-                }
+    def _decision_from_json(self, parsed_response: Dict[str, Any], response_text: str) -> Dict[str, Any]:
+        """Build the action dict from the planner's JSON (tool input or scraped text)."""
+        action = parsed_response.get("action", "chat")
+        logger.info(f"Parsed action: {action}, term: {parsed_response.get('term')}, filter_term: {parsed_response.get('filter_term')}, limit: {parsed_response.get('limit')}")
+
+        return {
+            "action": action,
+            "confidence": parsed_response.get("confidence"),
+            "term": parsed_response.get("term"),
+            "filter_term": parsed_response.get("filter_term"),
+            "limit": parsed_response.get("limit", 10),
+            "content_type": parsed_response.get("content_type"),
+            "analysis_type": parsed_response.get("analysis_type"),
+            "clarify_field": parsed_response.get("clarify_field"),
+            "options": parsed_response.get("options"),
+            "response": parsed_response.get("response", response_text),
+            "raw_response": response_text
+        }
+
+    def _api_error(self, error_code: str, error_message: str, model_id: Optional[str] = None) -> Exception:
+        """Map a Bedrock error code to the exception raised to callers."""
+        logger.error(f"Bedrock API ClientError [{error_code}]: {error_message}")
+
+        # Provide more helpful error messages
+        if error_code == 'AccessDeniedException':
+            return Exception(f"Access denied to Bedrock. Please check your AWS credentials and permissions.")
+        elif error_code == 'ResourceNotFoundException':
+            return Exception(f"Model {model_id or self.model_id} not found. Please check the model ID.")
+        elif error_code == 'ThrottlingException':
+            self._on_throttle()
+            return Exception(f"Request throttled. Please try again in a moment.")
+        else:
+            return Exception(f"Bedrock API error [{error_code}]: {error_message}")
+
+    def _call_converse(self, model_id: Optional[str] = None, **request: Any) -> Dict[str, Any]:
+        """
+        Call the Converse API with boto3 (blocking), on model_id or the default model.
 
+        Cache points are dropped when the installed botocore doesn't model
+        them; it would reject the request before sending it.
+        """
+        model_id = model_id or self.model_id
+        request = self._for_model(request, model_id)
+        if not self._boto_cache_points:
+            request = self._without_cache_points(request)
+        started = time.perf_counter()
+        try:
+            try:
+                with self.metrics.timer("bedrock.latency"):
+                    response = self.client.converse(modelId=model_id, **request)
+            except ClientError as e:
+                error = e.response.get('Error', {})
+                retry = self._retry_plan(error.get('Code', 'Unknown'), error.get('Message', str(e)), request, model_id)
+                if retry is None:
+                    raise
+                model_id, retry_request = retry
+                response = self.client.converse(modelId=model_id, **retry_request)
         except ClientError as e:
+            self.router.record(model_id, time.perf_counter() - started, error=True)
             error_code = e.response.get('Error', {}).get('Code', 'Unknown')
             error_message = e.response.get('Error', {}).get('Message', str(e))
-            logger.error(f"Bedrock API ClientError [{error_code}]: {error_message}")
-
-            # Provide more helpful error messages
-            if error_code == 'AccessDeniedException':
-                raise Exception(f"Access denied to Bedrock. Please check your AWS credentials and permissions.")
-            elif error_code == 'ResourceNotFoundException':
-                raise Exception(f"Model {self.model_id} not found. Please check the model ID.")
-            elif error_code == 'ThrottlingException':
-                raise Exception(f"Request throttled. Please try again in a moment.")
-            else:
-                raise Exception(f"Bedrock API error [{error_code}]: {error_message}")
-
+            raise self._api_error(error_code, error_message, model_id)
         except BotoCoreError as e:
+            self.router.record(model_id, time.perf_counter() - started, error=True)
             logger.error(f"Boto core error: {str(e)}")
             raise Exception(f"AWS connection error: {str(e)}")
+        self.router.record(model_id, time.perf_counter() - started)
+        self._record_usage(response.get("usage"))
+        return response
 
-        except Exception as e:
-            logger.error(f"Unexpected error in Bedrock client: {str(e)}")
+    @asynccontextmanager
+    async def _async_slot(self):
+        """
+        Hold one of the ``bedrock_max_concurrency`` async call slots.
+
+        Bedrock error responses and connection errors raised inside are mapped
+        to the same exceptions as the boto3 path.
+        """
+        async with self._concurrency:
+            self._in_flight += 1
+            self.metrics.set_gauge("bedrock.in_flight", self._in_flight)
+            try:
+                yield
+            except BedrockAPIError as e:
+                raise self._api_error(e.code, e.message)
+            except httpx.HTTPError as e:
+                logger.error(f"Bedrock connection error: {str(e)}")
+                raise Exception(f"AWS connection error: {str(e)}")
+            finally:
+                self._in_flight -= 1
+                self.metrics.set_gauge("bedrock.in_flight", self._in_flight)
+
+    def _on_throttle(self) -> None:
+        """Tell admission control Bedrock throttled a call (including ones a hedge recovered)."""
+        if self.admission is not None:
+            self.admission.on_throttle()
+
+    def _admit_hedge(self, request: Dict[str, Any]) -> bool:
+        """Take admission for a hedged duplicate if it can be sent right away (hedges never queue)."""
+        if self.admission is None:
+            return True
+        return self.admission.try_acquire(estimate_request_tokens(request)) is not None
+
+    def _hedge_policy(self, operation: str, model_id: str) -> HedgePolicy:
+        """Hedge delay and budget for one operation on one model (their latencies differ)."""
+        key = (operation, model_id)
+        if key not in self._hedge_policies:
+            self._hedge_policies[key] = HedgePolicy()
+        return self._hedge_policies[key]
+
+    async def _runtime_converse(self, model_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Converse on the async transport, hedged to a secondary region when configured."""
+        if not self.hedge_runtimes:
+            return await self.async_runtime.converse(modelId=model_id, **request)
+        secondary = next(self._hedge_rotation)
+        return await hedged_call(
+            self._hedge_policy("converse", model_id),
+            lambda: self.async_runtime.converse(modelId=model_id, **request),
+            lambda: secondary.converse(modelId=model_id, **request),
+            on_throttle=self._on_throttle,
+            admit_hedge=lambda: self._admit_hedge(request)
+        )
+
+    def _runtime_stream(self, model_id: str, request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """ConverseStream on the async transport, hedged on the first event when configured."""
+        if not self.hedge_runtimes:
+            return self.async_runtime.converse_stream(modelId=model_id, **request)
+        secondary = next(self._hedge_rotation)
+        return hedged_stream(
+            self._hedge_policy("converse_stream", model_id),
+            lambda: self.async_runtime.converse_stream(modelId=model_id, **request),
+            lambda: secondary.converse_stream(modelId=model_id, **request),
+            on_throttle=self._on_throttle,
+            admit_hedge=lambda: self._admit_hedge(request)
+        )
+
+    @asynccontextmanager
+    async def _admitted(self, request: Dict[str, Any], priority: int) -> AsyncIterator[Ticket]:
+        """Wait for admission (when admission control is on) before sending a request."""
+        if self.admission is None:
+            yield Ticket(0)
+            return
+        async with self.admission.admit(request, priority) as ticket:
+            yield ticket
+
+    async def _acall_converse(
+        self,
+        model_id: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        **request: Any
+    ) -> Dict[str, Any]:
+        """
+        Call the Converse API without blocking the event loop.
+
+        Waits for admission, then uses the SigV4-signed async transport,
+        limited to ``bedrock_max_concurrency`` calls in flight. With
+        ``bedrock_async_enabled`` off, the boto3 call runs in a worker thread.
+        """
+        async with self._admitted(request, priority) as ticket:
+            if self.settings.bedrock_async_enabled:
+                response = await self._aconverse_runtime(model_id or self.model_id, request)
+            else:
+                response = await asyncio.to_thread(lambda: self._call_converse(model_id, **request))
+            ticket.used_tokens = usage_tokens(response.get("usage"))
+        return response
+
+    async def _aconverse_runtime(self, model_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Converse on the async transport with per-model retries and latency recording."""
+        request = self._for_model(request, model_id)
+        started = time.perf_counter()
+        try:
+            async with self._async_slot():
+                with self.metrics.timer("bedrock.latency"):
+                    try:
+                        response = await self._runtime_converse(model_id, request)
+                    except BedrockAPIError as e:
+                        retry = self._retry_plan(e.code, e.message, request, model_id)
+                        if retry is None:
+                            raise
+                        model_id, retry_request = retry
+                        response = await self._runtime_converse(model_id, retry_request)
+        except Exception:
+            self.router.record(model_id, time.perf_counter() - started, error=True)
             raise
+        self.router.record(model_id, time.perf_counter() - started)
+        self._record_usage(response.get("usage"))
+        return response
+
+    async def _stream_events(self, request: Dict[str, Any], model_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """ConverseStream events, retried once (see _retry_plan) if the call fails before any event."""
+        request = self._for_model(request, model_id)
+        started = False
+        events = self._runtime_stream(model_id, request)
+        try:
+            async for event in events:
+                started = True
+                yield event
+        except BedrockAPIError as e:
+            retry = None if started else self._retry_plan(e.code, e.message, request, model_id)
+            if retry is None:
+                raise
+            retry_model, retry_request = retry
+            events = self._runtime_stream(retry_model, retry_request)
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+
+    def _planner_digest(
+        self,
+        conversation_history: List[Message],
+        previous_results: Optional[List[Dict[str, Any]]],
+        previous_analysis: Optional[Dict[str, Any]]
+    ) -> str:
+        """Planner cache context: history, session context and the prompt's content types."""
+        return context_digest(conversation_history, previous_results, previous_analysis, extra=self.content_types)
+
+    def _cached_decision(self, message: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached planner decision for this turn, if any."""
+        if self.planner_cache is None:
+            return None
+        cached = self.planner_cache.get(message, digest)
+        if cached is not None:
+            logger.info(f"Planner cache hit, skipping Bedrock (action: {cached.get('action')})")
+        return cached
+
+    def _remember_decision(self, message: str, digest: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a fresh planner decision and return it unchanged."""
+        if self.planner_cache is not None:
+            self.planner_cache.set(message, digest, result)
+        return result
+
+    def _escalation_reason(self, decision: Dict[str, Any]) -> Optional[str]:
+        """
+        Why a planner decision should be retried on the larger model, if it should.
 
+        Args:
+            decision: Parsed decision, or the fields streamed so far
 
-    def map_content_type(
+        Returns:
+            A short reason, or None if the decision can be used as is
+        """
+        action = decision.get("action")
+        if action == "error" or decision.get("parse_failed"):
+            return "unparseable output"
+        if action not in PLANNER_ACTIONS:
+            return f"unknown action {action!r}"
+        confidence = decision.get("confidence")
+        if isinstance(confidence, (int, float)) and confidence < self.settings.bedrock_escalation_confidence:
+            return f"low confidence ({confidence})"
+        if action in ("search", "analyze") and not decision.get("term"):
+            return f"{action} without a term"
+        if action == "refine" and not decision.get("filter_term"):
+            return "refine without a filter term"
+        return None
+
+    def _note_escalation(self, model_id: str, target: str, reason: str) -> None:
+        self.metrics.increment("bedrock.routing.escalations")
+        logger.info(f"Escalating planner turn from {model_id} to {target}: {reason}")
+
+    def _plan(self, request: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+        """Planner turn on model_id, escalated once to the larger model if the decision is unusable."""
+        result = self._parse_converse_response(self._call_converse(model_id, **request))
+        target = self.router.escalation_model(model_id)
+        reason = self._escalation_reason(result) if target else None
+        if reason:
+            self._note_escalation(model_id, target, reason)
+            result = self._parse_converse_response(self._call_converse(target, **request))
+        return result
+
+    async def _aplan(
         self,
-        user_request: str,
-        available_content_types: List[str]
-    ) -> Optional[str]:
+        request: Dict[str, Any],
+        model_id: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
+        """Async version of _plan()."""
+        result = self._parse_converse_response(await self._acall_converse(model_id, priority, **request))
+        target = self.router.escalation_model(model_id)
+        reason = self._escalation_reason(result) if target else None
+        if reason:
+            self._note_escalation(model_id, target, reason)
+            result = self._parse_converse_response(await self._acall_converse(target, priority, **request))
+        return result
+
+    def converse(
+        self,
+        message: str,
+        conversation_history: List[Message],
+        previous_results: Optional[List[Dict[str, Any]]] = None,
+        previous_analysis: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Use Claude to intelligently map user's requested content type to actual available types.
-        
+        Send a message to Claude and get a response (blocking boto3 call).
+
         Args:
-            user_request: User's requested content type (e.g., "article", "blog post")
-            available_content_types: List of actual content types found in stories
-            
+            message: The user's message
+            conversation_history: Previous conversation messages
+            previous_results: Optional list of previous search results for context
+            previous_analysis: Optional previous analysis data for context
+
         Returns:
-            The best matching content type, or None if no good match
+            Dict containing the response and any extracted actions
+
+        Raises:
+            Exception: If the API request fails
         """
-        if not available_content_types:
-            return None
-            
+        digest = self._planner_digest(conversation_history, previous_results, previous_analysis)
+        cached = self._cached_decision(message, digest)
+        if cached is not None:
+            return cached
+
+        request = self._build_converse_request(message, conversation_history, previous_results, previous_analysis)
+        logger.info(f"Sending request to Bedrock with {len(request['messages'])} messages")
+        result = self._plan(request, self.router.model_for(TASK_PLANNER))
+        logger.info("Received response from Bedrock")
+        return self._remember_decision(message, digest, result)
+
+    async def aconverse(
+        self,
+        message: str,
+        conversation_history: List[Message],
+        previous_results: Optional[List[Dict[str, Any]]] = None,
+        previous_analysis: Optional[Dict[str, Any]] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
+        """
+        Async version of converse() with the same arguments and return shape.
+
+        ``priority`` orders the call in the admission queue
+        (PRIORITY_BACKGROUND for work nobody is waiting on).
+
+        Raises:
+            Exception: If the API request fails
+        """
+        digest = self._planner_digest(conversation_history, previous_results, previous_analysis)
+        cached = self._cached_decision(message, digest)
+        if cached is not None:
+            return cached
+
+        request = self._build_converse_request(message, conversation_history, previous_results, previous_analysis)
+        logger.info(f"Sending request to Bedrock with {len(request['messages'])} messages")
+        result = await self._aplan(request, self.router.model_for(TASK_PLANNER), priority)
+        logger.info("Received response from Bedrock")
+        return self._remember_decision(message, digest, result)
+
+    async def aconverse_stream(
+        self,
+        message: str,
+        conversation_history: List[Message],
+        previous_results: Optional[List[Dict[str, Any]]] = None,
+        previous_analysis: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming version of aconverse() using the ConverseStream API.
+
+        Yields ``("text", fragment)`` tuples with the ``response`` text as the
+        model generates it and ``("field", (name, value))`` tuples as soon as
+        any other top-level JSON field (action, term, limit, ...) is complete,
+        then a single ``("final", result)`` tuple where result is the dict
+        aconverse() would have returned. If the model answers without JSON,
+        its text is yielded once the stream has ended. When the decision is
+        escalated to a larger model, ``("restart", model_id)`` is yielded
+        first: fields seen before it no longer apply.
+
+        Raises:
+            Exception: If the API request fails
+        """
+        digest = self._planner_digest(conversation_history, previous_results, previous_analysis)
+        cached = self._cached_decision(message, digest)
+        if cached is not None:
+            if cached.get("response"):
+                yield ("text", cached["response"])
+            yield ("final", cached)
+            return
+
+        request = self._build_converse_request(message, conversation_history, previous_results, previous_analysis)
+        logger.info(f"Streaming request to Bedrock with {len(request['messages'])} messages")
+        model_id = self.router.model_for(TASK_PLANNER)
+
+        if not self.settings.bedrock_async_enabled:
+            result = self._remember_decision(message, digest, await self._aplan(request, model_id))
+            if result.get("response"):
+                yield ("text", result["response"])
+            yield ("final", result)
+            return
+
+        result: Optional[Dict[str, Any]] = None
+        escalation: Optional[str] = None
+        async for kind, value in self._stream_decision(request, model_id, escalate=True):
+            if kind == "escalate":
+                escalation = value
+            elif kind == "final":
+                result = value
+            else:
+                yield (kind, value)
+        if escalation is not None:
+            yield ("restart", escalation)
+            async for kind, value in self._stream_decision(request, escalation, escalate=False):
+                if kind == "final":
+                    result = value
+                else:
+                    yield (kind, value)
+
+        self._remember_decision(message, digest, result)
+        yield ("final", result)
+
+    async def _stream_decision(
+        self,
+        request: Dict[str, Any],
+        model_id: str,
+        escalate: bool
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream one planner turn from model_id.
+
+        Yields the ``field`` and ``text`` tuples of aconverse_stream(), then
+        ``("final", result)``. With escalate set, the decision is checked
+        before any text is yielded (when the text starts, or at the end if
+        there was none); an unusable one aborts the stream and yields
+        ``("escalate", model_id)`` with the model to stream instead.
+        """
+        target = self.router.escalation_model(model_id) if escalate else None
+        streamer = JSONFieldStreamer("response")
+        text_chunks: List[str] = []
+        tool_chunks: List[str] = []
+        stop_reason = None
+        streamed = False
+        async with self._admitted(request, PRIORITY_INTERACTIVE) as ticket, self._async_slot():
+            started = time.perf_counter()
+            events = self._stream_events(request, model_id)
+            try:
+                async for event in events:
+                    if "metadata" in event:
+                        self._record_usage(event["metadata"].get("usage"))
+                        ticket.used_tokens = usage_tokens(event["metadata"].get("usage"))
+                        continue
+                    if "messageStop" in event:
+                        stop_reason = event["messageStop"].get("stopReason")
+                        continue
+                    # Planner tool input arrives as JSON fragments, streamed like text JSON
+                    block_delta = event.get("contentBlockDelta", {}).get("delta", {})
+                    delta = block_delta.get("toolUse", {}).get("input") or block_delta.get("text")
+                    if not delta:
+                        continue
+                    if not text_chunks and not tool_chunks:
+                        self.metrics.observe("bedrock.stream.first_token", time.perf_counter() - started)
+                    (tool_chunks if "toolUse" in block_delta else text_chunks).append(delta)
+                    text = streamer.feed(delta)
+                    for name in streamer.pop_completed():
+                        yield ("field", (name, streamer.fields[name]))
+                    if text:
+                        if not streamed:
+                            reason = (
+                                self._escalation_reason(streamer.fields)
+                                if target and "action" in streamer.fields else None
+                            )
+                            if reason:
+                                self._note_escalation(model_id, target, reason)
+                                yield ("escalate", target)
+                                return
+                            self.metrics.observe("bedrock.stream.first_text", time.perf_counter() - started)
+                            streamed = True
+                        yield ("text", text)
+            except Exception:
+                self.router.record(model_id, time.perf_counter() - started, error=True)
+                raise
+            finally:
+                await events.aclose()
+            self.metrics.observe("bedrock.latency", time.perf_counter() - started)
+            self.router.record(model_id, time.perf_counter() - started)
+
+        logger.info(f"Received streamed response from Bedrock ({model_id})")
+        content = self._streamed_content("".join(text_chunks), "".join(tool_chunks))
+        result = self._parse_converse_response({
+            "output": {"message": {"content": content}},
+            "stopReason": stop_reason
+        })
+        reason = self._escalation_reason(result) if target and not streamed else None
+        if reason:
+            self._note_escalation(model_id, target, reason)
+            yield ("escalate", target)
+            return
+        if not streamed and result.get("response"):
+            yield ("text", result["response"])
+        yield ("final", result)
+
+    def _streamed_content(self, response_text: str, tool_input: str) -> List[Dict[str, Any]]:
+        """Rebuild Converse content blocks from streamed text and tool input fragments."""
+        content: List[Dict[str, Any]] = [{"text": response_text}] if response_text else []
+        if tool_input:
+            try:
+                content.append({"toolUse": {"name": PLANNER_TOOL_NAME, "input": json.loads(tool_input)}})
+            except json.JSONDecodeError:
+                # Cut off (e.g. by maxTokens): let the text parser salvage what it can
+                logger.warning("Streamed planner tool input is not valid JSON, parsing it as text")
+                content.append({"text": tool_input})
+        return content
+
+    def _build_mapping_request(self, user_request: str, available_content_types: List[str]) -> Dict[str, Any]:
+        """Build the Converse request body for content type mapping."""
         prompt = f"""Given a user's content request and available content types, select the best match.
 
 User requested: "{user_request}"
@@ -377,45 +988,151 @@ Which available content type best matches the user's request? Consider:
 Respond ONLY with the exact content type name from the available list, or "none".
 Do not include any explanation or additional text."""
 
-        try:
-            messages = [{
+        return {
+            "messages": [{
                 "role": "user",
                 "content": [{"text": prompt}]
-            }]
+            }],
+            "inferenceConfig": {
+                "maxTokens": 50,
+                "temperature": 0.3
+            }
+        }
+
+    def _parse_mapping_response(
+        self,
+        response: Dict[str, Any],
+        user_request: str,
+        available_content_types: List[str]
+    ) -> Optional[str]:
+        """Extract the mapped content type from a Converse response."""
+        output = response.get("output", {})
+        message_data = output.get("message", {})
+        content_blocks = message_data.get("content", [])
+
+        if content_blocks and len(content_blocks) > 0:
+            result = content_blocks[0].get("text", "").strip()
+
+            # Check if result is in available types
+            if result in available_content_types:
+                logger.info(f"Mapped '{user_request}' to '{result}'")
+                return result
+            elif result.lower() == "none":
+                logger.info(f"No good match for '{user_request}' in available types")
+                return None
+            else:
+                logger.warning(f"Claude returned '{result}' which is not in available types")
+                return None
+
+        return None
+
+    @property
+    def content_type_memo(self) -> ContentTypeMemo:
+        """Persistent memo of LLM content type mappings (opened on first use)."""
+        if self._content_type_memo is None:
+            self._content_type_memo = get_content_type_memo()
+        return self._content_type_memo
+
+    def _lookup_content_type(
+        self,
+        user_request: str,
+        available_content_types: List[str]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Resolve a content type mapping without calling the LLM.
+
+        Returns:
+            (found, mapped type or None); found is False when the LLM must decide
+        """
+        local = match_content_type(user_request, available_content_types)
+        if local is not None:
+            self.metrics.increment("content_type.local_hits")
+            logger.info(f"Mapped '{user_request}' to '{local}' locally")
+            return True, local
+        found, mapped = self.content_type_memo.get(user_request, available_content_types)
+        if found:
+            self.metrics.increment("content_type.memo_hits")
+            logger.info(f"Mapped '{user_request}' to '{mapped}' from memo")
+        return found, mapped
+
+    def map_content_type(
+        self,
+        user_request: str,
+        available_content_types: List[str]
+    ) -> Optional[str]:
+        """
+        Map user's requested content type to actual available types.
+
+        A local matcher and the persistent memo are tried first; Claude is
+        only asked (and its answer memoized) when both miss.
+
+        Args:
+            user_request: User's requested content type (e.g., "article", "blog post")
+            available_content_types: List of actual content types found in stories
             
-            response = self.client.converse(
-                modelId=self.model_id,
-                messages=messages,
-                inferenceConfig={
-                    "maxTokens": 50,
-                    "temperature": 0.3
-                }
+        Returns:
+            The best matching content type, or None if no good match
+        """
+        if not available_content_types:
+            return None
+        found, mapped = self._lookup_content_type(user_request, available_content_types)
+        if found:
+            return mapped
+
+        try:
+            self.metrics.increment("content_type.llm_calls")
+            response = self._call_converse(
+                self.router.model_for(TASK_MAPPER),
+                **self._build_mapping_request(user_request, available_content_types)
             )
-            
-            output = response.get("output", {})
-            message_data = output.get("message", {})
-            content_blocks = message_data.get("content", [])
-            
-            if content_blocks and len(content_blocks) > 0:
-                result = content_blocks[0].get("text", "").strip()
-                
-                # Check if result is in available types
-                if result in available_content_types:
-                    logger.info(f"Mapped '{user_request}' to '{result}'")
-                    return result
-                elif result.lower() == "none":
-                    logger.info(f"No good match for '{user_request}' in available types")
-                    return None
-                else:
-                    logger.warning(f"Claude returned '{result}' which is not in available types")
-                    return None
-            
+            mapped = self._parse_mapping_response(response, user_request, available_content_types)
+        except Exception as e:
+            logger.error(f"Error mapping content type: {e}")
             return None
-            
+        self.content_type_memo.set(user_request, available_content_types, mapped)
+        return mapped
+
+    async def amap_content_type(
+        self,
+        user_request: str,
+        available_content_types: List[str]
+    ) -> Optional[str]:
+        """
+        Async version of map_content_type() with the same arguments and return value.
+
+        Concurrent requests for the same mapping share one Bedrock call, and
+        the memo is written from a worker thread. The call is admitted at
+        interactive priority, since the turn waits for the mapped filter.
+        """
+        if not available_content_types:
+            return None
+        found, mapped = self._lookup_content_type(user_request, available_content_types)
+        if found:
+            return mapped
+
+        async def ask_llm() -> Optional[str]:
+            self.metrics.increment("content_type.llm_calls")
+            response = await self._acall_converse(
+                self.router.model_for(TASK_MAPPER),
+                PRIORITY_INTERACTIVE,
+                **self._build_mapping_request(user_request, available_content_types)
+            )
+            result = self._parse_mapping_response(response, user_request, available_content_types)
+            await asyncio.to_thread(self.content_type_memo.set, user_request, available_content_types, result)
+            return result
+
+        try:
+            return await self._mapping_flights.do(memo_key(user_request, available_content_types), ask_llm)
         except Exception as e:
             logger.error(f"Error mapping content type: {e}")
             return None
 
+    async def aclose(self) -> None:
+        """Close the async transports' pooled connections."""
+        await self.async_runtime.aclose()
+        for runtime in self.hedge_runtimes:
+            await runtime.aclose()
+
 
 # Singleton instance
 _bedrock_client: Optional[BedrockClient] = None
@@ -0,0 +1,160 @@
+"""
+Async transport for the AWS Bedrock Runtime API.
+Sends SigV4-signed requests over a pooled httpx client, so Converse and
+ConverseStream calls run natively on the event loop instead of in a thread pool.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import quote
+
+import httpx
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.eventstream import EventStreamBuffer, EventStreamMessage
+
+logger = logging.getLogger(__name__)
+
+
+class BedrockAPIError(Exception):
+    """Error response from the Bedrock Runtime API."""
+
+    def __init__(self, code: str, message: str, status_code: int):
+        super().__init__(f"[{code}] {message}")
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+
+
+class AsyncBedrockRuntime:
+    """Minimal async Bedrock Runtime client for the Converse API."""
+
+    def __init__(
+        self,
+        session,
+        region: str,
+        timeout: float,
+        max_connections: int = 50,
+        endpoint_url: Optional[str] = None
+    ):
+        """
+        Args:
+            session: boto3 Session providing (refreshable) credentials
+            region: AWS region of the Bedrock Runtime endpoint
+            timeout: Request timeout in seconds
+            max_connections: Connection pool size
+            endpoint_url: Override for the regional endpoint (tests, VPC endpoints)
+        """
+        self.session = session
+        self.region = region
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.endpoint_url = (endpoint_url or f"https://bedrock-runtime.{region}.amazonaws.com").rstrip("/")
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client, created on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+
+    def _signed_headers(self, url: str, body: bytes, accept: str) -> Dict[str, str]:
+        """Sign a POST request with SigV4 and return the headers to send."""
+        credentials = self.session.get_credentials()
+        if credentials is None:
+            raise BedrockAPIError("MissingCredentials", "No AWS credentials found", 0)
+        request = AWSRequest(
+            method="POST",
+            url=url,
+            data=body,
+            headers={"Content-Type": "application/json", "Accept": accept}
+        )
+        SigV4Auth(credentials.get_frozen_credentials(), "bedrock", self.region).add_auth(request)
+        return dict(request.headers.items())
+
+    def _model_url(self, model_id: str, operation: str) -> str:
+        return f"{self.endpoint_url}/model/{quote(model_id, safe='')}/{operation}"
+
+    @staticmethod
+    def _error_from_response(response: httpx.Response) -> BedrockAPIError:
+        """Build a BedrockAPIError from an error response."""
+        code = (response.headers.get("x-amzn-ErrorType") or "").split(":")[0]
+        message = response.text
+        try:
+            payload = response.json()
+            message = payload.get("message") or payload.get("Message") or message
+            code = code or (payload.get("__type") or "").split("#")[-1]
+        except ValueError:
+            pass
+        return BedrockAPIError(code or f"HTTP{response.status_code}", message, response.status_code)
+
+    async def converse(self, modelId: str, **request: Any) -> Dict[str, Any]:
+        """
+        Call the Converse API.
+
+        Takes the same keyword arguments as boto3's ``converse`` (messages,
+        system, inferenceConfig, toolConfig, ...) and returns the parsed JSON
+        body, which has the same shape as the boto3 response.
+
+        Raises:
+            BedrockAPIError: If Bedrock returns an error response
+            httpx.HTTPError: On connection errors and timeouts
+        """
+        url = self._model_url(modelId, "converse")
+        body = json.dumps(request).encode("utf-8")
+        headers = self._signed_headers(url, body, accept="application/json")
+        response = await self.http_client.post(url, content=body, headers=headers)
+        if response.status_code >= 400:
+            raise self._error_from_response(response)
+        return response.json()
+
+    @staticmethod
+    def _decode_event(message: EventStreamMessage) -> Dict[str, Any]:
+        """Turn one event stream message into a boto3-style ``{event_type: payload}`` dict."""
+        headers = message.headers
+        message_type = headers.get(":message-type")
+        if message_type == "exception":
+            payload = json.loads(message.payload or b"{}")
+            raise BedrockAPIError(headers.get(":exception-type", "Unknown"), payload.get("message", ""), 400)
+        if message_type == "error":
+            raise BedrockAPIError(headers.get(":error-code", "Unknown"), headers.get(":error-message", ""), 400)
+        return {headers.get(":event-type", "unknown"): json.loads(message.payload or b"{}")}
+
+    async def converse_stream(self, modelId: str, **request: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Call the ConverseStream API.
+
+        Takes the same keyword arguments as ``converse`` and yields the stream
+        events in the shape boto3 uses, e.g. ``{"contentBlockDelta": {...}}``,
+        ``{"messageStop": {...}}`` and ``{"metadata": {...}}``.
+
+        Raises:
+            BedrockAPIError: If Bedrock returns an error response or a stream exception
+            httpx.HTTPError: On connection errors and timeouts
+        """
+        url = self._model_url(modelId, "converse-stream")
+        body = json.dumps(request).encode("utf-8")
+        headers = self._signed_headers(url, body, accept="application/vnd.amazon.eventstream")
+        async with self.http_client.stream("POST", url, content=body, headers=headers) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise self._error_from_response(response)
+            buffer = EventStreamBuffer()
+            async for chunk in response.aiter_bytes():
+                buffer.add_data(chunk)
+                for message in buffer:
+                    yield self._decode_event(message)
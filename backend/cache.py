@@ -0,0 +1,267 @@
+"""
+In-process caching primitives.
+Provides a TTL + LRU cache bounded by entry count and approximate byte size,
+with hit/miss/eviction counters reported to the metrics registry, and a
+single-flight helper that coalesces concurrent identical calls.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, TypeVar
+
+from backend.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a JSON-like value in bytes."""
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class CacheEntry:
+    """A cached value plus the validators needed to revalidate it."""
+
+    __slots__ = ("value", "expires_at", "size", "etag", "version")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        size: int,
+        etag: Optional[str] = None,
+        version: Optional[str] = None
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.etag = etag
+        self.version = version
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Whether the entry is still within its TTL."""
+        return (now if now is not None else time.monotonic()) < self.expires_at
+
+
+class TTLCache:
+    """
+    TTL + LRU cache bounded by entry count and total size.
+
+    Expired entries are kept (until evicted) so callers can revalidate them
+    with their ETag or version instead of refetching blindly.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = estimate_size
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self.metrics = get_metrics()
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.is_fresh()
+
+    def keys(self) -> Iterator[Hashable]:
+        """Iterate over cached keys (fresh or stale), oldest first."""
+        return iter(list(self._entries.keys()))
+
+    def record(self, event: str, value: int = 1) -> None:
+        """Increment a named counter for this cache (e.g. "revalidated")."""
+        self.metrics.increment(f"cache.{self.name}.{event}", value)
+
+    def _update_gauges(self) -> None:
+        self.metrics.set_gauge(f"cache.{self.name}.entries", len(self._entries))
+        self.metrics.set_gauge(f"cache.{self.name}.bytes", self.total_bytes)
+
+    def get(
+        self,
+        key: Hashable,
+        predicate: Optional[Callable[[Any], bool]] = None
+    ) -> Optional[Any]:
+        """
+        Return a fresh cached value, counting a hit or a miss.
+
+        Args:
+            key: Cache key
+            predicate: Optional check the value must pass to count as a hit
+
+        Returns:
+            The cached value, or None if absent, expired or rejected
+        """
+        entry = self._entries.get(key)
+        if entry is None or not entry.is_fresh() or (predicate and not predicate(entry.value)):
+            self.record("misses")
+            return None
+        self._entries.move_to_end(key)
+        self.record("hits")
+        return entry.value
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the raw entry (fresh or stale) without touching counters."""
+        return self._entries.get(key)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        etag: Optional[str] = None,
+        version: Optional[str] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store a value, evicting least recently used entries to stay in bounds.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            etag: Optional ETag for conditional revalidation
+            version: Optional content version (e.g. updated_at) for revalidation
+            ttl: Optional TTL override in seconds
+        """
+        # Sizing is only needed when the cache is bounded by bytes
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Not caching {self.name} entry {key!r}: {size} bytes exceeds cache size")
+            self.delete(key)
+            return
+
+        self.delete(key)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = CacheEntry(value, expires_at, size, etag=etag, version=version)
+        self.total_bytes += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+            self.record("evictions")
+        self._update_gauges()
+
+    def touch(self, key: Hashable, ttl: Optional[float] = None) -> None:
+        """Extend an entry's TTL after a successful revalidation."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries.move_to_end(key)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns True if it was present."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_bytes -= entry.size
+        self._update_gauges()
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self.total_bytes = 0
+        self._update_gauges()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current size information for this cache."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
+
+
+class _Flight:
+    """A shared in-flight call and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one underlying call.
+
+    The first caller starts the call; later callers with the same key await
+    the same task. Results and errors are delivered to every waiter. A
+    cancelled waiter only stops waiting; the shared call is cancelled once
+    nobody is waiting for it any more, so nothing is left running.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.metrics = get_metrics()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def _finish(self, key: Hashable, flight: _Flight, task: "asyncio.Task") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the exception as retrieved when every waiter already left
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function performing the real work
+
+        Returns:
+            The shared result
+
+        Raises:
+            Whatever the shared call raised
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight, task))
+            self.metrics.increment(f"singleflight.{self.name}.leaders")
+        else:
+            self.metrics.increment(f"singleflight.{self.name}.coalesced")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forget it now: a caller arriving before the task finishes
+                # cancelling must start a fresh call, not join this one
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
@@ -0,0 +1,124 @@
+"""
+Component catalog.
+Loads the space's component definitions from the Management API and keeps
+them fresh on an interval, so the planner prompt can list the real content
+type names and content_type comes back as an exact component name.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import get_settings
+from backend.content_types import canonical_type
+from backend.metrics import get_metrics
+from backend.storyblok_client import StoryblokClient, get_storyblok_client
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentCatalog:
+    """
+    The space's components, refreshed periodically.
+
+    Listeners registered with ``add_listener`` are called with the content
+    type names whenever a refresh changes them.
+    """
+
+    def __init__(self, storyblok_client: Optional[StoryblokClient] = None):
+        self.settings = get_settings()
+        self.storyblok_client = storyblok_client or get_storyblok_client()
+        self.metrics = get_metrics()
+        self.components: List[Dict[str, Any]] = []
+        self.loaded_at: Optional[float] = None
+        self._listeners: List[Callable[[List[str]], None]] = []
+
+    @property
+    def content_types(self) -> List[str]:
+        """
+        Names of the components stories can be created from.
+
+        Root components (``is_root``) are the content types; if the space
+        flags none, every component is used.
+        """
+        roots = [c["name"] for c in self.components if c.get("is_root") and c.get("name")]
+        return roots or [c["name"] for c in self.components if c.get("name")]
+
+    def add_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """Call ``listener(content_types)`` now (if loaded) and after every change."""
+        self._listeners.append(listener)
+        if self.loaded_at is not None:
+            listener(self.content_types)
+
+    def remove_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """Stop calling a listener registered with ``add_listener``."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def refresh(self) -> bool:
+        """
+        Reload the components from Storyblok.
+
+        On failure the previous catalog is kept.
+
+        Returns:
+            True if the content types changed
+        """
+        try:
+            components = await self.storyblok_client.list_components()
+        except Exception as e:
+            self.metrics.increment("components.errors")
+            logger.error(f"Failed to load component catalog: {e}")
+            return False
+
+        previous = self.content_types if self.loaded_at is not None else None
+        self.components = components
+        self.loaded_at = time.monotonic()
+        self.metrics.increment("components.refreshes")
+        self.metrics.set_gauge("components.content_types", len(self.content_types))
+        if self.content_types == previous:
+            return False
+
+        logger.info(f"Component catalog loaded: {len(self.content_types)} content types")
+        for listener in self._listeners:
+            listener(self.content_types)
+        return True
+
+    def resolve(self, content_type: Optional[str]) -> Optional[str]:
+        """
+        Return the catalog's name for content_type if it names a content type exactly.
+
+        Case and plural/snake_case differences are ignored ("Blog Posts" ->
+        "blog_post"); anything looser is left to content type mapping.
+        """
+        if not content_type or self.loaded_at is None:
+            return None
+        names = self.content_types
+        if content_type in names:
+            return content_type
+        wanted = canonical_type(content_type)
+        matches = [name for name in names if canonical_type(name) == wanted]
+        return matches[0] if len(matches) == 1 else None
+
+
+async def run_periodic_refresh(catalog: Optional["ComponentCatalog"] = None, interval: Optional[float] = None) -> None:
+    """Load the catalog, then refresh it forever on a fixed interval (started from the app lifespan)."""
+    catalog = catalog or get_component_catalog()
+    interval = interval or catalog.settings.component_catalog_refresh_interval
+    logger.info(f"Component catalog refresh every {interval}s")
+    while True:
+        await catalog.refresh()
+        await asyncio.sleep(interval)
+
+
+# Singleton instance
+_component_catalog: Optional[ComponentCatalog] = None
+
+
+def get_component_catalog() -> ComponentCatalog:
+    """Get or create the component catalog singleton."""
+    global _component_catalog
+    if _component_catalog is None:
+        _component_catalog = ComponentCatalog()
+    return _component_catalog
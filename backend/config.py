@@ -3,7 +3,7 @@ Configuration management for the Storyblok Voice Assistant backend.
 Loads environment variables and provides validated settings.
 """
 
-from typing import List
+from typing import List, Optional
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 from functools import lru_cache
@@ -18,21 +18,113 @@ class Settings(BaseSettings):
     aws_secret_access_key: str = ""
     aws_session_token: str = ""  # Optional, for temporary credentials
     bedrock_model_id: str = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+
+    # Bedrock transport (async SigV4 client; boto3 in a worker thread when disabled)
+    bedrock_async_enabled: bool = True
+    bedrock_max_concurrency: int = 32  # Converse calls in flight per process
+    bedrock_max_connections: int = 32
+    bedrock_prompt_cache_enabled: bool = True  # cachePoint after the system prompt (turned off if the model rejects it)
+    bedrock_tool_use_enabled: bool = True  # Planner answers through a forced tool with a strict schema
+    bedrock_planner_max_tokens: int = 512
+    planner_dynamic_examples_enabled: bool = True  # Only send the prompt's example blocks a turn is likely to need
+    early_dispatch_enabled: bool = True  # Start the search from the streamed response before it completes
+    speculative_search_enabled: bool = False  # Search the message's key phrase in parallel with the planner call
+
+    # Model routing (unset model IDs use bedrock_model_id)
+    bedrock_planner_model_id: Optional[str] = None  # e.g. a Haiku model for faster planner turns
+    bedrock_mapper_model_id: Optional[str] = None
+    bedrock_escalation_model_id: Optional[str] = None  # Larger model uncertain planner turns escalate to
+    bedrock_escalation_confidence: float = 0.5  # Escalate planner decisions below this self-reported confidence
+    bedrock_model_latency_budget: float = 4.0  # Seconds; a model averaging more is bypassed for its fallback (0 = off)
+
+    # Hedged requests (a slow or throttled call is duplicated to a secondary region)
+    bedrock_hedge_enabled: bool = False
+    bedrock_hedge_regions: List[str] = []  # Secondary regions, e.g. ["us-west-2"]
+    bedrock_hedge_percentile: float = 95.0  # Hedge once the primary is slower than this percentile of recent calls
+    bedrock_hedge_min_delay: float = 0.3
+    bedrock_hedge_initial_delay: float = 2.0  # Hedge delay until enough latencies were observed
+    bedrock_hedge_budget: float = 0.1  # Share of calls that may be hedged (token budget)
+
+    # Bedrock admission control (RPM/TPM buckets with a priority queue, AIMD on throttling)
+    bedrock_admission_enabled: bool = False
+    bedrock_rpm_limit: int = 100  # Set to the account's Converse requests-per-minute quota
+    bedrock_tpm_limit: int = 200000  # Set to the account's tokens-per-minute quota
+    bedrock_admission_max_queue_time: float = 3.0  # Seconds an interactive call may wait for admission
+    bedrock_admission_background_max_queue_time: float = 30.0
     
     # Storyblok Configuration
     storyblok_token: str
     storyblok_space_id: str
     storyblok_api_base: str = "https://api-staging-d1.storyblok.com"
-    
+
+    # Storyblok HTTP connection pool (shared client, see StoryblokClient)
+    storyblok_http2: bool = True
+    storyblok_max_connections: int = 20
+    storyblok_max_keepalive_connections: int = 10
+    storyblok_keepalive_expiry: float = 30.0
+    storyblok_bulk_page_size: int = 100  # Management API per_page maximum
+
+    # Full story cache (TTL + LRU, revalidated by ETag / updated_at)
+    story_cache_enabled: bool = True
+    story_cache_max_entries: int = 2000
+    story_cache_max_bytes: int = 50 * 1024 * 1024
+    story_cache_ttl: float = 300.0
+
+    # Search result cache (normalized term/limit/offset, single-flight)
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 500
+    search_cache_ttl: float = 120.0
+
+    # Paged search (search_pages / search_iter)
+    search_page_size: int = 25
+    search_page_concurrency: int = 4  # vsearch pages requested at once
+    search_max_results: int = 100  # Hard cap on results per turn, whatever limit the LLM emits
+
+    # Local content mirror (SQLite + FTS5, filled by `python -m backend.sync`)
+    content_index_path: str = "data/content_index.db"
+    sync_concurrency: int = 8
+    sync_enabled: bool = False  # Run delta syncs in the background while the app is up
+    sync_interval: float = 300.0
+    sync_deletion_sweep_interval: float = 3600.0
+
+    # Planner response cache (parsed Bedrock decisions keyed on message + context digest)
+    planner_cache_enabled: bool = True
+    planner_cache_max_entries: int = 1000
+    planner_cache_ttl: float = 600.0
+    planner_cache_near_duplicates: bool = False  # Also reuse decisions for similar messages (TF-IDF cosine)
+    planner_cache_similarity_threshold: float = 0.9
+
+    # Content type mapping (local matcher, then a persistent memo of LLM answers)
+    content_type_memo_path: str = "data/content_type_memo.db"
+    content_type_memo_max_entries: int = 5000
+
+    # Component catalog (the space's content types, listed in the planner prompt)
+    component_catalog_enabled: bool = True
+    component_catalog_refresh_interval: float = 3600.0
+    component_catalog_max_prompt_types: int = 50
+
+    # Storyblok webhooks (POST /api/webhooks/storyblok)
+    storyblok_webhook_secret: str = ""
+    webhook_batch_window: float = 1.0
+
     # Application Configuration
     app_name: str = "Storyblok Voice Assistant"
     debug: bool = False
     cors_origins: List[str] = ["http://localhost:8000", "http://127.0.0.1:8000"]
     
     # API Configuration
-    max_conversation_history: int = 10
+    intent_fast_path_enabled: bool = True  # Resolve trivial follow-ups locally instead of calling Bedrock
+    max_conversation_history: int = 10  # Messages sent verbatim at most; older ones are summarized
+    max_accepted_history: int = 200  # Hard cap on history messages read per request (older ones are ignored)
+    history_token_budget: int = 4000  # Estimated input tokens for history plus the current message
+    history_summary_max_tokens: int = 300
     default_search_limit: int = 10
     request_timeout: int = 30
+
+    # Story hydration (full story fetches after a search)
+    hydration_concurrency: int = 10
+    hydration_timeout: float = 10.0
+    hydration_bulk: bool = False  # Use get_stories_by_ids (Management API listings omit content, so still one fetch per story)
     
     model_config = ConfigDict(
         env_file=".env",
@@ -0,0 +1,320 @@
+"""
+Local SQLite mirror of the Storyblok space.
+Stores every story with an FTS5 index over name, slug, flattened body and
+component, so lexical search and counting can run locally in milliseconds.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.config import get_settings
+from backend.models import StoryResult
+
+logger = logging.getLogger(__name__)
+
+# Keys in story content that carry editor metadata rather than text
+_SKIPPED_CONTENT_KEYS = {"_uid", "_editable", "component", "plugin", "fieldtype", "id", "linktype"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id INTEGER PRIMARY KEY,
+    uuid TEXT,
+    name TEXT NOT NULL DEFAULT '',
+    slug TEXT NOT NULL DEFAULT '',
+    full_slug TEXT NOT NULL DEFAULT '',
+    component TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL DEFAULT '',
+    updated_at TEXT,
+    published_at TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS stories_component ON stories(component);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5(
+    name, slug, body, component,
+    content='stories', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS stories_ai AFTER INSERT ON stories BEGIN
+    INSERT INTO stories_fts(rowid, name, slug, body, component)
+    VALUES (new.id, new.name, new.slug, new.body, new.component);
+END;
+
+CREATE TRIGGER IF NOT EXISTS stories_ad AFTER DELETE ON stories BEGIN
+    INSERT INTO stories_fts(stories_fts, rowid, name, slug, body, component)
+    VALUES ('delete', old.id, old.name, old.slug, old.body, old.component);
+END;
+
+CREATE TRIGGER IF NOT EXISTS stories_au AFTER UPDATE ON stories BEGIN
+    INSERT INTO stories_fts(stories_fts, rowid, name, slug, body, component)
+    VALUES ('delete', old.id, old.name, old.slug, old.body, old.component);
+    INSERT INTO stories_fts(rowid, name, slug, body, component)
+    VALUES (new.id, new.name, new.slug, new.body, new.component);
+END;
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def flatten_content(content: Any) -> str:
+    """
+    Flatten Storyblok story content (nested bloks and rich text) into plain text.
+
+    Args:
+        content: The story's ``content`` field
+
+    Returns:
+        All human-readable strings in document order, space separated
+    """
+    parts: List[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, str):
+            text = node.strip()
+            if text:
+                parts.append(text)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if key in _SKIPPED_CONTENT_KEYS:
+                    continue
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(content)
+    return " ".join(parts)
+
+
+def build_fts_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query (all words must match).
+
+    Returns:
+        The MATCH expression, or None if the text has no searchable words
+    """
+    words = re.findall(r"\w+", text or "", flags=re.UNICODE)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+class ContentIndex:
+    """SQLite + FTS5 store of the space's stories."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or get_settings().content_index_path
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def upsert_stories(self, stories: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace stories in the mirror.
+
+        Args:
+            stories: Story objects from the Management API (with content)
+
+        Returns:
+            Number of stories written
+        """
+        rows = []
+        for story in stories:
+            if not isinstance(story, dict) or story.get("id") is None:
+                continue
+            content = story.get("content") if isinstance(story.get("content"), dict) else {}
+            rows.append((
+                int(story["id"]),
+                story.get("uuid"),
+                story.get("name") or "",
+                story.get("slug") or "",
+                story.get("full_slug") or "",
+                content.get("component") or story.get("content_type") or "",
+                flatten_content(content),
+                story.get("updated_at"),
+                story.get("published_at"),
+                json.dumps(story, separators=(",", ":")),
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO stories (id, uuid, name, slug, full_slug, component, body,
+                                     updated_at, published_at, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    uuid=excluded.uuid, name=excluded.name, slug=excluded.slug,
+                    full_slug=excluded.full_slug, component=excluded.component,
+                    body=excluded.body, updated_at=excluded.updated_at,
+                    published_at=excluded.published_at, data=excluded.data
+                """,
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def delete_stories(self, story_ids: Iterable[int]) -> int:
+        """Remove stories from the mirror; returns how many were deleted."""
+        ids = [(int(story_id),) for story_id in story_ids]
+        if not ids:
+            return 0
+        with self._lock:
+            cursor = self._conn.executemany("DELETE FROM stories WHERE id = ?", ids)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def story_ids(self) -> List[int]:
+        """Return every story ID in the mirror."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM stories")]
+
+    def get_story(self, story_id: int) -> Optional[Dict[str, Any]]:
+        """Return the stored full story, or None if it isn't mirrored."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM stories WHERE id = ?", (int(story_id),)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def _where(self, query: Optional[str], content_type: Optional[str]):
+        clauses, params = [], []
+        fts_query = build_fts_query(query) if query else None
+        if fts_query:
+            clauses.append("stories_fts MATCH ?")
+            params.append(fts_query)
+        if content_type:
+            clauses.append("stories.component = ?")
+            params.append(content_type)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        content_type: Optional[str] = None,
+        include_full_story: bool = False
+    ) -> List[StoryResult]:
+        """
+        Full-text search over the mirror, best matches first (BM25).
+
+        Args:
+            query: Free-text query; every word must match
+            limit: Maximum number of results
+            offset: Pagination offset
+            content_type: Optional exact component filter
+            include_full_story: Attach the stored story as ``full_story``
+
+        Returns:
+            Matching stories as StoryResult objects
+        """
+        if not build_fts_query(query):
+            return []
+        where, params = self._where(query, content_type)
+        sql = f"""
+            SELECT stories.id, stories.name, stories.slug, stories.component,
+                   substr(stories.body, 1, 500) AS excerpt, stories.data
+            FROM stories_fts JOIN stories ON stories.id = stories_fts.rowid
+            {where}
+            ORDER BY bm25(stories_fts, 10.0, 5.0, 1.0, 2.0)
+            LIMIT ? OFFSET ?
+        """
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, int(limit), int(offset))).fetchall()
+        return [
+            StoryResult(
+                body=row["excerpt"],
+                cursor=offset + position,
+                name=row["name"],
+                slug=row["slug"],
+                story_id=row["id"],
+                content_type=row["component"] or None,
+                full_story=json.loads(row["data"]) if include_full_story else None
+            )
+            for position, row in enumerate(rows)
+        ]
+
+    def count(self, query: str, content_type: Optional[str] = None) -> int:
+        """Count stories matching a query (and optional content type)."""
+        if not build_fts_query(query):
+            return 0
+        where, params = self._where(query, content_type)
+        sql = f"SELECT COUNT(*) FROM stories_fts JOIN stories ON stories.id = stories_fts.rowid {where}"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def count_by_content_type(self, query: str) -> Dict[str, int]:
+        """Count matching stories per component."""
+        if not build_fts_query(query):
+            return {}
+        where, params = self._where(query, None)
+        sql = f"""
+            SELECT stories.component, COUNT(*) FROM stories_fts
+            JOIN stories ON stories.id = stories_fts.rowid {where}
+            GROUP BY stories.component ORDER BY COUNT(*) DESC
+        """
+        with self._lock:
+            return {row[0] or "unknown": row[1] for row in self._conn.execute(sql, params)}
+
+    def get_state(self, key: str) -> Optional[str]:
+        """Read a persisted sync state value."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        """Persist a sync state value."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, value)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return story counts and sync state for the status endpoint."""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0]
+            by_type = {
+                row[0] or "unknown": row[1]
+                for row in self._conn.execute(
+                    "SELECT component, COUNT(*) FROM stories GROUP BY component ORDER BY COUNT(*) DESC"
+                )
+            }
+            state = {row[0]: row[1] for row in self._conn.execute("SELECT key, value FROM sync_state")}
+        return {"path": self.path, "stories": total, "content_types": by_type, "sync_state": state}
+
+
+# Singleton instance
+_content_index: Optional[ContentIndex] = None
+
+
+def get_content_index() -> ContentIndex:
+    """Get or create the content index singleton."""
+    global _content_index
+    if _content_index is None:
+        _content_index = ContentIndex()
+    return _content_index
@@ -0,0 +1,204 @@
+"""
+Content type mapping helpers.
+A cheap local matcher (exact, plural/snake_case and synonym matches) that
+resolves most user content type requests without the LLM, and a persistent
+SQLite memo of earlier LLM mappings keyed on the normalized request and the
+sorted available types.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Groups of words users and content models use for the same kind of content.
+# A request matches a type when both fall in the same group.
+SYNONYM_GROUPS: List[set] = [
+    {"article", "blog", "blog_post", "post", "news", "news_article"},
+    {"case_study", "customer_story", "success_story", "reference"},
+    {"event", "webinar", "meetup", "conference"},
+    {"landing_page", "campaign", "targeted_page", "lp"},
+    {"page", "web_page", "default_page"},
+    {"whitepaper", "ebook", "guide", "report", "resource", "download"},
+    {"product", "product_page", "feature", "feature_page"},
+    {"author", "person", "team_member", "people"},
+    {"job", "job_posting", "career", "vacancy"},
+    {"faq", "question", "help_article"},
+]
+
+_SNAKE = re.compile(r"[\s\-]+")
+
+# Words that end in "s" but aren't plurals
+_UNCOUNTABLE = {"news", "series"}
+
+
+def _singular(word: str) -> str:
+    if word in _UNCOUNTABLE:
+        return word
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("ses"):
+        return word[:-2]
+    if len(word) > 2 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def canonical_type(name: str) -> str:
+    """Lowercase snake_case singular form ("Blog Posts" -> "blog_post")."""
+    words = _SNAKE.sub("_", name.strip().lower()).strip("_").split("_")
+    return "_".join(_singular(word) for word in words if word)
+
+
+def _unique(matches: Iterable[str]) -> Optional[str]:
+    matches = list(dict.fromkeys(matches))
+    return matches[0] if len(matches) == 1 else None
+
+
+def match_content_type(user_request: str, available_content_types: List[str]) -> Optional[str]:
+    """
+    Map a requested content type to an available one without the LLM.
+
+    Tries, in order: an exact match, a match after plural/snake_case
+    normalization (ignoring underscores), the request being a distinct word
+    of exactly one type ("landing" -> "landing_page"), and a synonym group
+    shared with exactly one type. Ambiguous requests return None.
+
+    Args:
+        user_request: User's requested content type (e.g., "blog posts")
+        available_content_types: Content types found in the results
+
+    Returns:
+        The matching available type, or None if the LLM should decide
+    """
+    request = canonical_type(user_request)
+    if not request:
+        return None
+    for name in available_content_types:
+        if name == user_request:
+            return name
+
+    canonical = {name: canonical_type(name) for name in available_content_types}
+    match = _unique(
+        name for name, form in canonical.items()
+        if form == request or form.replace("_", "") == request.replace("_", "")
+    )
+    if match:
+        return match
+
+    request_words = set(request.split("_"))
+    match = _unique(name for name, form in canonical.items() if request_words <= set(form.split("_")))
+    if match:
+        return match
+
+    groups = [group for group in SYNONYM_GROUPS if request in group]
+    if not groups:
+        return None
+    return _unique(
+        name for name, form in canonical.items()
+        if any(form in group for group in groups)
+    )
+
+
+def memo_key(user_request: str, available_content_types: List[str]) -> str:
+    """Memo key: normalized request plus the sorted, de-duplicated types."""
+    return f"{canonical_type(user_request)}|{','.join(sorted(set(available_content_types)))}"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_type_memo (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class ContentTypeMemo:
+    """
+    Persistent memo of LLM content type mappings.
+
+    Entries are loaded into memory when opened, so lookups never touch the
+    database; ``set`` writes through. A stored None ("no good match") is a
+    valid memoized answer.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        settings = get_settings()
+        self.path = path or settings.content_type_memo_path
+        self.max_entries = max_entries or settings.content_type_memo_max_entries
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+            rows = self._conn.execute("SELECT key, value FROM content_type_memo ORDER BY created_at").fetchall()
+        self._entries: Dict[str, Optional[str]] = {key: value for key, value in rows}
+        logger.info(f"Loaded {len(self._entries)} memoized content type mappings from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_request: str, available_content_types: List[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a memoized mapping.
+
+        Returns:
+            (found, mapped type or None)
+        """
+        key = memo_key(user_request, available_content_types)
+        if key in self._entries:
+            return True, self._entries[key]
+        return False, None
+
+    def set(self, user_request: str, available_content_types: List[str], value: Optional[str]) -> None:
+        """Memoize a mapping (None meaning no good match) and persist it."""
+        key = memo_key(user_request, available_content_types)
+        self._entries[key] = value
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO content_type_memo (key, value, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value, created_at=excluded.created_at",
+                (key, value, time.time())
+            )
+            if len(self._entries) > self.max_entries:
+                # Drop the oldest entries, in memory and on disk
+                stale = list(self._entries)[:len(self._entries) - self.max_entries]
+                for stale_key in stale:
+                    del self._entries[stale_key]
+                self._conn.executemany("DELETE FROM content_type_memo WHERE key = ?", [(k,) for k in stale])
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Forget every mapping (e.g. after the content model changed)."""
+        self._entries.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM content_type_memo")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+_content_type_memo: Optional[ContentTypeMemo] = None
+
+
+def get_content_type_memo() -> ContentTypeMemo:
+    """Get or create the content type memo singleton."""
+    global _content_type_memo
+    if _content_type_memo is None:
+        _content_type_memo = ContentTypeMemo()
+    return _content_type_memo
@@ -0,0 +1,221 @@
+"""
+Early action dispatch.
+Starts the Storyblok search for a conversation turn as soon as the streamed
+Bedrock output has revealed the action and search term, so the search runs
+while the model is still generating its response text. Optionally a search
+on the user's own key phrase is started before the model has answered at all.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import get_settings
+from backend.hydration import hydrate_stories, search_and_hydrate
+from backend.metrics import get_metrics
+from backend.models import SearchResults
+from backend.speculation import extract_search_phrase
+from backend.storyblok_client import StoryblokClient, normalize_search_term
+
+logger = logging.getLogger(__name__)
+
+# Number of results fetched for an "analyze" (count) turn
+ANALYZE_LIMIT = 100
+
+
+def clamp_search_limit(limit: Any) -> int:
+    """Cap whatever limit the LLM emitted to [1, search_max_results]."""
+    settings = get_settings()
+    try:
+        limit = int(limit or settings.default_search_limit)
+    except (TypeError, ValueError):
+        limit = settings.default_search_limit
+    return max(1, min(limit, settings.search_max_results))
+
+
+def dispatch_key(action: Optional[str], term: Any, limit: Any) -> Optional[Tuple[str, str, Optional[int]]]:
+    """
+    Identity of the search a turn needs, or None if the action needs no search.
+
+    Two turns with the same key produce the same Storyblok results.
+    """
+    if action not in ("search", "analyze") or not isinstance(term, str) or not term.strip():
+        return None
+    if action == "analyze":
+        return (action, normalize_search_term(term), None)
+    return (action, normalize_search_term(term), clamp_search_limit(limit))
+
+
+async def fetch_results(
+    storyblok_client: StoryblokClient,
+    action: str,
+    term: str,
+    limit: Any = None
+) -> SearchResults:
+    """
+    Run the search (and full story hydration) for a search or analyze action.
+
+    Args:
+        storyblok_client: Storyblok client
+        action: "search" or "analyze"
+        term: Search term
+        limit: Requested result count (ignored for analyze)
+
+    Returns:
+        Hydrated search results
+    """
+    settings = get_settings()
+    if action == "analyze":
+        # Fetch the result pages concurrently and hydrate each page with
+        # full story details (Management API) as soon as it arrives
+        return await search_and_hydrate(storyblok_client, term, limit=ANALYZE_LIMIT)
+
+    limit = clamp_search_limit(limit)
+    if limit > settings.search_page_size:
+        return await search_and_hydrate(storyblok_client, term, limit=limit)
+
+    search_results = await storyblok_client.search(term=term, limit=limit)
+    # Fetch full story details for each result using Management API
+    # (concurrently; stories that fail or run out of budget stay partial)
+    if search_results.stories:
+        await hydrate_stories(storyblok_client, search_results.stories)
+    return search_results
+
+
+class EarlyDispatcher:
+    """
+    Starts a turn's search from partially parsed LLM output.
+
+    Feed it the top-level fields as they complete (``on_field``) and tell it
+    when the response text starts (``on_text``), and call ``restart`` when
+    the planner turn is redone on another model. A search turn is dispatched
+    once ``action`` and ``term`` are known and ``limit`` is either known or
+    can no longer arrive before the response text; an analyze turn only needs
+    the term. ``results`` then reuses the running search when the final action
+    matches, and otherwise cancels it and searches with the final values.
+
+    With speculation on, ``speculate`` starts a search on the message's key
+    phrase before the planner call; it is kept only if the planner's search
+    turns out to be the same one.
+    """
+
+    def __init__(
+        self,
+        storyblok_client: StoryblokClient,
+        enabled: Optional[bool] = None,
+        speculation_enabled: Optional[bool] = None
+    ):
+        settings = get_settings()
+        self.storyblok_client = storyblok_client
+        self.enabled = settings.early_dispatch_enabled if enabled is None else enabled
+        self.speculation_enabled = (
+            settings.speculative_search_enabled if speculation_enabled is None else speculation_enabled
+        )
+        self.metrics = get_metrics()
+        self.fields: Dict[str, Any] = {}
+        self.response_started = False
+        self.key: Optional[Tuple[str, str, Optional[int]]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.speculative = False
+        self._dispatched_at = 0.0
+
+    def speculate(self, message: str) -> None:
+        """Search the message's key phrase while the planner decides (plain search requests only)."""
+        if not self.speculation_enabled or self.task is not None:
+            return
+        phrase = extract_search_phrase(message)
+        if phrase is None:
+            return
+        term, limit = phrase
+        self._start("search", term, limit, speculative=True)
+        self.metrics.increment("speculation.started")
+        logger.info(f">>> SPECULATIVE SEARCH: '{term}' while the planner runs")
+
+    def on_field(self, name: str, value: Any) -> None:
+        """Record a completed top-level field of the model's JSON output."""
+        self.fields[name] = value
+        self._maybe_dispatch()
+
+    def on_text(self) -> None:
+        """Record that the response text has started streaming."""
+        self.response_started = True
+        self._maybe_dispatch()
+
+    def restart(self) -> None:
+        """
+        Forget the streamed fields: the planner turn is being redone (escalated to another model).
+
+        A search started from those fields is cancelled; a speculative one is
+        kept, since the new answer may still ask for it.
+        """
+        if self.task is not None and not self.speculative:
+            self.cancel()
+        self.fields = {}
+        self.response_started = False
+
+    def _start(self, action: str, term: str, limit: Any, speculative: bool = False) -> None:
+        self.key = dispatch_key(action, term, limit)
+        self.speculative = speculative
+        self._dispatched_at = time.perf_counter()
+        self.task = asyncio.create_task(fetch_results(self.storyblok_client, action, term, limit))
+
+    def _maybe_dispatch(self) -> None:
+        if not self.enabled or (self.task is not None and not self.speculative):
+            return
+        action = self.fields.get("action")
+        if action == "search" and "limit" not in self.fields and not self.response_started:
+            return
+        key = dispatch_key(action, self.fields.get("term"), self.fields.get("limit"))
+        if key is None or (self.task is not None and key == self.key):
+            return
+        # The planner wants a different search than the speculative one
+        self.cancel()
+        self._start(action, self.fields["term"], self.fields.get("limit"))
+        self.metrics.increment("early_dispatch.started")
+        logger.info(f">>> EARLY DISPATCH: {action} '{self.fields['term']}' while the response is still generating")
+
+    def _record_speculation(self, hit: bool) -> None:
+        self.metrics.increment("speculation.hits" if hit else "speculation.misses")
+        hits = self.metrics.counter("speculation.hits")
+        self.metrics.set_gauge("speculation.hit_rate", hits / (hits + self.metrics.counter("speculation.misses")))
+
+    async def results(self, action: str, term: str, limit: Any = None) -> SearchResults:
+        """
+        Return the results for the turn's final action.
+
+        Args:
+            action: Final action ("search" or "analyze")
+            term: Final search term
+            limit: Final limit
+
+        Returns:
+            Hydrated search results, from the early search when it matches
+        """
+        if self.task is not None and dispatch_key(action, term, limit) == self.key:
+            task, self.task = self.task, None
+            if self.speculative:
+                self._record_speculation(hit=True)
+            else:
+                self.metrics.increment("early_dispatch.used")
+            # Time the search had already been running when the final action was known
+            self.metrics.observe("early_dispatch.head_start", time.perf_counter() - self._dispatched_at)
+            return await task
+        self.cancel()
+        return await fetch_results(self.storyblok_client, action, term, limit)
+
+    def cancel(self) -> None:
+        """Cancel an early (or speculative) search that is no longer needed."""
+        if self.task is not None:
+            if not self.task.done():
+                self.task.cancel()
+            else:
+                # Retrieve the result so a failed, unused search isn't reported as unhandled
+                self.task.cancelled() or self.task.exception()
+            self.task = None
+            if self.speculative:
+                self._record_speculation(hit=False)
+                logger.info(f">>> SPECULATIVE SEARCH DISCARDED: planner did not ask for {self.key}")
+            else:
+                self.metrics.increment("early_dispatch.discarded")
+                logger.info(f">>> EARLY DISPATCH DISCARDED: final action differs from {self.key}")
@@ -0,0 +1,229 @@
+"""
+Hedged Bedrock requests.
+When a call to the primary region hasn't answered within a recent latency
+percentile (or fails with throttling), a duplicate goes to a secondary
+region and the first answer wins; the other request is cancelled. A token
+budget caps the share of calls that are duplicated.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple, TypeVar
+
+from backend.bedrock_http import BedrockAPIError
+from backend.config import get_settings
+from backend.metrics import Observation, get_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors worth sending straight to the secondary region
+FAILOVER_ERRORS = {
+    "ThrottlingException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException",
+}
+
+# Hedge tokens that can be saved up (bursts of hedges after a quiet period)
+_MAX_HEDGE_TOKENS = 10.0
+# Latencies needed before the percentile replaces the initial delay
+_MIN_SAMPLES = 20
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """Whether a failed primary call should be retried in another region right away."""
+    return isinstance(error, BedrockAPIError) and (error.code in FAILOVER_ERRORS or error.status_code >= 500)
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Whether a call failed because Bedrock throttled it."""
+    return isinstance(error, BedrockAPIError) and error.code == "ThrottlingException"
+
+
+class HedgePolicy:
+    """
+    When to hedge one kind of call (an operation on a model).
+
+    The hedge delay is the configured percentile of recent primary
+    latencies (never below the minimum delay). Each call earns
+    ``bedrock_hedge_budget`` tokens and each hedge or failover spends one,
+    so at most that share of calls is duplicated over time.
+    """
+
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        min_delay: Optional[float] = None,
+        initial_delay: Optional[float] = None,
+        budget: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.percentile = percentile or settings.bedrock_hedge_percentile
+        self.min_delay = settings.bedrock_hedge_min_delay if min_delay is None else min_delay
+        self.initial_delay = settings.bedrock_hedge_initial_delay if initial_delay is None else initial_delay
+        self.budget = settings.bedrock_hedge_budget if budget is None else budget
+        self.latency = Observation(window=256)
+        self.tokens = _MAX_HEDGE_TOKENS
+
+    def delay(self) -> float:
+        """Seconds to wait for the primary before hedging."""
+        if self.latency.count < _MIN_SAMPLES:
+            return self.initial_delay
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    def record(self, seconds: float) -> None:
+        """Record a primary call's latency (or a lower bound if it lost the race)."""
+        self.latency.add(seconds)
+
+    def earn(self) -> None:
+        """Add one call's share of the hedge budget."""
+        self.tokens = min(_MAX_HEDGE_TOKENS, self.tokens + self.budget)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget, if there is one left."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def refund(self) -> None:
+        """Return a hedge taken with try_spend() that was not sent."""
+        self.tokens = min(_MAX_HEDGE_TOKENS, self.tokens + 1)
+
+
+async def hedged_call(
+    policy: HedgePolicy,
+    primary: Callable[[], Awaitable[T]],
+    secondary: Callable[[], Awaitable[T]],
+    discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    on_throttle: Optional[Callable[[], None]] = None,
+    admit_hedge: Optional[Callable[[], bool]] = None
+) -> T:
+    """
+    Await primary(), hedging with secondary() if it is slow or throttled.
+
+    Args:
+        policy: Hedge delay and budget for this kind of call
+        primary: Starts the call in the primary region
+        secondary: Starts the same call in a secondary region
+        discard: Releases the result of a call that finished but lost the race
+        on_throttle: Called for every throttled call, including ones the hedge recovered from
+        admit_hedge: Takes admission for the secondary call without waiting; when it
+            returns False the secondary call is not sent
+
+    Returns:
+        The first successful result
+
+    Raises:
+        The primary's error if both calls fail (or it failed without a hedge)
+    """
+    metrics = get_metrics()
+    policy.earn()
+
+    def failed(error: BaseException) -> BaseException:
+        if on_throttle is not None and is_throttle_error(error):
+            on_throttle()
+        return error
+
+    def spend() -> bool:
+        """Take a duplicate call from the budget and from admission control."""
+        if not policy.try_spend():
+            metrics.increment("bedrock.hedge.budget_exhausted")
+            return False
+        if admit_hedge is not None and not admit_hedge():
+            policy.refund()
+            metrics.increment("bedrock.hedge.not_admitted")
+            return False
+        return True
+
+    started = time.perf_counter()
+    first = asyncio.ensure_future(primary())
+    second: Optional["asyncio.Future[T]"] = None
+    try:
+        done, _ = await asyncio.wait({first}, timeout=policy.delay())
+        if done:
+            error = first.exception()
+            if error is None:
+                policy.record(time.perf_counter() - started)
+                return first.result()
+            failed(error)
+            if not is_failover_error(error) or not spend():
+                raise error
+            logger.info(f"Primary Bedrock call failed ({error}), failing over to the secondary region")
+            metrics.increment("bedrock.hedge.failovers")
+            return await secondary()
+
+        if not spend():
+            result = await first
+            policy.record(time.perf_counter() - started)
+            return result
+
+        metrics.increment("bedrock.hedge.sent")
+        second = asyncio.ensure_future(secondary())
+        pending = {first, second}
+        errors = {}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer the primary if both finished in the same step
+            for task in sorted(done, key=lambda t: t is not first):
+                if task.exception() is not None:
+                    errors[task] = failed(task.exception())
+                    continue
+                policy.record(time.perf_counter() - started)
+                if task is second:
+                    metrics.increment("bedrock.hedge.wins")
+                for other in done - {task}:
+                    if discard is not None and other.exception() is None:
+                        await discard(other.result())
+                return task.result()
+        raise errors.get(first) or errors[second]
+    finally:
+        losers = [task for task in (first, second) if task is not None and not task.done()]
+        for task in losers:
+            task.cancel()
+            metrics.increment("bedrock.hedge.cancelled")
+        # Let the cancelled calls release their connections before returning
+        await asyncio.gather(*losers, return_exceptions=True)
+
+
+async def hedged_stream(
+    policy: HedgePolicy,
+    primary: Callable[[], AsyncIterator[T]],
+    secondary: Callable[[], AsyncIterator[T]],
+    on_throttle: Optional[Callable[[], None]] = None,
+    admit_hedge: Optional[Callable[[], bool]] = None
+) -> AsyncIterator[T]:
+    """
+    Stream events from primary(), hedging on the time to the first event.
+
+    Both streams are opened as in hedged_call(); the one that delivers its
+    first event first is streamed to the end and the other is closed.
+    """
+    async def first_event(open_stream: Callable[[], AsyncIterator[T]]) -> Tuple[AsyncIterator[T], T]:
+        events = open_stream()
+        try:
+            return events, await events.__anext__()
+        except BaseException:
+            await events.aclose()
+            raise
+
+    async def close(started: Tuple[AsyncIterator[T], Any]) -> None:
+        await started[0].aclose()
+
+    events, event = await hedged_call(
+        policy,
+        lambda: first_event(primary),
+        lambda: first_event(secondary),
+        discard=close,
+        on_throttle=on_throttle,
+        admit_hedge=admit_hedge
+    )
+    try:
+        yield event
+        async for event in events:
+            yield event
+    finally:
+        await events.aclose()
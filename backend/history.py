@@ -0,0 +1,187 @@
+"""
+Token-budgeted conversation history.
+Fits the history sent to Bedrock into an input-token budget: recent turns
+are kept verbatim and older ones are folded into a rolling summary (cached
+by history prefix, so each turn only summarizes the newly dropped messages)
+instead of being dropped.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from backend.cache import TTLCache
+from backend.config import get_settings
+from backend.metrics import get_metrics
+from backend.models import Message
+
+logger = logging.getLogger(__name__)
+
+# Converse adds a few tokens of framing per message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Characters kept per summarized message
+_SUMMARY_SNIPPET_CHARS = 160
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for Claude models (about four characters per token)."""
+    return math.ceil(len(text or "") / 4)
+
+
+def message_tokens(message: Message) -> int:
+    """Estimated tokens of one history message, framing included."""
+    return estimate_tokens(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _snippet(text: str, first_sentence: bool = False) -> str:
+    text = " ".join((text or "").split())
+    if first_sentence:
+        text = _SENTENCE_END.split(text, maxsplit=1)[0]
+    if len(text) > _SUMMARY_SNIPPET_CHARS:
+        text = text[:_SUMMARY_SNIPPET_CHARS - 3].rstrip() + "..."
+    return text
+
+
+def summary_line(message: Message) -> str:
+    """One summary line per dropped message: user requests verbatim, replies by first sentence."""
+    if message.role == "user":
+        return f'- User: "{_snippet(message.content)}"'
+    return f"- Assistant: {_snippet(message.content, first_sentence=True)}"
+
+
+class HistoryBuilder:
+    """
+    Builds the history window for a Bedrock turn.
+
+    Keeps the newest messages that fit the token budget (and at most
+    ``max_messages`` of them); everything older is summarized. The kept
+    window always starts with a user message, as Converse requires.
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        summary_max_tokens: Optional[int] = None,
+        max_messages: Optional[int] = None
+    ):
+        settings = get_settings()
+        self.token_budget = token_budget or settings.history_token_budget
+        self.summary_max_tokens = summary_max_tokens or settings.history_summary_max_tokens
+        self.max_messages = max_messages or settings.max_conversation_history
+        self.metrics = get_metrics()
+        self.summaries = TTLCache("history_summary", max_entries=1000, ttl=3600.0)
+
+    def _summarize(self, dropped: List[Message]) -> str:
+        """
+        Rolling summary of the dropped prefix of the history.
+
+        Summaries are cached by a digest of the prefix they cover; the
+        longest cached prefix is extended with lines for the newer messages.
+        """
+        digests = []
+        running = hashlib.sha1()
+        for message in dropped:
+            running.update(f"{message.role}\x1f{message.content}\x1e".encode())
+            digests.append(running.hexdigest())
+
+        lines: List[str] = []
+        start = 0
+        for index in range(len(dropped) - 1, -1, -1):
+            cached = self.summaries.get(digests[index])
+            if cached is not None:
+                lines, start = list(cached), index + 1
+                break
+        lines.extend(summary_line(message) for message in dropped[start:])
+
+        # Keep the newest lines that fit the summary budget
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_max_tokens:
+            lines.pop(0)
+        self.summaries.set(digests[-1], lines)
+        return "[EARLIER CONVERSATION, SUMMARIZED:\n" + "\n".join(lines) + "]"
+
+    def fit(
+        self,
+        conversation_history: List[Message],
+        current_message: str
+    ) -> Tuple[List[Message], str, Dict[str, int]]:
+        """
+        Fit the history to the token budget.
+
+        Args:
+            conversation_history: Full conversation history
+            current_message: The user's message with any result context appended
+
+        Returns:
+            Tuple of (history to send, current message, token stats). If older
+            turns were summarized, the summary is prepended to the first sent
+            message.
+        """
+        current_tokens = estimate_tokens(current_message) + MESSAGE_OVERHEAD_TOKENS
+        history_tokens = sum(message_tokens(m) for m in conversation_history)
+        if (
+            len(conversation_history) <= self.max_messages
+            and current_tokens + history_tokens <= self.token_budget
+        ):
+            kept, dropped = list(conversation_history), []
+        else:
+            remaining = self.token_budget - current_tokens - self.summary_max_tokens
+            kept = []
+            for message in reversed(conversation_history):
+                cost = message_tokens(message)
+                if len(kept) >= self.max_messages or cost > remaining:
+                    break
+                kept.insert(0, message)
+                remaining -= cost
+            while kept and kept[0].role != "user":
+                kept.pop(0)
+            dropped = conversation_history[:len(conversation_history) - len(kept)]
+
+        summary_tokens = 0
+        if dropped:
+            summary = self._summarize(dropped)
+            summary_tokens = estimate_tokens(summary)
+            if kept:
+                kept[0] = Message(role=kept[0].role, content=f"{summary}\n\n{kept[0].content}")
+            else:
+                current_message = f"{summary}\n\n{current_message}"
+
+        stats = {
+            "history_messages": len(conversation_history),
+            "kept_messages": len(kept),
+            "summarized_messages": len(dropped),
+            "history_tokens": sum(message_tokens(m) for m in kept),
+            "current_tokens": estimate_tokens(current_message) + MESSAGE_OVERHEAD_TOKENS,
+            "summary_tokens": summary_tokens,
+        }
+        stats["input_tokens"] = stats["history_tokens"] + stats["current_tokens"]
+        self._record(stats)
+        return kept, current_message, stats
+
+    def _record(self, stats: Dict[str, int]) -> None:
+        self.metrics.observe("history.input_tokens", stats["input_tokens"])
+        self.metrics.observe("history.kept_messages", stats["kept_messages"])
+        if stats["summarized_messages"]:
+            self.metrics.increment("history.summarized_turns")
+            self.metrics.observe("history.summarized_messages", stats["summarized_messages"])
+        logger.info(
+            f"History: {stats['kept_messages']}/{stats['history_messages']} messages kept, "
+            f"{stats['summarized_messages']} summarized, ~{stats['input_tokens']} input tokens "
+            f"(budget {self.token_budget})"
+        )
+
+
+# Singleton instance
+_history_builder: Optional[HistoryBuilder] = None
+
+
+def get_history_builder() -> HistoryBuilder:
+    """Get or create the history builder singleton."""
+    global _history_builder
+    if _history_builder is None:
+        _history_builder = HistoryBuilder()
+    return _history_builder
@@ -0,0 +1,224 @@
+"""
+Story hydration stage.
+Fetches full story details for search results with concurrent per-story
+fetches under a bounded semaphore (or bulk ``by_ids`` requests when
+``hydration_bulk`` is on), always within a time budget and keeping result
+order intact.
+Large searches are paged, and each page is hydrated as soon as it arrives.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from backend.config import get_settings
+from backend.metrics import get_metrics
+from backend.models import SearchResults, StoryResult
+
+logger = logging.getLogger(__name__)
+
+
+def extract_content_type(full_story: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the content type (root component) of a full story.
+
+    Args:
+        full_story: Story data from the Management API
+
+    Returns:
+        The component name, or None if the story has no typed content
+    """
+    content = full_story.get("content")
+    if content and isinstance(content, dict):
+        return content.get("component")
+    return None
+
+
+def apply_full_story(story: StoryResult, full_story: Optional[Dict[str, Any]]) -> None:
+    """Attach full story data to a search result and derive its content type."""
+    if not full_story:
+        return
+    story.full_story = full_story
+    content_type = extract_content_type(full_story)
+    if content_type:
+        story.content_type = content_type
+
+
+async def _hydrate_bulk(
+    storyblok_client,
+    stories: List[StoryResult],
+    timeout: Optional[float],
+    report: Dict[str, int]
+) -> None:
+    """
+    Hydrate stories with a handful of get_stories_by_ids requests.
+
+    The budget is applied to each request inside get_stories_by_ids, so
+    stories fetched in time are kept when others run out of it.
+    """
+    started = time.perf_counter()
+    full_stories = await storyblok_client.get_stories_by_ids(
+        [story.story_id for story in stories],
+        timeout=timeout
+    )
+    out_of_time = timeout is not None and time.perf_counter() - started >= timeout
+
+    for story in stories:
+        full_story = full_stories.get(story.story_id)
+        if full_story:
+            apply_full_story(story, full_story)
+            report["hydrated"] += 1
+        elif out_of_time:
+            report["timed_out"] += 1
+
+
+async def _hydrate_each(
+    storyblok_client,
+    stories: List[StoryResult],
+    concurrency: int,
+    timeout: Optional[float],
+    report: Dict[str, int]
+) -> None:
+    """Hydrate stories one request each, with bounded concurrency."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(story: StoryResult) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await storyblok_client.get_story_by_id(story.story_id)
+
+    tasks = [asyncio.create_task(fetch(story)) for story in stories]
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for story, task in zip(stories, tasks):
+        if task in pending:
+            report["timed_out"] += 1
+            continue
+        # e.g. a shared fetch abandoned by everyone else waiting on it
+        if task.cancelled():
+            report["failed"] += 1
+            logger.warning(f"Fetch of full story for ID {story.story_id} was cancelled")
+            continue
+        error = task.exception()
+        if error is not None:
+            report["failed"] += 1
+            logger.warning(f"Could not fetch full story for ID {story.story_id}: {error}")
+            continue
+        full_story = task.result()
+        if full_story:
+            apply_full_story(story, full_story)
+            report["hydrated"] += 1
+
+
+async def hydrate_stories(
+    storyblok_client,
+    stories: List[StoryResult],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    bulk: Optional[bool] = None
+) -> Dict[str, int]:
+    """
+    Fetch full story details for each search result.
+
+    Stories are updated in place, so the caller's ordering is preserved.
+    A failing or slow story never fails the whole stage: it simply stays
+    without ``full_story`` and is counted in the returned report. If the
+    bulk request fails, hydration falls back to per-story fetches.
+
+    Args:
+        storyblok_client: Client providing ``get_stories_by_ids`` / ``get_story_by_id``
+        stories: Search results to hydrate
+        concurrency: Maximum in-flight per-story fetches (defaults to settings)
+        timeout: Total time budget in seconds (defaults to settings)
+        bulk: Whether to try the bulk endpoint first (defaults to settings)
+
+    Returns:
+        Dict with requested, hydrated, failed and timed_out counts
+    """
+    settings = get_settings()
+    metrics = get_metrics()
+    if concurrency is None:
+        concurrency = settings.hydration_concurrency
+    if timeout is None:
+        timeout = settings.hydration_timeout
+    if bulk is None:
+        bulk = settings.hydration_bulk
+    if timeout is not None and timeout <= 0:
+        timeout = None
+
+    report = {"requested": len(stories), "hydrated": 0, "failed": 0, "timed_out": 0}
+    if not stories:
+        return report
+
+    started = time.perf_counter()
+    hydrated_in_bulk = False
+    if bulk:
+        try:
+            await _hydrate_bulk(storyblok_client, stories, timeout, report)
+            hydrated_in_bulk = True
+            metrics.increment("hydration.bulk")
+        except Exception as e:
+            logger.warning(f"Bulk story fetch failed, falling back to per-story requests: {e}")
+            metrics.increment("hydration.bulk_fallbacks")
+
+    if not hydrated_in_bulk:
+        remaining = None
+        if timeout is not None:
+            remaining = max(0.0, timeout - (time.perf_counter() - started))
+        await _hydrate_each(storyblok_client, stories, concurrency, remaining, report)
+
+    elapsed = time.perf_counter() - started
+    metrics.observe("hydration.latency", elapsed)
+    metrics.increment("hydration.stories_requested", report["requested"])
+    metrics.increment("hydration.stories_failed", report["failed"])
+    metrics.increment("hydration.stories_timed_out", report["timed_out"])
+
+    if report["timed_out"]:
+        logger.warning(
+            f"Hydration budget of {timeout}s exceeded: {report['timed_out']} of "
+            f"{report['requested']} stories returned without full details"
+        )
+    logger.info(
+        f"Hydrated {report['hydrated']}/{report['requested']} stories in {elapsed:.2f}s "
+        f"(bulk={hydrated_in_bulk}, failed={report['failed']}, timed_out={report['timed_out']})"
+    )
+    return report
+
+
+async def search_and_hydrate(
+    storyblok_client,
+    term: str,
+    limit: int,
+    page_size: Optional[int] = None
+) -> SearchResults:
+    """
+    Page through a search and hydrate each page while the next one loads.
+
+    Args:
+        storyblok_client: Client providing ``search_pages`` and the hydration methods
+        term: Search term/query
+        limit: Maximum number of results (capped by ``search_max_results``)
+        page_size: Results per vsearch request (defaults to settings)
+
+    Returns:
+        SearchResults with hydrated stories in ranking order
+    """
+    stories: List[StoryResult] = []
+    hydrations = []
+    try:
+        async for page in storyblok_client.search_pages(term, page_size=page_size, max_results=limit):
+            stories.extend(page)
+            hydrations.append(asyncio.ensure_future(hydrate_stories(storyblok_client, page)))
+    except BaseException:
+        for hydration in hydrations:
+            hydration.cancel()
+        raise
+
+    if hydrations:
+        await asyncio.gather(*hydrations)
+    return SearchResults(stories=stories, total=len(stories))
@@ -0,0 +1,282 @@
+"""
+Local intent fast path.
+Resolves trivial follow-up turns ("yes please", "just show 3", "the next five",
+"out of those, only drupal") with deterministic rules against the session's
+stored results, so they don't cost a Bedrock round trip. Anything the rules
+are not sure about returns None and goes to the LLM.
+"""
+
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from backend.config import get_settings
+from backend.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+}
+
+ORDINAL_WORDS = {
+    "second": 2, "third": 3, "fourth": 4, "fifth": 5, "sixth": 6,
+    "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10, "last": -1,
+}
+
+# Words that accept an offer ("yes please", "sure, go ahead")
+_AFFIRMATIVE_WORDS = {"yes", "yeah", "yep", "yup", "sure", "go"}
+
+# Words that ask for (part of) the stored results explicitly
+_REQUEST_WORDS = {"show", "list", "display", "give", "more", "next", "first", "top"}
+
+# Words that make a turn a request to see the stored results
+_TRIGGER_WORDS = _AFFIRMATIVE_WORDS | _REQUEST_WORDS
+
+# Words that carry no meaning of their own in a listing request
+_FILLER_WORDS = {
+    "please", "ahead", "me", "them", "those", "these", "the", "just", "but", "limit",
+    "to", "of", "only", "results", "result", "stories", "story", "items", "item",
+    "articles", "ones", "one", "do", "it", "can", "you", "i", "want", "see", "lets",
+    "let's", "let", "us", "a", "and", "then", "thanks", "thank", "all", "would", "like",
+    "could", "now", "ok", "okay",
+}
+
+# "that mention", "about", "which contain", ...
+_RELATION = r"(?:(?:that|which) )?(?:mentions?|mentioning|is about|are about|about|with|contains?|containing|on)"
+
+_FILTER_PATTERNS = [
+    # "out of those, only drupal" / "from these, show me the ones about AI"
+    re.compile(
+        r"^(?:out of|from|of|among) (?:those|these|them)(?: stories| results| articles| ones)?[\s,]+"
+        r"(?:(?:show me|give me|list|the ones?|those|ones|which ones?)\s+)*"
+        r"(?:(?:only|just)\s+(?:(?:the ones?|those|ones)\s+)?(?:" + _RELATION + r"\s+)?|" + _RELATION + r"\s+)"
+        r"(?P<term>.+)$"
+    ),
+    # "only the ones about AI" / "just those mentioning omnichannel"
+    re.compile(
+        r"^(?:only|just)\s+(?:show me\s+)?(?:the ones|those|ones|the stories|stories)\s+"
+        + _RELATION + r"\s+(?P<term>.+)$"
+    ),
+    # "which ones mention drupal"
+    re.compile(r"^which (?:ones|of them|of those) (?:mention|are about|talk about) (?P<term>.+)$"),
+    # "only the drupal ones"
+    re.compile(r"^(?:only|just) (?:the )?(?P<term>[\w][\w\s-]*?) ones$"),
+]
+
+# Trailing words that aren't part of a filter term
+_FILTER_SUFFIX = re.compile(r"\s+(?:please|ones|stories|articles|posts|results)$")
+
+_MAX_FILTER_WORDS = 3
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, drop punctuation (except apostrophes and hyphens) and collapse whitespace."""
+    text = re.sub(r"[^\w\s'-]", " ", message.lower())
+    return " ".join(text.split())
+
+
+def _parse_number(token: str) -> Optional[int]:
+    if token.isdigit():
+        return int(token)
+    return NUMBER_WORDS.get(token)
+
+
+def _listing(response: str, limit: int, offset: int = 0) -> Dict[str, Any]:
+    return {
+        "action": "list_analyzed",
+        "term": None,
+        "filter_term": None,
+        "limit": limit,
+        "offset": offset,
+        "content_type": None,
+        "analysis_type": None,
+        "clarify_field": None,
+        "options": None,
+        "response": response,
+        "source": "local",
+    }
+
+
+def _resolve_listing(
+    tokens: List[str],
+    total: int,
+    cursor: int,
+    default_limit: int,
+    offer_pending: bool
+) -> Optional[Dict[str, Any]]:
+    """
+    Confirmations, numeric limits and ordinals over the stored results.
+
+    A bare confirmation ("yes please") only counts while an offer to list
+    the results is pending; acknowledgements ("ok thanks") never do.
+    """
+    if not tokens or not any(t in _TRIGGER_WORDS or _parse_number(t) or t in ORDINAL_WORDS for t in tokens):
+        return None
+    ordinals = [ORDINAL_WORDS[t] for t in tokens if t in ORDINAL_WORDS]
+    if ordinals:
+        # "the second one": "one" names the item, it isn't a count
+        tokens = [t for t in tokens if t != "one"]
+    numbers = [n for n in (_parse_number(t) for t in tokens) if n]
+    unknown = [
+        t for t in tokens
+        if t not in _TRIGGER_WORDS and t not in _FILLER_WORDS and t not in ORDINAL_WORDS and not _parse_number(t)
+    ]
+    if unknown or len(numbers) > 1 or len(ordinals) > 1 or (numbers and ordinals):
+        return None
+    explicit = numbers or ordinals or any(t in _REQUEST_WORDS for t in tokens)
+    if not explicit and not offer_pending:
+        return None
+
+    if "next" in tokens or "more" in tokens:
+        if cursor >= total:
+            return None
+        limit = numbers[0] if numbers else default_limit
+        return _listing(f"Here are the next {min(limit, total - cursor)}:", limit, offset=cursor)
+
+    if ordinals:
+        position = total if ordinals[0] == -1 else ordinals[0]
+        if position > total:
+            return None
+        return _listing("Here it is:", 1, offset=position - 1)
+
+    if numbers:
+        limit = numbers[0]
+        if "one" in tokens and limit == 1 and "first" in tokens:
+            return _listing("Here is the first one:", 1)
+        return _listing(f"Here are the first {min(limit, total)}:", limit)
+
+    if "all" in tokens:
+        return _listing(f"Here are all {total}:", total)
+    return _listing("Here they are:", default_limit)
+
+
+def _original_casing(term: str, message: str) -> str:
+    """Recover the user's casing of a normalized filter term ("ai" -> "AI")."""
+    match = re.search(r"\s+".join(re.escape(word) for word in term.split()), message, flags=re.IGNORECASE)
+    return match.group(0) if match else term
+
+
+def _resolve_filter(text: str, message: str) -> Optional[Dict[str, Any]]:
+    """Explicit "only X" / "out of those, X" filter phrases."""
+    for pattern in _FILTER_PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+        term = match.group("term").strip()
+        previous = None
+        while previous != term:
+            previous, term = term, _FILTER_SUFFIX.sub("", term).strip()
+        words = term.split()
+        if not words or len(words) > _MAX_FILTER_WORDS or any(_parse_number(w) for w in words):
+            return None
+        if set(words) <= _FILLER_WORDS | _TRIGGER_WORDS:
+            return None
+        term = _original_casing(term, message)
+        return {
+            "action": "refine",
+            "term": None,
+            "filter_term": term,
+            "limit": None,
+            "content_type": None,
+            "analysis_type": None,
+            "clarify_field": None,
+            "options": None,
+            "response": f"Here are the ones that mention {term}:",
+            "source": "local",
+        }
+    return None
+
+
+def resolve_intent(
+    message: str,
+    previous_results: Optional[List[Dict[str, Any]]],
+    previous_analysis: Optional[Dict[str, Any]] = None,
+    cursor: int = 0,
+    default_limit: int = 10
+) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a follow-up turn without the LLM.
+
+    Only turns that act on the session's stored results are handled:
+    confirmations and limits ("yes please", "just show 3"), ordinals and
+    paging ("the second one", "the next five") and explicit filters
+    ("out of those, only drupal"). Everything else returns None.
+
+    Args:
+        message: The user's message
+        previous_results: Results stored for the session
+        previous_analysis: Analysis stored for the session
+        cursor: How many of the stored results have been shown so far
+        default_limit: Page size when the user gives no number
+
+    Returns:
+        A response dict shaped like BedrockClient.converse's, or None
+    """
+    if not previous_results:
+        return None
+    text = normalize_message(message)
+    if not text or len(text) > 120:
+        return None
+
+    resolved = _resolve_filter(text, message)
+    if resolved is None:
+        # An analysis whose results haven't been listed yet ends with an offer to list them
+        offer_pending = bool(previous_analysis) and cursor == 0
+        resolved = _resolve_listing(text.split(), len(previous_results), cursor, default_limit, offer_pending)
+    if resolved is not None and resolved["action"] == "list_analyzed" and not previous_analysis and cursor == 0:
+        # Nothing was analyzed or listed yet, so a bare confirmation is ambiguous
+        return None
+    return resolved
+
+
+class IntentFastPath:
+    """Applies resolve_intent and records hit rate and latency saved."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.metrics = get_metrics()
+
+    def resolve(
+        self,
+        message: str,
+        previous_results: Optional[List[Dict[str, Any]]],
+        previous_analysis: Optional[Dict[str, Any]] = None,
+        cursor: int = 0,
+        default_limit: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a turn locally if the rules are sure, else return None.
+
+        A hit is credited with the mean Bedrock latency observed so far as
+        time saved.
+        """
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        resolved = resolve_intent(message, previous_results, previous_analysis, cursor, default_limit)
+        self.metrics.observe("intent.resolve_time", time.perf_counter() - started)
+        if resolved is None:
+            self.metrics.increment("intent.fallthrough")
+        else:
+            self.metrics.increment("intent.local_hits")
+            self.metrics.increment("intent.latency_saved_seconds", self.metrics.mean("bedrock.latency") or 0.0)
+            logger.info(f">>> LOCAL INTENT: {resolved['action']} (limit={resolved.get('limit')}, filter={resolved.get('filter_term')})")
+        hits = self.metrics.counter("intent.local_hits")
+        total = hits + self.metrics.counter("intent.fallthrough")
+        self.metrics.set_gauge("intent.hit_rate", round(hits / total, 4) if total else 0.0)
+        return resolved
+
+
+# Singleton instance
+_intent_fast_path: Optional[IntentFastPath] = None
+
+
+def get_intent_fast_path() -> IntentFastPath:
+    """Get or create the intent fast path singleton."""
+    global _intent_fast_path
+    if _intent_fast_path is None:
+        _intent_fast_path = IntentFastPath(enabled=get_settings().intent_fast_path_enabled)
+    return _intent_fast_path
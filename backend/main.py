@@ -5,13 +5,12 @@ Provides endpoints for conversation and health checks.
 
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from backend.config import get_settings
 from backend.models import (
@@ -19,10 +18,21 @@ from backend.models import (
     ConversationResponse,
     HealthCheck,
     ErrorResponse,
-    Message
+    Message,
+    SearchResults,
+    StoryblokWebhookEvent
 )
+from backend.admission import PRIORITY_BACKGROUND
 from backend.bedrock_client import get_bedrock_client
 from backend.storyblok_client import get_storyblok_client
+from backend.metrics import get_metrics
+from backend.early_dispatch import EarlyDispatcher, clamp_search_limit
+from backend.intent import get_intent_fast_path
+from backend.content_index import get_content_index
+from backend.components import get_component_catalog, run_periodic_refresh
+from backend.sync import run_periodic_sync
+from backend.webhooks import get_invalidation_batcher, verify_signature
+from backend.streaming import SentenceSplitter, sse_event
 import hashlib
 
 # In-memory storage for conversation context (in production, use Redis or similar)
@@ -31,6 +41,8 @@ conversation_contexts: Dict[str, List[Dict[str, Any]]] = {}
 conversation_id_contexts: Dict[str, List[Dict[str, Any]]] = {}
 # Store analysis results per session
 conversation_analyses: Dict[str, Dict[str, Any]] = {}
+# How many of each session's stored results have been shown (for "the next five")
+conversation_cursors: Dict[str, int] = {}
 
 # Configure logging
 logging.basicConfig(
@@ -39,10 +51,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Thread pool for running sync boto3 calls
-executor = ThreadPoolExecutor(max_workers=10)
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -51,8 +59,28 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {'Debug' if settings.debug else 'Production'}")
     logger.info(f"AWS Region: {settings.aws_region}")
     logger.info(f"Bedrock Model: {settings.bedrock_model_id}")
+    storyblok_client = get_storyblok_client()
+    await storyblok_client.start()
+    bedrock_client = get_bedrock_client()
+    catalog_task = None
+    if settings.component_catalog_enabled:
+        get_component_catalog().add_listener(bedrock_client.set_content_types)
+        catalog_task = asyncio.create_task(run_periodic_refresh())
+    sync_task = None
+    if settings.sync_enabled:
+        sync_task = asyncio.create_task(run_periodic_sync())
     yield
     logger.info("Shutting down Storyblok Voice Assistant...")
+    for task in (sync_task, catalog_task):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if catalog_task is not None:
+        # A restart in the same process (reload, tests) registers it again
+        get_component_catalog().remove_listener(bedrock_client.set_content_types)
+    await get_invalidation_batcher().aclose()
+    await storyblok_client.aclose()
+    await bedrock_client.aclose()
 
 
 # Create FastAPI app
@@ -111,6 +139,395 @@ async def health_check():
     )
 
 
+@app.get("/api/metrics", tags=["Health"])
+async def metrics():
+    """In-process metrics (connection reuse, latencies, cache counters)."""
+    return get_metrics().snapshot()
+
+
+def _load_session(request: ConversationRequest):
+    """
+    Resolve the conversation history window and session context for a request.
+
+    Returns:
+        Tuple of (conversation_history, session_key, previous_results, previous_analysis)
+    """
+    # BedrockClient fits the history to the input token budget (summarizing
+    # older turns); the hard cap only bounds the work per request
+    full_history = request.conversation_history or []
+    conversation_history = full_history[-settings.max_accepted_history:]
+
+    # Generate a stable session key based on FIRST user message
+    # This ensures the key remains consistent across the entire conversation
+    # (taken from the full history, so it doesn't move once the cap applies)
+    if full_history:
+        # Use only the FIRST user message to create a stable session ID
+        first_user_message = next((msg.content for msg in full_history if msg.role == "user"), None)
+        if first_user_message is not None:
+            # Hash only the first user message to keep session stable
+            session_key = hashlib.md5(first_user_message.encode()).hexdigest()
+        else:
+            session_key = "default"
+    else:
+        # First request - use the current message as session key
+        session_key = hashlib.md5(request.message.encode()).hexdigest()
+
+    logger.info(f">>> Session key: {session_key}")
+    logger.info(f">>> Conversation history messages: {len(conversation_history)}")
+
+    # Extract previous results and analysis from session context
+    previous_results = None
+    previous_analysis = None
+    if session_key in conversation_contexts and conversation_contexts[session_key]:
+        previous_results = conversation_contexts[session_key]
+        logger.info(f">>> Found {len(previous_results)} previous results in session context")
+    else:
+        logger.info(f">>> No previous results found for session: {session_key}")
+        logger.info(f">>> Available sessions: {list(conversation_contexts.keys())}")
+
+    if session_key in conversation_analyses and conversation_analyses[session_key]:
+        previous_analysis = conversation_analyses[session_key]
+        logger.info(f">>> Found previous analysis in session: {previous_analysis.get('description', 'Unknown')}")
+
+    return conversation_history, session_key, previous_results, previous_analysis
+
+
+async def _converse_turn(
+    bedrock_client,
+    dispatcher: EarlyDispatcher,
+    message: str,
+    conversation_history: List[Message],
+    session_key: str,
+    previous_results: Optional[List[Dict[str, Any]]],
+    previous_analysis: Optional[Dict[str, Any]]
+):
+    """
+    Run one conversation turn's planning step.
+
+    Trivial follow-ups are resolved locally without Bedrock. Otherwise
+    Claude's response is streamed (starting the Storyblok search as soon as
+    the action is known) or, with early dispatch off, requested in one call.
+
+    Yields ("text", fragment) tuples while the response generates, then
+    ("final", claude_response).
+    """
+    local_response = get_intent_fast_path().resolve(
+        message,
+        previous_results,
+        previous_analysis,
+        cursor=conversation_cursors.get(session_key, 0),
+        default_limit=settings.default_search_limit
+    )
+    if local_response is not None:
+        yield "text", local_response["response"]
+        yield "final", local_response
+        return
+
+    # Search the user's own key phrase while the planner decides (opt-in)
+    dispatcher.speculate(message)
+
+    if not dispatcher.enabled:
+        claude_response = await bedrock_client.aconverse(
+            message=message,
+            conversation_history=conversation_history,
+            previous_results=previous_results,
+            previous_analysis=previous_analysis
+        )
+        if claude_response.get("response"):
+            yield "text", claude_response["response"]
+        yield "final", claude_response
+        return
+
+    async for kind, value in bedrock_client.aconverse_stream(
+        message=message,
+        conversation_history=conversation_history,
+        previous_results=previous_results,
+        previous_analysis=previous_analysis
+    ):
+        if kind == "field":
+            dispatcher.on_field(*value)
+            continue
+        if kind == "restart":
+            # Escalated to a larger model: drop the search started from the first answer
+            dispatcher.restart()
+            continue
+        if kind == "text":
+            dispatcher.on_text()
+        yield kind, value
+
+
+async def _map_content_type(bedrock_client, content_type: str, available_types: List[str]) -> Optional[str]:
+    """
+    Resolve the content type to filter results by.
+
+    The planner prompt lists the space's components, so content_type is
+    normally an exact component name and needs no mapping.
+    """
+    catalog_type = get_component_catalog().resolve(content_type)
+    if catalog_type is not None:
+        get_metrics().increment("content_type.catalog_hits")
+        return catalog_type
+    return await bedrock_client.amap_content_type(content_type, available_types)
+
+
+async def _apply_action(
+    claude_response: Dict[str, Any],
+    session_key: str,
+    previous_results: Optional[List[Dict[str, Any]]],
+    bedrock_client,
+    storyblok_client,
+    dispatcher: Optional[EarlyDispatcher] = None
+) -> ConversationResponse:
+    """
+    Carry out the action Claude chose (search, analyze, refine, ...) and build the response.
+
+    Args:
+        claude_response: Parsed Bedrock response (see BedrockClient.converse)
+        session_key: Session the results are stored under
+        previous_results: Results of the session's previous search, if any
+        bedrock_client: Bedrock client (content type mapping)
+        storyblok_client: Storyblok client
+        dispatcher: Early dispatcher holding a search started from the streamed response
+
+    Returns:
+        ConversationResponse with the message and any results
+    """
+    dispatcher = dispatcher or EarlyDispatcher(storyblok_client, enabled=False)
+
+    # Extract action and response
+    action = claude_response.get("action", "chat")
+    response_text = claude_response.get("response", "")
+    search_term = claude_response.get("term")
+    filter_term = claude_response.get("filter_term")
+    search_limit = claude_response.get("limit", 10)  # Default to 10 if not specified
+    content_type = claude_response.get("content_type")
+    analysis_type = claude_response.get("analysis_type")
+    clarify_field = claude_response.get("clarify_field")
+    clarify_options = claude_response.get("options")
+
+    logger.info(f"Claude response - Action: {action}, Term: {search_term}, Filter: {filter_term}, Limit: {search_limit}, ContentType: {content_type}, Message length: {len(response_text)}")
+
+    # Initialize response
+    conversation_response = ConversationResponse(
+        message=response_text,
+        results=None,
+        action=action
+    )
+
+    # Handle different action types
+    if action == "clarify":
+        # Ask for clarification - no search needed
+        logger.info(f">>> CLARIFICATION NEEDED: {clarify_field}")
+        conversation_response.message = response_text
+        # Don't clear context, keep previous results available
+
+    elif action == "analyze" and search_term:
+        # Perform search but present as analysis
+        logger.info(f">>> ANALYZING with term: '{search_term}', type: '{content_type}'")
+        try:
+            # Paged and hydrated; reuses the search started early from the stream if it matches
+            search_results = await dispatcher.results("analyze", search_term)
+            logger.info(f">>> ANALYSIS FOUND {len(search_results.stories)} stories (total: {search_results.total})")
+
+            # Filter by content_type if specified AND if stories have content_type populated
+            if content_type and search_results.stories:
+                # Check if any stories have content_type populated
+                stories_with_type = [s for s in search_results.stories if s.content_type]
+                if stories_with_type:
+                    # Get unique content types from results
+                    available_types = list(set([s.content_type for s in stories_with_type]))
+                    logger.info(f">>> Available content types: {available_types}")
+
+                    # Exact catalog name, else map to an available type (local match, memo, then Claude)
+                    mapped_type = await _map_content_type(bedrock_client, content_type, available_types)
+
+                    if mapped_type:
+                        initial_count = len(search_results.stories)
+                        logger.info(f">>> Mapped user request '{content_type}' to '{mapped_type}'")
+                        logger.info(f">>> Filtering {initial_count} stories by mapped content_type: {mapped_type}")
+                        filtered_stories = [
+                            s for s in search_results.stories 
+                            if s.content_type and mapped_type.lower() in s.content_type.lower()
+                        ]
+                        search_results.stories = filtered_stories
+                        logger.info(f">>> After content_type filter: {len(filtered_stories)} stories remain")
+                    else:
+                        logger.warning(f">>> Could not map '{content_type}' to available types, returning all results")
+                else:
+                    logger.warning(f">>> Cannot filter by content_type: no stories have content_type populated")
+                    logger.warning(f">>> Returning all {len(search_results.stories)} stories without content_type filtering")
+
+            # Store results for potential listing later
+            results_for_context = [story.model_dump() for story in search_results.stories]
+            conversation_contexts[session_key] = results_for_context
+            conversation_cursors[session_key] = 0  # Nothing listed yet
+
+            # Store analysis data
+            analysis_data = {
+                "description": f"Analyzed {search_term}" + (f" ({content_type})" if content_type else ""),
+                "count": len(search_results.stories),
+                "search_term": search_term,
+                "content_type": content_type,
+                "analysis_type": analysis_type or "count"
+            }
+            conversation_analyses[session_key] = analysis_data
+            conversation_response.analysis = analysis_data
+
+            # Provide conversational response with count
+            count = len(search_results.stories)
+            if count > 0:
+                type_str = f"{content_type}s" if content_type else "stories"
+                conversation_response.message = f"I found {count} {type_str} that mention {search_term}. Would you like me to list them?"
+                logger.info(f">>> ANALYSIS COMPLETE: {count} results stored for potential listing")
+            else:
+                conversation_response.message = f"I couldn't find any {content_type if content_type else 'stories'} that mention {search_term}."
+                conversation_contexts[session_key] = []
+
+        except Exception as e:
+            logger.error(f">>> ANALYSIS ERROR: {str(e)}", exc_info=True)
+            conversation_response.message += "\n\nI encountered an issue analyzing the content. Please try again."
+
+    elif action == "list_analyzed":
+        # List the previously analyzed results with optional limit
+        logger.info(f">>> LISTING ANALYZED RESULTS for session: {session_key}, limit: {search_limit}")
+        if previous_results and len(previous_results) > 0:
+            from backend.models import StoryResult, SearchResults
+
+            # Apply offset ("the next five") and limit if specified by user
+            offset = max(0, int(claude_response.get("offset") or 0))
+            results_to_show = previous_results[offset:offset + search_limit] if search_limit else previous_results[offset:]
+            conversation_cursors[session_key] = offset + len(results_to_show)
+
+            story_results = []
+            for story_dict in results_to_show:
+                story_results.append(StoryResult(**story_dict))
+
+            conversation_response.results = SearchResults(
+                stories=story_results,
+                total=len(story_results)
+            )
+            logger.info(f">>> LISTED {len(story_results)} of {len(previous_results)} analyzed stories (offset: {offset}, limit applied: {search_limit})")
+        else:
+            conversation_response.message = "I don't have any analyzed results to show. Please ask me to search or analyze first."
+            logger.warning(f">>> No analyzed results to list for session: {session_key}")
+
+    elif action == "search" and search_term:
+        logger.info(f">>> PERFORMING SEARCH with term: '{search_term}', limit: {search_limit}, type: '{content_type}'")
+        try:
+            # The LLM can emit any limit; cap it (large requests are paged)
+            search_limit = clamp_search_limit(search_limit)
+            # Hydrated; reuses the search started early from the stream if it matches
+            search_results = await dispatcher.results("search", search_term, search_limit)
+            logger.info(f">>> SEARCH RETURNED {len(search_results.stories)} hydrated stories (total: {search_results.total})")
+
+            # Filter by content_type if specified AND if stories have content_type populated
+            if content_type and search_results.stories:
+                # Check if any stories have content_type populated
+                stories_with_type = [s for s in search_results.stories if s.content_type]
+                if stories_with_type:
+                    # Get unique content types from results
+                    available_types = list(set([s.content_type for s in stories_with_type]))
+                    logger.info(f">>> Available content types: {available_types}")
+
+                    # Exact catalog name, else map to an available type (local match, memo, then Claude)
+                    mapped_type = await _map_content_type(bedrock_client, content_type, available_types)
+
+                    if mapped_type:
+                        initial_count = len(search_results.stories)
+                        logger.info(f">>> Mapped user request '{content_type}' to '{mapped_type}'")
+                        logger.info(f">>> Filtering {initial_count} stories by mapped content_type: {mapped_type}")
+                        filtered_stories = [
+                            s for s in search_results.stories 
+                            if s.content_type and mapped_type.lower() in s.content_type.lower()
+                        ]
+                        search_results.stories = filtered_stories
+                        search_results.total = len(filtered_stories)
+                        logger.info(f">>> After content_type filter: {len(filtered_stories)} stories remain")
+                    else:
+                        logger.warning(f">>> Could not map '{content_type}' to available types, returning all results")
+                else:
+                    logger.warning(f">>> Cannot filter by content_type: no stories have content_type populated")
+                    logger.warning(f">>> Returning all {len(search_results.stories)} stories without content_type filtering")
+
+            conversation_response.results = search_results
+            logger.info(f">>> RESULTS ATTACHED TO RESPONSE: {len(search_results.stories)} stories")
+
+            # Store results in session context for future refinement
+            results_for_context = [story.model_dump() for story in search_results.stories]
+            conversation_contexts[session_key] = results_for_context
+            conversation_cursors[session_key] = len(results_for_context)
+            logger.info(f">>> Stored {len(results_for_context)} stories in session '{session_key}' for refinement")
+            logger.info(f">>> Session contexts now has {len(conversation_contexts)} sessions")
+
+            # Enhance response message with result count
+            result_count = search_results.total
+            if result_count > 0:
+                logger.info(f">>> SUCCESS: Found {result_count} results with full previews")
+            else:
+                logger.info("No results found")
+                conversation_response.message += "\n\nI couldn't find any matching content. Would you like to try a different search?"
+                # Clear context if no results
+                conversation_contexts[session_key] = []
+
+        except Exception as e:
+            logger.error(f">>> STORYBLOK SEARCH ERROR: {str(e)}", exc_info=True)
+            conversation_response.message += "\n\nI encountered an issue searching for content. Please try again."
+
+    elif action == "refine" and filter_term:
+        logger.info(f">>> REFINING PREVIOUS RESULTS with filter: '{filter_term}'")
+        logger.info(f">>> Current session key: {session_key}")
+        logger.info(f">>> Has previous results: {previous_results is not None}")
+
+        if previous_results and len(previous_results) > 0:
+            # Filter results based on the filter term
+            filtered_stories = []
+            filter_lower = filter_term.lower()
+
+            logger.info(f">>> Filtering {len(previous_results)} stories for term: '{filter_term}'")
+
+            for story_dict in previous_results:
+                # Search in story name, body, and slug
+                searchable_text = f"{story_dict.get('name', '')} {story_dict.get('body', '')} {story_dict.get('slug', '')}".lower()
+
+                if filter_lower in searchable_text:
+                    filtered_stories.append(story_dict)
+                    logger.debug(f">>> Match found: {story_dict.get('name', '')}")
+
+            logger.info(f">>> Filtered from {len(previous_results)} to {len(filtered_stories)} stories")
+
+            if filtered_stories:
+                # Convert back to StoryResult objects
+                from backend.models import StoryResult, SearchResults
+                story_results = []
+                for story_dict in filtered_stories:
+                    story_results.append(StoryResult(**story_dict))
+
+                conversation_response.results = SearchResults(
+                    stories=story_results,
+                    total=len(story_results)
+                )
+
+                # Update session context with refined results
+                conversation_contexts[session_key] = filtered_stories
+                conversation_cursors[session_key] = len(filtered_stories)
+
+                logger.info(f">>> REFINEMENT SUCCESSFUL: Returning {len(filtered_stories)} filtered stories")
+            else:
+                conversation_response.message = "I couldn't find any stories matching that criteria in the previous results."
+                logger.info(">>> No stories matched the filter criteria")
+        else:
+            logger.warning(f">>> Refine action detected but no previous results available for session: {session_key}")
+            logger.warning(f">>> All stored sessions: {list(conversation_contexts.keys())}")
+            conversation_response.message = "I don't have access to previous results. Please start with a search first."
+
+    else:
+        if action == "search" and not search_term:
+            logger.warning(f">>> Search action requested but no search term provided!")
+        logger.info(f">>> NO SEARCH PERFORMED - Action: {action}, Has term: {bool(search_term)}, Filter: {bool(filter_term)}")
+
+    return conversation_response
+
+
 @app.post(
     "/api/conversation",
     response_model=ConversationResponse,
@@ -138,314 +555,32 @@ async def conversation(request: ConversationRequest):
         bedrock_client = get_bedrock_client()
         storyblok_client = get_storyblok_client()
         
-        # Limit conversation history to prevent token overflow
-        max_history = settings.max_conversation_history
-        conversation_history = request.conversation_history[-max_history:] if request.conversation_history else []
-        
-        # Generate a stable session key based on FIRST user message
-        # This ensures the key remains consistent across the entire conversation
-        if conversation_history:
-            # Use only the FIRST user message to create a stable session ID
-            user_messages = [msg.content for msg in conversation_history if msg.role == "user"]
-            if user_messages:
-                # Hash only the first user message to keep session stable
-                session_key = hashlib.md5(user_messages[0].encode()).hexdigest()
-            else:
-                session_key = "default"
-        else:
-            # First request - use the current message as session key
-            session_key = hashlib.md5(request.message.encode()).hexdigest()
-        
-        logger.info(f">>> Session key: {session_key}")
-        logger.info(f">>> Conversation history messages: {len(conversation_history)}")
+        conversation_history, session_key, previous_results, previous_analysis = _load_session(request)
         
-        # Extract previous results and analysis from session context
-        previous_results = None
-        previous_analysis = None
-        if session_key in conversation_contexts and conversation_contexts[session_key]:
-            previous_results = conversation_contexts[session_key]
-            logger.info(f">>> Found {len(previous_results)} previous results in session context")
-        else:
-            logger.info(f">>> No previous results found for session: {session_key}")
-            logger.info(f">>> Available sessions: {list(conversation_contexts.keys())}")
-        
-        if session_key in conversation_analyses and conversation_analyses[session_key]:
-            previous_analysis = conversation_analyses[session_key]
-            logger.info(f">>> Found previous analysis in session: {previous_analysis.get('description', 'Unknown')}")
-        
-        # Send message to Claude (run sync boto3 call in thread pool)
+        dispatcher = EarlyDispatcher(storyblok_client)
         try:
-            loop = asyncio.get_event_loop()
-            claude_response = await loop.run_in_executor(
-                executor,
-                lambda: bedrock_client.converse(
-                    message=request.message,
-                    conversation_history=conversation_history,
-                    previous_results=previous_results,
-                    previous_analysis=previous_analysis
-                )
-            )
-        except Exception as e:
-            logger.error(f"Bedrock client error: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Unable to connect to AI service: {str(e)}"
-            )
-        
-        # Extract action and response
-        action = claude_response.get("action", "chat")
-        response_text = claude_response.get("response", "")
-        search_term = claude_response.get("term")
-        filter_term = claude_response.get("filter_term")
-        search_limit = claude_response.get("limit", 10)  # Default to 10 if not specified
-        content_type = claude_response.get("content_type")
-        analysis_type = claude_response.get("analysis_type")
-        clarify_field = claude_response.get("clarify_field")
-        clarify_options = claude_response.get("options")
-        
-        logger.info(f"Claude response - Action: {action}, Term: {search_term}, Filter: {filter_term}, Limit: {search_limit}, ContentType: {content_type}, Message length: {len(response_text)}")
-        
-        # Initialize response
-        conversation_response = ConversationResponse(
-            message=response_text,
-            results=None,
-            action=action
-        )
-        
-        # Handle different action types
-        if action == "clarify":
-            # Ask for clarification - no search needed
-            logger.info(f">>> CLARIFICATION NEEDED: {clarify_field}")
-            conversation_response.message = response_text
-            # Don't clear context, keep previous results available
-            
-        elif action == "analyze" and search_term:
-            # Perform search but present as analysis
-            logger.info(f">>> ANALYZING with term: '{search_term}', type: '{content_type}'")
+            # Send message to Claude (or resolve it locally); with early dispatch the
+            # response is streamed so the search can start before the model has finished
             try:
-                search_results = await storyblok_client.search(term=search_term, limit=100)
-                logger.info(f">>> ANALYSIS FOUND {len(search_results.stories)} stories (total: {search_results.total})")
-                
-                # Fetch full story details for better analysis using Management API
-                if search_results.stories:
-                    for story in search_results.stories:
-                        try:
-                            full_story = await storyblok_client.get_story_by_id(story.story_id)
-                            if full_story:
-                                story.full_story = full_story
-                                # Extract content_type from content.component
-                                if full_story.get("content") and isinstance(full_story["content"], dict):
-                                    story.content_type = full_story["content"].get("component")
-                        except Exception as e:
-                            logger.warning(f"Could not fetch full story for ID {story.story_id}: {e}")
-                
-                # Filter by content_type if specified AND if stories have content_type populated
-                if content_type and search_results.stories:
-                    # Check if any stories have content_type populated
-                    stories_with_type = [s for s in search_results.stories if s.content_type]
-                    if stories_with_type:
-                        # Get unique content types from results
-                        available_types = list(set([s.content_type for s in stories_with_type]))
-                        logger.info(f">>> Available content types: {available_types}")
-                        
-                        # Use Claude to map user's requested type to actual available type
-                        mapped_type = bedrock_client.map_content_type(content_type, available_types)
-                        
-                        if mapped_type:
-                            initial_count = len(search_results.stories)
-                            logger.info(f">>> Mapped user request '{content_type}' to '{mapped_type}'")
-                            logger.info(f">>> Filtering {initial_count} stories by mapped content_type: {mapped_type}")
-                            filtered_stories = [
-                                s for s in search_results.stories 
-                                if s.content_type and mapped_type.lower() in s.content_type.lower()
-                            ]
-                            search_results.stories = filtered_stories
-                            logger.info(f">>> After content_type filter: {len(filtered_stories)} stories remain")
-                        else:
-                            logger.warning(f">>> Could not map '{content_type}' to available types, returning all results")
-                    else:
-                        logger.warning(f">>> Cannot filter by content_type: no stories have content_type populated")
-                        logger.warning(f">>> Returning all {len(search_results.stories)} stories without content_type filtering")
-                
-                # Store results for potential listing later
-                results_for_context = [story.model_dump() for story in search_results.stories]
-                conversation_contexts[session_key] = results_for_context
-                
-                # Store analysis data
-                analysis_data = {
-                    "description": f"Analyzed {search_term}" + (f" ({content_type})" if content_type else ""),
-                    "count": len(search_results.stories),
-                    "search_term": search_term,
-                    "content_type": content_type,
-                    "analysis_type": analysis_type or "count"
-                }
-                conversation_analyses[session_key] = analysis_data
-                conversation_response.analysis = analysis_data
-                
-                # Provide conversational response with count
-                count = len(search_results.stories)
-                if count > 0:
-                    type_str = f"{content_type}s" if content_type else "stories"
-                    conversation_response.message = f"I found {count} {type_str} that mention {search_term}. Would you like me to list them?"
-                    logger.info(f">>> ANALYSIS COMPLETE: {count} results stored for potential listing")
-                else:
-                    conversation_response.message = f"I couldn't find any {content_type if content_type else 'stories'} that mention {search_term}."
-                    conversation_contexts[session_key] = []
-                    
+                claude_response = {}
+                async for kind, value in _converse_turn(
+                    bedrock_client, dispatcher, request.message, conversation_history,
+                    session_key, previous_results, previous_analysis
+                ):
+                    if kind == "final":
+                        claude_response = value
             except Exception as e:
-                logger.error(f">>> ANALYSIS ERROR: {str(e)}", exc_info=True)
-                conversation_response.message += "\n\nI encountered an issue analyzing the content. Please try again."
-        
-        elif action == "list_analyzed":
-            # List the previously analyzed results with optional limit
-            logger.info(f">>> LISTING ANALYZED RESULTS for session: {session_key}, limit: {search_limit}")
-            if previous_results and len(previous_results) > 0:
-                from backend.models import StoryResult, SearchResults
-                
-                # Apply limit if specified by user
-                results_to_show = previous_results[:search_limit] if search_limit else previous_results
-                
-                story_results = []
-                for story_dict in results_to_show:
-                    story_results.append(StoryResult(**story_dict))
-                
-                conversation_response.results = SearchResults(
-                    stories=story_results,
-                    total=len(story_results)
+                logger.error(f"Bedrock client error: {str(e)}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Unable to connect to AI service: {str(e)}"
                 )
-                logger.info(f">>> LISTED {len(story_results)} of {len(previous_results)} analyzed stories (limit applied: {search_limit})")
-            else:
-                conversation_response.message = "I don't have any analyzed results to show. Please ask me to search or analyze first."
-                logger.warning(f">>> No analyzed results to list for session: {session_key}")
-        
-        elif action == "search" and search_term:
-            logger.info(f">>> PERFORMING SEARCH with term: '{search_term}', limit: {search_limit}, type: '{content_type}'")
-            try:
-                search_results = await storyblok_client.search(term=search_term, limit=search_limit)
-                logger.info(f">>> SEARCH RETURNED {len(search_results.stories)} stories (total: {search_results.total})")
-                
-                # Fetch full story details for each result using Management API
-                if search_results.stories:
-                    logger.info(f">>> Fetching full details for {len(search_results.stories)} stories")
-                    for story in search_results.stories:
-                        try:
-                            full_story = await storyblok_client.get_story_by_id(story.story_id)
-                            if full_story:
-                                story.full_story = full_story
-                                # Extract content_type from content.component
-                                if full_story.get("content") and isinstance(full_story["content"], dict):
-                                    story.content_type = full_story["content"].get("component")
-                                logger.debug(f"Fetched full story for ID {story.story_id}: type={story.content_type}")
-                        except Exception as e:
-                            logger.warning(f"Could not fetch full story for ID {story.story_id}: {e}")
-                            # Continue without full story data
-                
-                # Filter by content_type if specified AND if stories have content_type populated
-                if content_type and search_results.stories:
-                    # Check if any stories have content_type populated
-                    stories_with_type = [s for s in search_results.stories if s.content_type]
-                    if stories_with_type:
-                        # Get unique content types from results
-                        available_types = list(set([s.content_type for s in stories_with_type]))
-                        logger.info(f">>> Available content types: {available_types}")
-                        
-                        # Use Claude to map user's requested type to actual available type
-                        loop = asyncio.get_event_loop()
-                        mapped_type = await loop.run_in_executor(
-                            executor,
-                            lambda: bedrock_client.map_content_type(content_type, available_types)
-                        )
-                        
-                        if mapped_type:
-                            initial_count = len(search_results.stories)
-                            logger.info(f">>> Mapped user request '{content_type}' to '{mapped_type}'")
-                            logger.info(f">>> Filtering {initial_count} stories by mapped content_type: {mapped_type}")
-                            filtered_stories = [
-                                s for s in search_results.stories 
-                                if s.content_type and mapped_type.lower() in s.content_type.lower()
-                            ]
-                            search_results.stories = filtered_stories
-                            search_results.total = len(filtered_stories)
-                            logger.info(f">>> After content_type filter: {len(filtered_stories)} stories remain")
-                        else:
-                            logger.warning(f">>> Could not map '{content_type}' to available types, returning all results")
-                    else:
-                        logger.warning(f">>> Cannot filter by content_type: no stories have content_type populated")
-                        logger.warning(f">>> Returning all {len(search_results.stories)} stories without content_type filtering")
-                
-                conversation_response.results = search_results
-                logger.info(f">>> RESULTS ATTACHED TO RESPONSE: {len(search_results.stories)} stories")
-                
-                # Store results in session context for future refinement
-                results_for_context = [story.model_dump() for story in search_results.stories]
-                conversation_contexts[session_key] = results_for_context
-                logger.info(f">>> Stored {len(results_for_context)} stories in session '{session_key}' for refinement")
-                logger.info(f">>> Session contexts now has {len(conversation_contexts)} sessions")
-                
-                # Enhance response message with result count
-                result_count = search_results.total
-                if result_count > 0:
-                    logger.info(f">>> SUCCESS: Found {result_count} results with full previews")
-                else:
-                    logger.info("No results found")
-                    conversation_response.message += "\n\nI couldn't find any matching content. Would you like to try a different search?"
-                    # Clear context if no results
-                    conversation_contexts[session_key] = []
-                    
-            except Exception as e:
-                logger.error(f">>> STORYBLOK SEARCH ERROR: {str(e)}", exc_info=True)
-                conversation_response.message += "\n\nI encountered an issue searching for content. Please try again."
-        
-        elif action == "refine" and filter_term:
-            logger.info(f">>> REFINING PREVIOUS RESULTS with filter: '{filter_term}'")
-            logger.info(f">>> Current session key: {session_key}")
-            logger.info(f">>> Has previous results: {previous_results is not None}")
             
-            if previous_results and len(previous_results) > 0:
-                # Filter results based on the filter term
-                filtered_stories = []
-                filter_lower = filter_term.lower()
-                
-                logger.info(f">>> Filtering {len(previous_results)} stories for term: '{filter_term}'")
-                
-                for story_dict in previous_results:
-                    # Search in story name, body, and slug
-                    searchable_text = f"{story_dict.get('name', '')} {story_dict.get('body', '')} {story_dict.get('slug', '')}".lower()
-                    
-                    if filter_lower in searchable_text:
-                        filtered_stories.append(story_dict)
-                        logger.debug(f">>> Match found: {story_dict.get('name', '')}")
-                
-                logger.info(f">>> Filtered from {len(previous_results)} to {len(filtered_stories)} stories")
-                
-                if filtered_stories:
-                    # Convert back to StoryResult objects
-                    from backend.models import StoryResult, SearchResults
-                    story_results = []
-                    for story_dict in filtered_stories:
-                        story_results.append(StoryResult(**story_dict))
-                    
-                    conversation_response.results = SearchResults(
-                        stories=story_results,
-                        total=len(story_results)
-                    )
-                    
-                    # Update session context with refined results
-                    conversation_contexts[session_key] = filtered_stories
-                    
-                    logger.info(f">>> REFINEMENT SUCCESSFUL: Returning {len(filtered_stories)} filtered stories")
-                else:
-                    conversation_response.message = "I couldn't find any stories matching that criteria in the previous results."
-                    logger.info(">>> No stories matched the filter criteria")
-            else:
-                logger.warning(f">>> Refine action detected but no previous results available for session: {session_key}")
-                logger.warning(f">>> All stored sessions: {list(conversation_contexts.keys())}")
-                conversation_response.message = "I don't have access to previous results. Please start with a search first."
-        
-        else:
-            if action == "search" and not search_term:
-                logger.warning(f">>> Search action requested but no search term provided!")
-            logger.info(f">>> NO SEARCH PERFORMED - Action: {action}, Has term: {bool(search_term)}, Filter: {bool(filter_term)}")
+            conversation_response = await _apply_action(
+                claude_response, session_key, previous_results, bedrock_client, storyblok_client, dispatcher
+            )
+        finally:
+            dispatcher.cancel()
         
         logger.info(f">>> FINAL RESPONSE: message length={len(conversation_response.message)}, has_results={conversation_response.results is not None}")
         if conversation_response.results:
@@ -476,6 +611,69 @@ async def conversation(request: ConversationRequest):
         )
 
 
+@app.post("/api/conversation/stream", tags=["Conversation"])
+async def conversation_stream(request: ConversationRequest):
+    """
+    Streaming conversation endpoint (server-sent events).
+
+    Uses Bedrock ConverseStream so a voice client can start speaking before
+    the model has finished. Events, in order:
+
+    - ``text``: ``{"delta": ...}`` fragments of the response text as generated
+    - ``sentence``: ``{"text": ...}`` each complete sentence (for TTS)
+    - ``action``: the parsed action (action, term, limit, ...)
+    - ``results``: the full ConversationResponse, as /api/conversation returns it
+    - ``done``: end of stream (``error`` with ``{"detail": ...}`` on failure)
+
+    Args:
+        request: ConversationRequest with message and conversation history
+
+    Returns:
+        A text/event-stream response
+    """
+    logger.info(f"Received streaming conversation request: '{request.message[:50]}...'")
+    bedrock_client = get_bedrock_client()
+    storyblok_client = get_storyblok_client()
+    conversation_history, session_key, previous_results, previous_analysis = _load_session(request)
+
+    async def events():
+        splitter = SentenceSplitter()
+        dispatcher = EarlyDispatcher(storyblok_client)
+        claude_response: Dict[str, Any] = {}
+        try:
+            async for kind, value in _converse_turn(
+                bedrock_client, dispatcher, request.message, conversation_history,
+                session_key, previous_results, previous_analysis
+            ):
+                if kind == "final":
+                    claude_response = value
+                    continue
+                yield sse_event("text", {"delta": value})
+                for sentence in splitter.feed(value):
+                    yield sse_event("sentence", {"text": sentence})
+            rest = splitter.flush()
+            if rest:
+                yield sse_event("sentence", {"text": rest})
+
+            yield sse_event("action", {k: v for k, v in claude_response.items() if k != "raw_response"})
+            conversation_response = await _apply_action(
+                claude_response, session_key, previous_results, bedrock_client, storyblok_client, dispatcher
+            )
+            yield sse_event("results", conversation_response.model_dump())
+            yield sse_event("done", {})
+        except Exception as e:
+            logger.error(f"Error streaming conversation: {str(e)}", exc_info=True)
+            yield sse_event("error", {"detail": f"Error processing conversation: {str(e)}"})
+        finally:
+            dispatcher.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/test-bedrock", tags=["Debug"])
 async def test_bedrock():
     """Test endpoint for Bedrock connection (debug only)."""
@@ -484,13 +682,10 @@ async def test_bedrock():
     
     try:
         bedrock_client = get_bedrock_client()
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            executor,
-            lambda: bedrock_client.converse(
-                message="Hello, can you help me search for content?",
-                conversation_history=[]
-            )
+        response = await bedrock_client.aconverse(
+            message="Hello, can you help me search for content?",
+            conversation_history=[],
+            priority=PRIORITY_BACKGROUND
         )
         return {"status": "success", "response": response}
     except Exception as e:
@@ -511,6 +706,79 @@ async def test_storyblok(term: str = "test"):
         return {"status": "error", "error": str(e)}
 
 
+@app.get("/api/index/search", tags=["Index"])
+async def index_search(q: str, limit: int = 10, offset: int = 0, content_type: Optional[str] = None):
+    """
+    Full-text search over the local content mirror (see backend/sync.py).
+    
+    Args:
+        q: Search text; every word must match
+        limit: Maximum number of results
+        offset: Pagination offset
+        content_type: Optional exact component filter
+        
+    Returns:
+        Matching stories plus the total match count
+    """
+    index = get_content_index()
+    limit = max(1, min(limit, settings.search_max_results))
+    stories = await asyncio.to_thread(index.search, q, limit, offset, content_type)
+    count = await asyncio.to_thread(index.count, q, content_type)
+    return {
+        "query": q,
+        "count": count,
+        "results": SearchResults(stories=stories, total=len(stories))
+    }
+
+
+@app.get("/api/index/stats", tags=["Index"])
+async def index_stats():
+    """Story counts per content type and sync state of the local content mirror."""
+    return await asyncio.to_thread(get_content_index().stats)
+
+
+@app.post("/api/webhooks/storyblok", status_code=status.HTTP_202_ACCEPTED, tags=["Webhooks"])
+async def storyblok_webhook(request: Request):
+    """
+    Receive Storyblok story events and invalidate affected caches.
+    
+    The raw body must carry a valid ``webhook-signature`` (HMAC-SHA1 with
+    STORYBLOK_WEBHOOK_SECRET). Events are batched; the response is sent
+    before the invalidation runs.
+    
+    Returns:
+        Acceptance status and the current batch size
+    """
+    secret = settings.storyblok_webhook_secret
+    if not secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook secret is not configured"
+        )
+    
+    body = await request.body()
+    if not verify_signature(body, request.headers.get("webhook-signature"), secret):
+        logger.warning("Rejected Storyblok webhook with invalid signature")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature")
+    
+    try:
+        event = StoryblokWebhookEvent.model_validate_json(body)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid webhook payload: {e}")
+    
+    if event.story_id is None:
+        logger.info(f"Ignoring Storyblok webhook without story_id: {event.action}")
+        return {"status": "ignored", "action": event.action}
+    
+    if event.space_id is not None and str(event.space_id) != str(settings.storyblok_space_id):
+        logger.info(f"Ignoring Storyblok webhook for other space {event.space_id}")
+        return {"status": "ignored", "action": event.action}
+    
+    logger.info(f"Storyblok webhook: {event.action} story {event.story_id}")
+    queued = get_invalidation_batcher().enqueue(event.story_id, event.action, event.space_id)
+    return {"status": "accepted", "action": event.action, "story_id": event.story_id, "queued": queued}
+
+
 @app.get("/api/story/{story_id}", tags=["Stories"])
 async def get_full_story(story_id: int):
     """
@@ -0,0 +1,145 @@
+"""
+Lightweight in-process metrics for the Storyblok Voice Assistant backend.
+Tracks counters, gauges and latency observations and exposes a JSON snapshot.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+
+class Observation:
+    """Running summary of observed values with a bounded window for percentiles."""
+
+    def __init__(self, window: int = 512):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        """Record a single value."""
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.recent.append(value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Return the given percentile over the recent window.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            The percentile value, or None if nothing was observed yet
+        """
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the summary for the metrics endpoint."""
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and observations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._observations: Dict[str, Observation] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Increase a counter by value."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to an absolute value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a value (usually a duration in seconds) for a named series."""
+        with self._lock:
+            observation = self._observations.get(name)
+            if observation is None:
+                observation = self._observations[name] = Observation()
+            observation.add(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Context manager that observes the elapsed wall time in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def counter(self, name: str) -> float:
+        """Return the current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def percentile(self, name: str, pct: float) -> Optional[float]:
+        """Return a percentile for an observed series, or None if empty."""
+        with self._lock:
+            observation = self._observations.get(name)
+            return observation.percentile(pct) if observation else None
+
+    def mean(self, name: str) -> Optional[float]:
+        """Return the mean for an observed series, or None if empty."""
+        with self._lock:
+            observation = self._observations.get(name)
+            if not observation or not observation.count:
+                return None
+            return observation.total / observation.count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable copy of all metrics."""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items())),
+                "observations": {
+                    name: observation.to_dict()
+                    for name, observation in sorted(self._observations.items())
+                },
+            }
+
+    def reset(self) -> None:
+        """Clear all metrics (used by tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+# Singleton instance
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Metrics:
+    """Get or create the metrics registry singleton."""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
@@ -0,0 +1,119 @@
+"""
+Bedrock model routing.
+Picks the model for each task (planning, content type mapping and
+escalations), tracks per-model latency, and falls back to another model when
+the preferred one is persistently slow or not available in the account.
+"""
+
+import logging
+import re
+from typing import Dict, Optional, Set
+
+from backend.config import get_settings
+from backend.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+TASK_PLANNER = "planner"
+TASK_MAPPER = "mapper"
+TASK_ESCALATION = "escalation"
+
+# Weight of the newest sample in the per-model latency average
+_EWMA_ALPHA = 0.2
+# While a slow model is bypassed its average decays, so it is retried eventually
+_BYPASS_DECAY = 0.95
+
+
+def model_label(model_id: str) -> str:
+    """Short metric-friendly model name ("anthropic.claude-3-haiku-20240307-v1:0" -> "claude-3-haiku")."""
+    name = model_id.split(".", 1)[-1].split(":", 1)[0]
+    name = re.sub(r"-\d{8}.*$", "", name)
+    return re.sub(r"[^\w-]", "_", name)
+
+
+class ModelRouter:
+    """
+    Per-task model selection for BedrockClient.
+
+    Each task has a model ID (unset settings fall back to bedrock_model_id).
+    The escalation model is the larger model planner turns escalate to. A model
+    whose average latency exceeds ``bedrock_model_latency_budget`` is
+    bypassed for its task's fallback while the fallback is faster, and a
+    model Bedrock reports as missing or not enabled is not used again.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.metrics = get_metrics()
+        self.default_model = self.settings.bedrock_model_id
+        self.models: Dict[str, str] = {
+            TASK_PLANNER: self.settings.bedrock_planner_model_id or self.default_model,
+            TASK_MAPPER: self.settings.bedrock_mapper_model_id or self.default_model,
+            TASK_ESCALATION: self.settings.bedrock_escalation_model_id or self.default_model,
+        }
+        self.latency_budget = self.settings.bedrock_model_latency_budget
+        self.latency: Dict[str, float] = {}
+        self.unavailable: Set[str] = set()
+
+    def resolve(self, model_id: str) -> str:
+        """The model actually used for model_id (the default model once it was found unavailable)."""
+        return self.default_model if model_id in self.unavailable else model_id
+
+    def fallback_for(self, task: str) -> str:
+        """Model used when the task's own model is slow: the escalation model, or the planner model for escalations."""
+        fallback = self.models[TASK_PLANNER] if task == TASK_ESCALATION else self.models[TASK_ESCALATION]
+        return self.resolve(fallback)
+
+    def model_for(self, task: str) -> str:
+        """
+        Model to use for a task right now.
+
+        Args:
+            task: TASK_PLANNER, TASK_MAPPER or TASK_ESCALATION
+
+        Returns:
+            A Bedrock model ID
+        """
+        primary = self.resolve(self.models[task])
+        fallback = self.fallback_for(task)
+        if not self.latency_budget or fallback == primary:
+            return primary
+        primary_latency = self.latency.get(primary, 0.0)
+        if primary_latency > self.latency_budget and self.latency.get(fallback, 0.0) < primary_latency:
+            self.latency[primary] = primary_latency * _BYPASS_DECAY
+            self.metrics.increment("bedrock.routing.latency_fallbacks")
+            logger.info(
+                f"Routing {task} to {fallback}: {primary} averages {primary_latency:.2f}s "
+                f"(budget {self.latency_budget}s)"
+            )
+            return fallback
+        return primary
+
+    def escalation_model(self, used_model: str) -> Optional[str]:
+        """Larger model to retry an uncertain planner turn with, or None if it was already used."""
+        target = self.resolve(self.models[TASK_ESCALATION])
+        return None if target == self.resolve(used_model) else target
+
+    def record(self, model_id: str, seconds: float, error: bool = False) -> None:
+        """Record one call's latency (and whether it failed) for a model."""
+        label = model_label(model_id)
+        self.metrics.observe(f"bedrock.model.{label}.latency", seconds)
+        if error:
+            self.metrics.increment(f"bedrock.model.{label}.errors")
+            return
+        previous = self.latency.get(model_id)
+        self.latency[model_id] = seconds if previous is None else (1 - _EWMA_ALPHA) * previous + _EWMA_ALPHA * seconds
+
+    def mark_unavailable(self, model_id: str) -> bool:
+        """
+        Stop routing to a model Bedrock rejected as missing or not enabled.
+
+        Returns:
+            True if requests can fall back to the default model
+        """
+        if model_id == self.default_model:
+            return False
+        self.unavailable.add(model_id)
+        self.metrics.increment("bedrock.routing.unavailable_models")
+        logger.warning(f"Model {model_id} is not available, routing its tasks to {self.default_model}")
+        return True
@@ -49,6 +49,15 @@ class ConversationResponse(BaseModel):
     analysis: Optional[dict] = Field(None, description="Analysis data (e.g., counts, statistics)")
 
 
+class StoryblokWebhookEvent(BaseModel):
+    """Story event payload sent by Storyblok webhooks."""
+    action: str = Field(..., description="Event action (published, unpublished, deleted, moved)")
+    text: Optional[str] = Field(None, description="Human-readable event description")
+    space_id: Optional[int] = Field(None, description="Space the story belongs to")
+    story_id: Optional[int] = Field(None, description="Affected story ID")
+    full_slug: Optional[str] = Field(None, description="Full slug of the affected story")
+
+
 class HealthCheck(BaseModel):
     """Health check response."""
     status: str = Field(default="healthy")
@@ -0,0 +1,168 @@
+"""
+Planner response cache.
+Caches parsed planner (Bedrock) decisions keyed on the normalized user
+message plus a digest of the conversation history and session context, so
+repeated opening questions are answered without a Bedrock turn. Lookups
+match exactly, or optionally by TF-IDF cosine similarity between messages
+asked in the same context.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.cache import TTLCache
+from backend.config import get_settings
+from backend.intent import NUMBER_WORDS, normalize_message
+from backend.models import Message
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[\w'-]+")
+
+# Words that don't change what a message asks for
+_STOPWORDS = {
+    "a", "an", "the", "of", "on", "about", "for", "to", "in", "with", "me", "us", "please", "do", "does",
+    "is", "are", "any", "some", "can", "could", "would", "you", "i", "we", "hey", "hi", "just", "that",
+}
+
+
+def context_digest(
+    conversation_history: List[Message],
+    previous_results: Optional[List[Dict[str, Any]]] = None,
+    previous_analysis: Optional[Dict[str, Any]] = None,
+    extra: Iterable[Any] = ()
+) -> str:
+    """
+    Digest of everything besides the message that the planner's decision depends on.
+
+    Args:
+        conversation_history: Messages sent with the turn
+        previous_results: Session results (only their story IDs count)
+        previous_analysis: Session analysis
+        extra: Anything else the prompt depends on (e.g. the content type list)
+
+    Returns:
+        A hex digest
+    """
+    payload = {
+        "history": [[msg.role, msg.content] for msg in conversation_history],
+        "results": [r.get("story_id") for r in previous_results or []],
+        "analysis": [previous_analysis.get("description"), previous_analysis.get("count")] if previous_analysis else None,
+        "extra": list(extra),
+    }
+    return hashlib.sha1(json.dumps(payload, default=str, sort_keys=True).encode()).hexdigest()
+
+
+def _tokens(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text) if token not in _STOPWORDS]
+
+
+def _numbers(tokens: List[str]) -> List[int]:
+    return [int(t) if t.isdigit() else NUMBER_WORDS[t] for t in tokens if t.isdigit() or t in NUMBER_WORDS]
+
+
+class PlannerCache:
+    """
+    TTL + LRU cache of parsed planner decisions.
+
+    Keys are (normalized message, context digest). With near-duplicate
+    matching on, a miss falls back to the most similar cached message in the
+    same context whose TF-IDF cosine similarity reaches the threshold and
+    which asks for the same numbers ("first 5" never matches "first 10").
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        near_duplicates: Optional[bool] = None,
+        similarity_threshold: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.cache = TTLCache(
+            "planner",
+            max_entries=max_entries or settings.planner_cache_max_entries,
+            ttl=settings.planner_cache_ttl if ttl is None else ttl
+        )
+        self.near_duplicates = settings.planner_cache_near_duplicates if near_duplicates is None else near_duplicates
+        self.similarity_threshold = (
+            settings.planner_cache_similarity_threshold if similarity_threshold is None else similarity_threshold
+        )
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def get(self, message: str, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of the cached decision for the message in this context.
+
+        Args:
+            message: The user's message
+            digest: context_digest() of the turn
+
+        Returns:
+            The cached decision, or None on a miss
+        """
+        text = normalize_message(message)
+        key: Tuple[str, str] = (text, digest)
+        if key not in self.cache and self.near_duplicates:
+            key = self._nearest(text, digest) or key
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        if key[0] != text:
+            self.cache.record("near_hits")
+            logger.info(f"Planner cache near-duplicate hit: '{text}' ~ '{key[0]}'")
+        return {**cached, "source": "cache"}
+
+    def set(self, message: str, digest: str, decision: Dict[str, Any]) -> None:
+        """Cache a parsed planner decision (error responses are not cached)."""
+        if decision.get("action") == "error":
+            return
+        self.cache.set((normalize_message(message), digest), dict(decision))
+
+    def _nearest(self, text: str, digest: str) -> Optional[Tuple[str, str]]:
+        """Most similar fresh cached key in the same context above the threshold."""
+        documents = {key: _tokens(key[0]) for key in self.cache.keys() if key in self.cache}
+        candidates = [key for key in documents if key[1] == digest]
+        if not candidates:
+            return None
+
+        query = _tokens(text)
+        frequency = Counter(token for tokens in documents.values() for token in set(tokens))
+        frequency.update(set(query))
+        count = len(documents) + 1
+
+        def vector(tokens: List[str]) -> Dict[str, float]:
+            # Smoothed IDF so terms present in every document still count a little
+            return {
+                token: tf * (math.log((1 + count) / (1 + frequency[token])) + 1)
+                for token, tf in Counter(tokens).items()
+            }
+
+        def norm(v: Dict[str, float]) -> float:
+            return math.sqrt(sum(weight * weight for weight in v.values()))
+
+        query_vector = vector(query)
+        query_norm = norm(query_vector)
+        if not query_norm:
+            return None
+        best, best_score = None, 0.0
+        for key in candidates:
+            if _numbers(documents[key]) != _numbers(query):
+                continue
+            candidate = vector(documents[key])
+            dot = sum(weight * candidate.get(token, 0.0) for token, weight in query_vector.items())
+            score = dot / (query_norm * (norm(candidate) or 1.0))
+            if score > best_score:
+                best, best_score = key, score
+        return best if best_score >= self.similarity_threshold else None
+
+    def clear(self) -> None:
+        """Drop every cached decision."""
+        self.cache.clear()
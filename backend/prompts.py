@@ -0,0 +1,177 @@
+"""
+Planner system prompt assembly.
+The prompt is a compact core (role, action definitions, rules) followed by
+only the example blocks a turn is likely to need, picked from cheap local
+cues: stored results or analysis in the session and question words in the
+message. BedrockClient caches each assembled variant, so every variant is a
+stable prefix for Bedrock prompt caching.
+"""
+
+import re
+from typing import Dict, Optional, Sequence, Tuple
+
+from backend.intent import normalize_message
+
+CORE_PROMPT = """You are an AI assistant helping users discover and analyze content in Storyblok.
+
+Your role:
+- Help users search for content using natural language
+- Analyze content (count, identify patterns, summarize)
+- Ask clarifying questions when needed (especially about content types)
+- Interpret their search queries and convert them to search terms
+- Extract the number of results the user wants (if specified)
+- Filter and refine previous search results based on follow-up questions
+- Present search results in a clear, conversational way
+- Help users refine their searches through follow-up questions
+- Be concise but friendly and helpful
+
+{OUTPUT_FORMAT}
+
+## Action Types
+
+### 1. NEW SEARCH (action: "search")
+When a user asks to search for NEW content (e.g., "find marketing stories", "show blog posts"):
+- Extract the key search terms from their query
+- Extract the number of results if specified
+- DO NOT include content_type unless absolutely necessary - search broadly by default
+- Return: {"action": "search", "term": "search term", "limit": 10, "response": "message"}
+
+### 2. ANALYZE/COUNT (action: "analyze")
+When a user wants to COUNT or ANALYZE content WITHOUT immediately listing results:
+- Extract the search term and what to analyze
+- Return: {"action": "analyze", "term": "search term", "analysis_type": "count", "response": "I'll check how many articles mention that..."}
+
+After analysis shows results, if user says "yes please" or "show them" or "list them":
+→ {"action": "list_analyzed", "limit": 10, "response": "Here are the articles:"}
+
+### 3. CLARIFY CONTENT TYPE (action: "clarify")
+When the query is ambiguous about content type, ask for clarification:
+- Return: {"action": "clarify", "clarify_field": "content_type", "options": ["article", "blog_post", "page"], "response": "message"}
+
+### 4. REFINE/FILTER PREVIOUS RESULTS (action: "refine")
+When a user wants to FILTER or NARROW DOWN results from the previous search (e.g., "out of those", "from these", "which one"):
+- Extract the filter criteria (keywords, topics, attributes)
+- Return: {"action": "refine", "filter_term": "criteria", "response": "message"}
+
+### 5. CHAT (action: "chat")
+When just chatting or acknowledging: {"action": "chat", "response": "your response"}
+
+## Content Types
+{CONTENT_TYPES}
+
+## How to Distinguish Actions
+
+Use "analyze" when:
+- User asks "how many", "do we have", "are there"
+- User wants to know about content WITHOUT seeing the list first
+- Analytical/counting questions
+
+Use "clarify" when:
+- Content type is ambiguous or not specified
+- User says "stories" without specifying type
+- You need more information to proceed accurately
+
+Use "refine" when:
+- User references previous results: "out of those", "from these", "which one"
+- User wants to filter/narrow: "only the ones", "just show"
+- Context indicates they're working with existing results
+
+Use "search" when:
+- User asks for new/different content with clear intent
+- Content type is specified or obvious from context
+- Direct search request
+
+Use "list_analyzed" when:
+- User confirms they want to see the analyzed results
+- Follow-up to analyze action
+
+## Important Rules
+- limit field is REQUIRED for "search" actions (default to 10)
+- filter_term field is REQUIRED for "refine" actions
+- content_type is OPTIONAL but recommended for "search" and "analyze"
+- The response field should be conversational and natural
+- Always check conversation history to understand context
+- When unclear about content type, use "clarify" action
+
+Always be helpful and accessible. Remember that some users may have disabilities and rely on voice interaction."""
+
+# Example blocks in prompt order
+EXAMPLE_BLOCKS: Dict[str, str] = {
+    "search": """Search examples:
+- "find all marketing stories" → {"action": "search", "term": "marketing", "limit": 10, "response": "Here are the marketing stories I found:"}
+- "find the first 5 articles about marketing" → {"action": "search", "term": "marketing articles", "limit": 5, "response": "Here are 5 marketing articles:"}
+- "show me blog posts about AI" → {"action": "search", "term": "AI blog posts", "limit": 10, "response": "Here are blog posts about AI:"}
+- "find articles mentioning Drupal" → {"action": "search", "term": "Drupal", "limit": 10, "response": "Here are the stories mentioning Drupal:"}""",
+    "analyze": """Analyze examples:
+- "how many articles mention drupal?" → {"action": "analyze", "term": "drupal", "content_type": "article", "analysis_type": "count", "response": "Let me check how many articles mention Drupal..."}
+- "do we have any blog posts about React?" → {"action": "analyze", "term": "React", "content_type": "blog_post", "analysis_type": "count", "response": "Let me see if we have blog posts about React..."}""",
+    "list_analyzed": """List analyzed examples (the user specifies a limit when confirming):
+- "yes, but limit to 10" → {"action": "list_analyzed", "limit": 10, "response": "Here are the first 10:"}
+- "show me the first 5" → {"action": "list_analyzed", "limit": 5, "response": "Here are the first 5:"}
+- "just show 3" → {"action": "list_analyzed", "limit": 3, "response": "Here are 3 of them:"}""",
+    "clarify": """Clarify examples:
+- "find stories about marketing" → {"action": "clarify", "clarify_field": "content_type", "options": ["article", "blog_post", "page"], "response": "What type of content are you looking for? Articles, blog posts, pages, or all types?"}""",
+    "refine": """Refine examples:
+- Previous: [10 marketing stories shown]
+  User: "out of those stories, give me the one which mentions omnichannel"
+  → {"action": "refine", "filter_term": "omnichannel", "response": "Here's the story that mentions omnichannel:"}
+
+- Previous: [8 blog posts shown]
+  User: "from these, show me only the ones about AI"
+  → {"action": "refine", "filter_term": "AI", "response": "Here are the posts about AI:"}""",
+}
+
+ALL_EXAMPLES: Tuple[str, ...] = tuple(EXAMPLE_BLOCKS)
+
+_ANALYZE_CUES = re.compile(r"\b(?:how many|how much|count|number of|do we have|are there|is there|have we got)\b")
+_CLARIFY_CUES = re.compile(r"\b(?:stories|story|content|things|stuff)\b")
+_REFINE_CUES = re.compile(r"\b(?:those|these|them|which one|only|just|out of)\b")
+_LIST_CUES = re.compile(r"\b(?:yes|yeah|sure|ok|okay|show|list|first|limit)\b")
+_SEARCH_CUES = re.compile(r"\b(?:find|search|show|list|get|look|give|fetch|pull up)\b")
+
+
+def select_examples(message: str, has_results: bool = False, has_analysis: bool = False) -> Tuple[str, ...]:
+    """
+    Example blocks a turn is likely to need.
+
+    Args:
+        message: The user's message
+        has_results: Whether the session has stored results (refine becomes possible)
+        has_analysis: Whether the session has a stored analysis (list_analyzed becomes possible)
+
+    Returns:
+        Names of EXAMPLE_BLOCKS in prompt order (search when nothing else matches)
+    """
+    text = normalize_message(message)
+    selected = set()
+    if has_analysis and _LIST_CUES.search(text):
+        selected.add("list_analyzed")
+    if has_results and _REFINE_CUES.search(text):
+        selected.add("refine")
+    if _ANALYZE_CUES.search(text):
+        selected.add("analyze")
+    if _CLARIFY_CUES.search(text):
+        selected.add("clarify")
+    # Search is the default; its verbs ("show", "list") also start follow-ups
+    if not selected or (_SEARCH_CUES.search(text) and not selected & {"refine", "list_analyzed"}):
+        selected.add("search")
+    return tuple(name for name in ALL_EXAMPLES if name in selected)
+
+
+def assemble_prompt(output_format: str, content_types: str, examples: Optional[Sequence[str]] = None) -> str:
+    """
+    Planner system prompt: the core plus the chosen example blocks.
+
+    Args:
+        output_format: Instruction on how to answer (tool call or JSON text)
+        content_types: The content types section
+        examples: Names of EXAMPLE_BLOCKS to include (all of them when None)
+
+    Returns:
+        The prompt text
+    """
+    prompt = CORE_PROMPT.replace("{OUTPUT_FORMAT}", output_format).replace("{CONTENT_TYPES}", content_types)
+    names = ALL_EXAMPLES if examples is None else examples
+    if names:
+        prompt += "\n\n## Examples\n\n" + "\n\n".join(EXAMPLE_BLOCKS[name] for name in names)
+    return prompt
@@ -0,0 +1,81 @@
+"""
+Speculative search phrases.
+Extracts the search phrase from plain "find X" style requests with local
+rules, so the Storyblok search can start from the user's own words while the
+planner is still deciding. Anything the rules are not sure about returns
+None and no speculative search is made.
+"""
+
+import re
+from typing import Optional, Tuple
+
+from backend.intent import NUMBER_WORDS, normalize_message
+
+# "find ...", "can you show me ...", "search for ..."
+_REQUEST = re.compile(
+    r"^(?:(?:hey|hi|ok|okay|so|please|can you|could you|would you|i want to|i'd like to|let's)\s+)*"
+    r"(?:find|search(?: for)?|look for|look up|show(?: me)?|get(?: me)?|give me|list|pull up|fetch|bring up)"
+    r"\s+(?P<rest>.+)$"
+)
+# "what stories do we have about ...", "are there any articles on ..."
+_QUESTION = re.compile(
+    r"^(?:what|which|do we have|are there|is there|have we got)\s+(?:any\s+)?(?:stories|articles|content|posts|pages)?"
+    r"\s*(?:do we have|are there|have we got)?\s*(?:about|on|mentioning|covering|regarding)\s+(?P<rest>.+)$"
+)
+
+_LEADING_COUNT = re.compile(r"^(?:the\s+)?(?:(?:first|top|latest)\s+)?(?P<count>\d+|" + "|".join(NUMBER_WORDS) + r")\s+")
+_LEADING_WORDS = re.compile(r"^(?:me|us|some|any|all|the|a|an|few|more|latest|recent|first|top)\s+")
+_CONTENT_NOUNS = r"(?:blog posts?|stories|story|articles?|posts?|pages?|content|results?|items?|entries|case studies)"
+_LEADING_NOUNS = re.compile(
+    r"^" + _CONTENT_NOUNS + r"\s+(?:(?:that|which)\s+)?"
+    r"(?:about|on|for|mentioning|mention|covering|regarding|related to|with|that mention|containing)\s+"
+)
+_TRAILING_WORDS = re.compile(r"\s+(?:please|for me|" + _CONTENT_NOUNS + r")$")
+
+# Words that point at earlier results: a follow-up, not a fresh search
+_REFERENCES = {
+    "those", "these", "them", "it", "that", "this", "ones", "one", "again", "previous", "above",
+    "more", "next", "everything", "something", "anything",
+}
+
+_MAX_PHRASE_WORDS = 5
+
+
+def extract_search_phrase(message: str) -> Optional[Tuple[str, Optional[int]]]:
+    """
+    Key phrase (and requested count) of a plain search request.
+
+    Args:
+        message: The user's message
+
+    Returns:
+        (phrase, count or None), or None if the message isn't a plain search
+    """
+    text = normalize_message(message)
+    match = _REQUEST.match(text) or _QUESTION.match(text)
+    if not match:
+        return None
+    phrase = match.group("rest")
+
+    count = None
+    counted = _LEADING_COUNT.match(phrase)
+    if counted:
+        value = counted.group("count")
+        count = int(value) if value.isdigit() else NUMBER_WORDS[value]
+        phrase = phrase[counted.end():]
+
+    previous = None
+    while previous != phrase:
+        previous = phrase
+        phrase = _LEADING_WORDS.sub("", phrase)
+        phrase = _LEADING_NOUNS.sub("", phrase)
+        phrase = _TRAILING_WORDS.sub("", phrase).strip()
+
+    words = phrase.split()
+    if not words or len(words) > _MAX_PHRASE_WORDS:
+        return None
+    if any(word in _REFERENCES or word.isdigit() or word in NUMBER_WORDS for word in words):
+        return None
+    if re.fullmatch(_CONTENT_NOUNS, phrase):
+        return None
+    return phrase, count
@@ -1,17 +1,34 @@
 """
 Storyblok Strata client for content search.
 Handles semantic search via the vsearches endpoint.
+All requests share one pooled, keep-alive HTTP client (HTTP/2 when available).
 """
 
+import asyncio
 import httpx
 import logging
-from typing import List, Dict, Any, Optional
+import time
+import unicodedata
+from collections import deque
+from typing import AsyncIterator, Deque, List, Dict, Any, Optional, Tuple
+from backend.cache import CacheEntry, SingleFlight, TTLCache
 from backend.config import get_settings
+from backend.metrics import get_metrics
 from backend.models import StoryResult, SearchResults
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_search_term(term: str) -> str:
+    """
+    Normalize a search term for cache keys and comparisons.
+
+    Applies Unicode NFKC normalization, case folding and whitespace collapsing,
+    so "Drupal", " drupal " and "ＤＲＵＰＡＬ" all map to "drupal".
+    """
+    return " ".join(unicodedata.normalize("NFKC", term or "").casefold().split())
+
+
 class StoryblokClient:
     """Client for Storyblok Strata API."""
 
@@ -21,6 +38,125 @@ class StoryblokClient:
         self.space_id = self.settings.storyblok_space_id
         self.token = self.settings.storyblok_token
         self.timeout = self.settings.request_timeout
+        self.metrics = get_metrics()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self.story_cache: Optional[TTLCache] = None
+        if self.settings.story_cache_enabled:
+            self.story_cache = TTLCache(
+                "story",
+                max_entries=self.settings.story_cache_max_entries,
+                max_bytes=self.settings.story_cache_max_bytes,
+                ttl=self.settings.story_cache_ttl
+            )
+        self.search_cache: Optional[TTLCache] = None
+        if self.settings.search_cache_enabled:
+            self.search_cache = TTLCache(
+                "search",
+                max_entries=self.settings.search_cache_max_entries,
+                ttl=self.settings.search_cache_ttl
+            )
+        self._search_flights = SingleFlight("search")
+        self._search_generations: Dict[str, int] = {}  # Bumped per space by invalidate_search_cache
+        self._story_flights = SingleFlight("story")
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create the shared pooled HTTP client from settings."""
+        http2 = self.settings.storyblok_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+                http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self.settings.storyblok_max_connections,
+            max_keepalive_connections=self.settings.storyblok_max_keepalive_connections,
+            keepalive_expiry=self.settings.storyblok_keepalive_expiry
+        )
+        logger.info(
+            f"Creating Storyblok HTTP client (http2={http2}, "
+            f"max_connections={limits.max_connections}, "
+            f"max_keepalive={limits.max_keepalive_connections})"
+        )
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            http2=http2,
+            headers=self._build_headers()
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created lazily if the lifespan hasn't opened it."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._create_http_client()
+        return self._http_client
+
+    async def start(self) -> None:
+        """Open the shared HTTP client (called from the application lifespan)."""
+        _ = self.http_client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release pooled connections."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+            logger.info("Closed Storyblok HTTP client")
+        self._http_client = None
+
+    def _make_trace(self, state: Dict[str, bool]):
+        """
+        Build an httpcore trace hook that records connection events.
+
+        The hook flags in ``state`` whether this request had to open a new
+        TCP connection, which lets _get count reused connections.
+        """
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                state["opened"] = True
+                self.metrics.increment("storyblok.http.connections_opened")
+            elif event_name == "connection.start_tls.complete":
+                self.metrics.increment("storyblok.http.tls_handshakes")
+            elif event_name == "http2.send_request_headers.started":
+                self.metrics.increment("storyblok.http.requests_http2")
+            elif event_name == "http11.send_request_headers.started":
+                self.metrics.increment("storyblok.http.requests_http11")
+
+        return trace
+
+    async def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        Issue a GET through the shared client and record request metrics.
+
+        Args:
+            url: Absolute request URL
+            params: Optional query parameters
+            headers: Optional extra headers (authorization is set on the client)
+
+        Returns:
+            The raw httpx response (status is not checked here)
+        """
+        state = {"opened": False}
+        started = time.perf_counter()
+        try:
+            response = await self.http_client.get(
+                url,
+                params=params,
+                headers=headers,
+                extensions={"trace": self._make_trace(state)}
+            )
+        finally:
+            self.metrics.increment("storyblok.http.requests")
+            self.metrics.observe("storyblok.http.latency", time.perf_counter() - started)
+
+        if not state["opened"]:
+            self.metrics.increment("storyblok.http.connections_reused")
+        return response
 
     def _build_headers(self) -> Dict[str, str]:
         """Build request headers with authorization."""
@@ -59,6 +195,10 @@ class StoryblokClient:
         """
         Perform semantic search using Storyblok Strata.
 
+        Results are cached per space on the normalized (term, limit, offset),
+        and concurrent identical searches share a single upstream request.
+        Every caller receives its own copy, so results can be mutated freely.
+
         Args:
             term: Search term/query
             limit: Maximum number of results (defaults to settings)
@@ -73,8 +213,157 @@ class StoryblokClient:
         if limit is None:
             limit = self.settings.default_search_limit
 
+        if self.search_cache is None:
+            return await self._search_uncached(term, limit, offset)
+
+        key = (str(self.space_id), normalize_search_term(term), limit, offset)
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            logger.info(f"Search cache hit for: '{term}' (limit={limit}, offset={offset})")
+            return cached.model_copy(deep=True)
+
+        # Results fetched across an invalidation may predate it: don't cache them
+        generation = self._search_generations.get(key[0], 0)
+
+        async def fetch() -> SearchResults:
+            results = await self._search_uncached(term, limit, offset)
+            if self._search_generations.get(key[0], 0) == generation:
+                self.search_cache.set(key, results)
+            return results
+
+        results = await self._search_flights.do(key + (generation,), fetch)
+        return results.model_copy(deep=True)
+
+    async def search_pages(
+        self,
+        term: str,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[List[StoryResult]]:
+        """
+        Page through semantic search results, yielding one page at a time.
+
+        Up to ``concurrency`` pages are requested at once, so the remaining
+        fetches overlap with each other and with whatever the caller does
+        with the current page. Pages are yielded in ranking order; once a
+        short page shows the result set is exhausted, later requests are
+        cancelled.
+
+        Args:
+            term: Search term/query
+            page_size: Results per vsearch request (defaults to settings)
+            max_results: Stop after this many results (defaults to and is capped by settings)
+            concurrency: Pages in flight at once (defaults to search_page_concurrency)
+
+        Yields:
+            Lists of StoryResult in ranking order
+        """
+        page_size = max(1, page_size or self.settings.search_page_size)
+        concurrency = max(1, concurrency or self.settings.search_page_concurrency)
+        cap = self.settings.search_max_results
+        max_results = min(max_results, cap) if max_results else cap
+
+        in_flight: Deque[Tuple[int, "asyncio.Task"]] = deque()
+        next_offset = 0
+
+        def fill() -> None:
+            nonlocal next_offset
+            while len(in_flight) < concurrency and next_offset < max_results:
+                limit = min(page_size, max_results - next_offset)
+                task = asyncio.ensure_future(self.search(term=term, limit=limit, offset=next_offset))
+                in_flight.append((limit, task))
+                next_offset += limit
+
+        fill()
+        try:
+            while in_flight:
+                requested, page = in_flight.popleft()
+                stories = (await page).stories
+                # A short page means the result set is exhausted
+                exhausted = len(stories) < requested
+                if exhausted:
+                    for _, task in in_flight:
+                        task.cancel()
+                else:
+                    fill()
+                if stories:
+                    yield stories
+                if exhausted:
+                    break
+        finally:
+            pending = [task for _, task in in_flight if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def search_iter(
+        self,
+        term: str,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[StoryResult]:
+        """
+        Stream semantic search results story by story.
+
+        Args:
+            term: Search term/query
+            page_size: Results per vsearch request (defaults to settings)
+            max_results: Stop after this many results (defaults to and is capped by settings)
+
+        Yields:
+            StoryResult objects in ranking order
+        """
+        async for page in self.search_pages(term, page_size=page_size, max_results=max_results):
+            for story in page:
+                yield story
+
+    def invalidate_search_cache(self, space_id: Optional[str] = None) -> int:
+        """
+        Drop cached search results for a space.
+
+        Searches already in flight still return their results, but no longer
+        cache them, and later identical searches don't join them.
+
+        Args:
+            space_id: Space to invalidate (defaults to the configured space)
+
+        Returns:
+            Number of cached searches removed
+        """
+        if self.search_cache is None:
+            return 0
+        space_id = str(space_id or self.space_id)
+        self._search_generations[space_id] = self._search_generations.get(space_id, 0) + 1
+        removed = 0
+        for key in self.search_cache.keys():
+            if key[0] == space_id and self.search_cache.delete(key):
+                removed += 1
+        logger.info(f"Invalidated {removed} cached searches for space {space_id}")
+        return removed
+
+    def invalidate_story(self, story_id: int, version: Optional[str] = None) -> bool:
+        """
+        Evict a story from the story cache.
+
+        Args:
+            story_id: Story to evict
+            version: If given, keep the entry when its updated_at still matches
+
+        Returns:
+            True if an entry was evicted
+        """
+        if self.story_cache is None:
+            return False
+        entry = self.story_cache.get_entry(int(story_id))
+        if entry is None or (version is not None and entry.version == str(version)):
+            return False
+        return self.story_cache.delete(int(story_id))
+
+    async def _search_uncached(self, term: str, limit: int, offset: int) -> SearchResults:
+        """Run a vsearch request against Storyblok and parse the results."""
         url = f"{self.base_url}/v1/spaces/{self.space_id}/vsearches"
-        headers = self._build_headers()
         params = {
             "term": term,
             "limit": limit,
@@ -83,55 +372,59 @@ class StoryblokClient:
 
         logger.info(f"Searching Storyblok for: '{term}' (limit={limit}, offset={offset})")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-
-                data = response.json()
-
-                # Handle both list and dict responses
-                if isinstance(data, list):
-                    # API returned list directly
-                    stories_data = data
-                    logger.info(f"Received {len(stories_data)} results from Storyblok (list format)")
-                elif isinstance(data, dict):
-                    # API returned dict with 'stories' key or other nested structure
-                    stories_data = data.get("stories", data.get("results", []))
-                    logger.info(f"Received {len(stories_data)} results from Storyblok (dict format)")
-                else:
-                    logger.error(f"Unexpected response format: {type(data)}")
-                    stories_data = []
-
-                # Extract stories with new schema
-                stories = []
-                for story_data in stories_data:
-                    try:
-                        story = self._extract_story_info(story_data)
-                        stories.append(story)
-                    except Exception as e:
-                        logger.warning(f"Failed to parse story: {e}. Data: {story_data}")
-                        continue
-
-                return SearchResults(
-                    stories=stories,
-                    total=len(stories)
-                )
-
-            except httpx.HTTPError as e:
-                logger.error(f"Storyblok API error: {str(e)}")
-                if hasattr(e, 'response') and e.response is not None:
-                    logger.error(f"Response status: {e.response.status_code}")
-                    logger.error(f"Response body: {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error in Storyblok client: {str(e)}")
-                raise
+        try:
+            response = await self._get(url, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+
+            # Handle both list and dict responses
+            if isinstance(data, list):
+                # API returned list directly
+                stories_data = data
+                logger.info(f"Received {len(stories_data)} results from Storyblok (list format)")
+            elif isinstance(data, dict):
+                # API returned dict with 'stories' key or other nested structure
+                stories_data = data.get("stories", data.get("results", []))
+                logger.info(f"Received {len(stories_data)} results from Storyblok (dict format)")
+            else:
+                logger.error(f"Unexpected response format: {type(data)}")
+                stories_data = []
+
+            # Extract stories with new schema
+            stories = []
+            for story_data in stories_data:
+                try:
+                    story = self._extract_story_info(story_data)
+                    stories.append(story)
+                except Exception as e:
+                    logger.warning(f"Failed to parse story: {e}. Data: {story_data}")
+                    continue
+
+            return SearchResults(
+                stories=stories,
+                total=len(stories)
+            )
+
+        except httpx.HTTPError as e:
+            logger.error(f"Storyblok API error: {str(e)}")
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error(f"Response status: {e.response.status_code}")
+                logger.error(f"Response body: {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error in Storyblok client: {str(e)}")
+            raise
 
     async def get_story_by_id(self, story_id: int) -> Optional[dict]:
         """
         Fetch full story details by ID from Storyblok API.
 
+        Served from the story cache while fresh. Expired entries are
+        revalidated with ``If-None-Match`` when an ETag is known, so an
+        unchanged story costs a 304 instead of a full download. Concurrent
+        fetches of the same ID are coalesced into one request.
+
         Args:
             story_id: The story ID to fetch
             
@@ -141,44 +434,318 @@ class StoryblokClient:
         Raises:
             httpx.HTTPError: If the API request fails
         """
+        story_id = int(story_id)
+        cached_entry = None
+        if self.story_cache is not None:
+            cached = self.story_cache.get(story_id, predicate=_has_content)
+            if cached is not None:
+                logger.debug(f"Story cache hit for ID: {story_id}")
+                return cached
+            cached_entry = self.story_cache.get_entry(story_id)
+            if cached_entry is not None and not _has_content(cached_entry.value):
+                cached_entry = None
+
+        # Concurrent callers for the same story share one request
+        return await self._story_flights.do(
+            story_id,
+            lambda: self._fetch_story(story_id, cached_entry)
+        )
+
+    async def _fetch_story(self, story_id: int, cached_entry: Optional[CacheEntry]) -> Optional[dict]:
+        """Fetch one story from the Management API, revalidating a stale cache entry."""
         # Use the Management API to fetch full story
         # Management API uses Authorization header (same as vsearches)
         url = f"{self.base_url}/v1/spaces/{self.space_id}/stories/{story_id}"
-        headers = self._build_headers()
+        headers = None
+        if cached_entry is not None and cached_entry.etag:
+            headers = {"If-None-Match": cached_entry.etag}
         
         logger.info(f"Fetching full story details for ID: {story_id}")
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                
-                data = response.json()
-                story_data = data.get("story") if isinstance(data, dict) else None
+        try:
+            response = await self._get(url, headers=headers)
+            if response.status_code == 304 and cached_entry is not None:
+                self.story_cache.touch(story_id)
+                self.story_cache.record("revalidated")
+                logger.info(f"Story {story_id} not modified, served from cache")
+                return cached_entry.value
+            response.raise_for_status()
+            
+            data = response.json()
+            story_data = data.get("story") if isinstance(data, dict) else None
+            
+            if story_data:
+                # Extract component type from content
+                component_type = 'unknown'
+                if story_data.get('content') and isinstance(story_data['content'], dict):
+                    component_type = story_data['content'].get('component', 'unknown')
+                logger.info(f"Successfully fetched story {story_id}: component={component_type}")
+                if self.story_cache is not None:
+                    self.story_cache.set(
+                        story_id,
+                        story_data,
+                        etag=response.headers.get("etag"),
+                        version=_story_version(story_data)
+                    )
+                return story_data
+            else:
+                logger.warning(f"No story data found for ID {story_id}")
+                return None
                 
-                if story_data:
-                    # Extract component type from content
-                    component_type = 'unknown'
-                    if story_data.get('content') and isinstance(story_data['content'], dict):
-                        component_type = story_data['content'].get('component', 'unknown')
-                    logger.info(f"Successfully fetched story {story_id}: component={component_type}")
-                    return story_data
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                logger.warning(f"Story {story_id} not found")
+                if self.story_cache is not None:
+                    self.story_cache.delete(story_id)
+                return None
+            logger.error(f"HTTP error fetching story {story_id}: {e}")
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching story {story_id}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error fetching story {story_id}: {e}")
+            raise
+
+    async def get_stories_by_ids(
+        self,
+        story_ids: List[int],
+        timeout: Optional[float] = None
+    ) -> Dict[int, dict]:
+        """
+        Fetch many stories at once via the Management API stories listing.
+
+        Fresh stories come from the story cache. The remaining IDs are
+        requested in chunks of ``storyblok_bulk_page_size`` using the
+        ``by_ids`` filter, with the chunks fetched concurrently. A cached
+        full story whose ``updated_at`` matches the listing is kept (and
+        its TTL extended) rather than replaced by the listing entry. Listing
+        entries without ``content`` are fetched in full with
+        get_story_by_id, so every returned story carries its content.
+
+        Args:
+            story_ids: Story IDs to fetch
+            timeout: Time budget in seconds; requests still running when it
+                runs out are cancelled and what finished in time is returned
+
+        Returns:
+            Dict mapping story ID to full story data; IDs the API did not return
+            (or whose full fetch failed or ran out of time) are absent
+
+        Raises:
+            httpx.HTTPError: If any listing request fails
+        """
+        unique_ids = list(dict.fromkeys(int(story_id) for story_id in story_ids))
+        if not unique_ids:
+            return {}
+
+        stories: Dict[int, dict] = {}
+        to_fetch = unique_ids
+        if self.story_cache is not None:
+            to_fetch = []
+            for story_id in unique_ids:
+                cached = self.story_cache.get(story_id, predicate=_has_content)
+                if cached is not None:
+                    stories[story_id] = cached
                 else:
-                    logger.warning(f"No story data found for ID {story_id}")
-                    return None
-                    
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    logger.warning(f"Story {story_id} not found")
-                    return None
-                logger.error(f"HTTP error fetching story {story_id}: {e}")
-                raise
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching story {story_id}: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error fetching story {story_id}: {e}")
-                raise
+                    to_fetch.append(story_id)
+            if not to_fetch:
+                logger.info(f"All {len(unique_ids)} requested stories served from cache")
+                return stories
+
+        page_size = max(1, self.settings.storyblok_bulk_page_size)
+        chunks = [to_fetch[i:i + page_size] for i in range(0, len(to_fetch), page_size)]
+        url = f"{self.base_url}/v1/spaces/{self.space_id}/stories"
+
+        logger.info(
+            f"Fetching {len(to_fetch)} stories in {len(chunks)} bulk request(s) "
+            f"({len(stories)} from cache)"
+        )
+
+        async def fetch_chunk(chunk: List[int]) -> List[dict]:
+            params = {
+                "by_ids": ",".join(str(story_id) for story_id in chunk),
+                "per_page": len(chunk),
+                "page": 1
+            }
+            response = await self._get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            return data.get("stories", []) if isinstance(data, dict) else []
+
+        started = time.monotonic()
+        tasks = [asyncio.create_task(fetch_chunk(chunk)) for chunk in chunks]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        pages = []
+        for task in done:
+            error = task.exception()
+            if error is not None:
+                logger.error(f"Error fetching stories by IDs: {error}")
+                raise error
+            pages.append(task.result())
+        if pending:
+            logger.warning(f"{len(pending)} of {len(chunks)} bulk request(s) ran out of time")
+
+        for page in pages:
+            for story_data in page:
+                if not isinstance(story_data, dict) or story_data.get("id") is None:
+                    continue
+                story_id = int(story_data["id"])
+                stories[story_id] = self._cache_listed_story(story_id, story_data)
+
+        # Management API listing entries usually come without content
+        without_content = [story_id for story_id, story in stories.items() if not _has_content(story)]
+        if without_content:
+            for story_id in without_content:
+                del stories[story_id]
+            remaining = None
+            if timeout is not None:
+                remaining = max(0.0, timeout - (time.monotonic() - started))
+            stories.update(await self._fetch_full_stories(without_content, remaining))
+
+        missing = len(unique_ids) - len(stories)
+        if missing:
+            logger.warning(f"{missing} of {len(unique_ids)} requested stories were not returned")
+        return stories
+
+    async def _fetch_full_stories(self, story_ids: List[int], timeout: Optional[float] = None) -> Dict[int, dict]:
+        """
+        Fetch stories one by one, at most ``hydration_concurrency`` at a time.
+
+        Returns:
+            Dict mapping story ID to full story data; failed fetches and those
+            still running after ``timeout`` seconds are logged and left out
+        """
+        semaphore = asyncio.Semaphore(max(1, self.settings.hydration_concurrency))
+
+        async def fetch(story_id: int) -> Optional[dict]:
+            async with semaphore:
+                return await self.get_story_by_id(story_id)
+
+        logger.info(f"Fetching content for {len(story_ids)} listed stories")
+        tasks = [asyncio.create_task(fetch(story_id)) for story_id in story_ids]
+        try:
+            await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            logger.warning(f"{len(pending)} of {len(story_ids)} full story fetches ran out of time")
+
+        stories: Dict[int, dict] = {}
+        for story_id, task in zip(story_ids, tasks):
+            if task in pending:
+                continue
+            if task.cancelled():
+                logger.warning(f"Fetch of full story for ID {story_id} was cancelled")
+                continue
+            error = task.exception()
+            if error is not None:
+                logger.warning(f"Could not fetch full story for ID {story_id}: {error}")
+            elif task.result():
+                stories[story_id] = task.result()
+        return stories
+
+    async def list_stories(
+        self,
+        page: int = 1,
+        per_page: Optional[int] = None,
+        **filters: Any
+    ) -> Tuple[List[dict], int]:
+        """
+        Fetch one page of the Management API stories listing.
+
+        Args:
+            page: 1-based page number
+            per_page: Stories per page (defaults to storyblok_bulk_page_size)
+            **filters: Extra listing query parameters (e.g. updated_at_gt)
+
+        Returns:
+            Tuple of (stories on this page, total number of stories)
+
+        Raises:
+            httpx.HTTPError: If the API request fails
+        """
+        per_page = per_page or self.settings.storyblok_bulk_page_size
+        url = f"{self.base_url}/v1/spaces/{self.space_id}/stories"
+        params = {"page": page, "per_page": per_page, **filters}
+
+        response = await self._get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        stories = data.get("stories", []) if isinstance(data, dict) else []
+        try:
+            total = int(response.headers.get("total", len(stories)))
+        except ValueError:
+            total = len(stories)
+        return stories, total
+
+    async def list_components(self) -> List[dict]:
+        """
+        Fetch the space's component definitions from the Management API.
+
+        Returns:
+            Component dicts (name, display_name, is_root, ...)
+
+        Raises:
+            httpx.HTTPError: If the API request fails
+        """
+        url = f"{self.base_url}/v1/spaces/{self.space_id}/components"
+        response = await self._get(url)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("components", []) if isinstance(data, dict) else []
+
+    def _cache_listed_story(self, story_id: int, story_data: dict) -> dict:
+        """
+        Store a listing entry in the story cache, preferring a still-valid full story.
+
+        Returns:
+            The story data to hand back to the caller
+        """
+        if self.story_cache is None:
+            return story_data
+
+        version = _story_version(story_data)
+        entry = self.story_cache.get_entry(story_id)
+        if (
+            entry is not None
+            and version is not None
+            and entry.version == version
+            and _has_content(entry.value)
+            and not _has_content(story_data)
+        ):
+            self.story_cache.touch(story_id)
+            self.story_cache.record("revalidated")
+            return entry.value
+        if not _has_content(story_data):
+            # Not a full story; keep any cached one (and its ETag) for revalidation
+            return story_data
+
+        self.story_cache.set(story_id, story_data, version=version)
+        return story_data
+
+
+def _has_content(story_data: Any) -> bool:
+    """Whether story data includes its content (listing entries may not)."""
+    return isinstance(story_data, dict) and "content" in story_data
+
+
+def _story_version(story_data: dict) -> Optional[str]:
+    """Version marker used to revalidate cached stories without an ETag."""
+    version = story_data.get("updated_at") or story_data.get("published_at")
+    return str(version) if version else None
 
 
 # Singleton instance
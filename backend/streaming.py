@@ -0,0 +1,199 @@
+"""
+Helpers for streaming conversation responses.
+Incrementally parses a JSON object while it is still being generated
+(streaming one string field and reporting the others as they complete),
+splits streamed text into sentences (so speech can start early) and
+formats server-sent events.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# Simple JSON escapes; \uXXXX is handled separately
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# A sentence ends with terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace, or at a blank line
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+|\n\s*\n")
+
+
+class JSONFieldStreamer:
+    """
+    Incremental parser for the JSON object a model is generating.
+
+    Feed the model output chunk by chunk; each call returns the decoded text
+    of the streamed ``field`` that arrived in that chunk. Every other
+    top-level value is collected in ``fields`` as soon as it is complete, so
+    callers can act on e.g. ``action`` and ``term`` before the streamed
+    field has finished. Text before the opening brace and after the closing
+    brace is ignored.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.depth = 0
+        self.done = False
+        self.fields: Dict[str, Any] = {}
+        self.field_started = False
+        self._completed: List[str] = []
+        self._raw: Optional[List[str]] = None
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._in_string = False
+        self._role = "skip"  # "key", "target" or "skip"
+        self._buffer: List[str] = []
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+
+    def _emit(self, text: str, out: List[str]) -> None:
+        if self._role == "key":
+            self._buffer.append(text)
+        elif self._role == "target":
+            out.append(text)
+
+    def _decode_unicode(self, hex_digits: str, out: List[str]) -> None:
+        code = int(hex_digits, 16)
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return
+        if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        self._emit(chr(code), out)
+
+    def _string_char(self, ch: str, out: List[str]) -> None:
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                try:
+                    self._decode_unicode(self._unicode, out)
+                except ValueError:
+                    pass
+                self._unicode = None
+        elif self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                self._emit(_ESCAPES.get(ch, ch), out)
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._role == "key":
+                self._key = "".join(self._buffer)
+                self._expect = "colon"
+            elif self.depth == 1:
+                self._finish_value()
+        else:
+            self._emit(ch, out)
+
+    def _start_string(self) -> None:
+        self._in_string = True
+        self._role = "skip"
+        if self.depth == 1 and self._expect == "key":
+            self._role = "key"
+            self._buffer = []
+        elif self.depth == 1 and self._expect == "value":
+            if self._key == self.field:
+                self._role = "target"
+                self.field_started = True
+            self._expect = "comma"
+
+    def _finish_value(self) -> None:
+        """Record the top-level value that just ended (the streamed field excluded)."""
+        if self._raw is None:
+            return
+        raw, self._raw = "".join(self._raw).strip(), None
+        if self._key is None or self._key == self.field or not raw:
+            return
+        try:
+            self.fields[self._key] = json.loads(raw)
+        except ValueError:
+            return
+        self._completed.append(self._key)
+
+    def pop_completed(self) -> List[str]:
+        """Return the names of fields completed since the last call."""
+        completed, self._completed = self._completed, []
+        return completed
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next piece of model output.
+
+        Args:
+            chunk: Newly generated text
+
+        Returns:
+            Decoded text of the streamed field contained in this chunk
+        """
+        out: List[str] = []
+        for ch in chunk:
+            if self.done:
+                break
+            if self.depth == 1 and not self._in_string and self._expect == "value" and not ch.isspace():
+                # A top-level value starts here; keep its raw text to decode when it ends
+                self._raw = []
+            if self.depth == 1 and not self._in_string and ch in ",}":
+                self._finish_value()
+            if self._raw is not None:
+                self._raw.append(ch)
+            if self._in_string:
+                self._string_char(ch, out)
+            elif self.depth == 0:
+                if ch == "{":
+                    self.depth = 1
+                    self._expect = "key"
+            elif ch == '"':
+                self._start_string()
+            elif ch in "{[":
+                if self.depth == 1 and self._expect == "value":
+                    self._expect = "comma"
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.done = True
+                elif self.depth == 1:
+                    self._finish_value()
+            elif self.depth == 1:
+                if ch == ":":
+                    self._expect = "value"
+                elif ch == ",":
+                    self._expect = "key"
+                elif not ch.isspace() and self._expect == "value":
+                    self._expect = "comma"
+        return "".join(out)
+
+
+class SentenceSplitter:
+    """Buffers streamed text and hands it back one complete sentence at a time."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add text; returns the sentences completed by it."""
+        self._buffer += text
+        sentences = []
+        position = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[position:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            position = match.end()
+        self._buffer = self._buffer[position:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text is left once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
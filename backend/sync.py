@@ -0,0 +1,291 @@
+"""
+Sync the configured Storyblok space into the local content index.
+
+Usage:
+    python -m backend.sync full              # initial / complete re-sync
+    python -m backend.sync delta             # only stories changed since the last sync
+    python -m backend.sync query "drupal"    # query the local index
+    python -m backend.sync stats             # show index statistics
+
+The backend also runs delta syncs on a schedule (see run_periodic_sync).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import get_settings
+from backend.content_index import ContentIndex, get_content_index
+from backend.metrics import get_metrics
+from backend.storyblok_client import StoryblokClient, get_storyblok_client
+
+logger = logging.getLogger(__name__)
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def seconds_since(iso_timestamp: str) -> float:
+    """Seconds elapsed since an ISO 8601 timestamp written by utc_now_iso."""
+    then = datetime.fromisoformat(iso_timestamp)
+    if then.tzinfo is None:
+        then = then.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - then).total_seconds()
+
+
+class ContentSync:
+    """Mirrors the space's stories into a ContentIndex."""
+
+    def __init__(
+        self,
+        storyblok_client: Optional[StoryblokClient] = None,
+        index: Optional[ContentIndex] = None
+    ):
+        self.settings = get_settings()
+        self.storyblok_client = storyblok_client or get_storyblok_client()
+        self.index = index or get_content_index()
+        self.metrics = get_metrics()
+
+    async def _with_content(self, stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Make sure each listed story carries its content.
+
+        The stories listing may omit ``content``; those stories are fetched
+        individually with bounded concurrency. A story that can't be fetched
+        is kept as listed (name and slug are still indexed).
+        """
+        semaphore = asyncio.Semaphore(max(1, self.settings.sync_concurrency))
+
+        async def complete(story: Dict[str, Any]) -> Dict[str, Any]:
+            if "content" in story:
+                return story
+            # Don't let a cached copy older than the listing mask the change
+            self.storyblok_client.invalidate_story(story["id"], version=story.get("updated_at"))
+            async with semaphore:
+                try:
+                    full_story = await self.storyblok_client.get_story_by_id(story["id"])
+                except Exception as e:
+                    logger.warning(f"Could not fetch content for story {story['id']}: {e}")
+                    full_story = None
+            return full_story or story
+
+        return await asyncio.gather(*(complete(story) for story in stories))
+
+    async def _sync_page(self, stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write one listing page to the index and return the synced stories."""
+        stories = [story for story in stories if not story.get("is_folder")]
+        full_stories = await self._with_content(stories)
+        await asyncio.to_thread(self.index.upsert_stories, full_stories)
+        return full_stories
+
+    async def _sync_listing(self, **filters: Any) -> Tuple[set, Optional[str]]:
+        """
+        Page through the stories listing (with optional filters) into the index.
+
+        Returns:
+            Tuple of (synced story IDs, newest updated_at seen)
+        """
+        per_page = self.settings.storyblok_bulk_page_size
+        synced_ids = set()
+        newest: Optional[str] = None
+        page = 1
+        while True:
+            stories, total = await self.storyblok_client.list_stories(page=page, per_page=per_page, **filters)
+            if not stories:
+                break
+            for story in await self._sync_page(stories):
+                synced_ids.add(int(story["id"]))
+                updated_at = story.get("updated_at")
+                if updated_at and (newest is None or updated_at > newest):
+                    newest = updated_at
+            logger.info(f"Synced page {page} ({len(synced_ids)}/{total} stories)")
+            if page * per_page >= total:
+                break
+            page += 1
+        return synced_ids, newest
+
+    async def _listed_ids(self) -> set:
+        """Collect every story ID in the space (listing only, no content)."""
+        per_page = self.settings.storyblok_bulk_page_size
+        ids = set()
+        page = 1
+        while True:
+            stories, total = await self.storyblok_client.list_stories(page=page, per_page=per_page)
+            if not stories:
+                break
+            ids.update(int(story["id"]) for story in stories if not story.get("is_folder"))
+            if page * per_page >= total:
+                break
+            page += 1
+        return ids
+
+    async def _record_success(self, watermark: Optional[str]) -> None:
+        """Persist the watermark and last-success time, and reset the freshness lag."""
+        if watermark:
+            await asyncio.to_thread(self.index.set_state, "watermark", watermark)
+        await asyncio.to_thread(self.index.set_state, "last_sync", utc_now_iso())
+        self.metrics.set_gauge("sync.freshness_lag_seconds", 0)
+
+    async def full_sync(self) -> Dict[str, Any]:
+        """
+        Download every story of the space and rebuild the mirror.
+
+        Stories that are in the mirror but no longer in the space are removed.
+
+        Returns:
+            Summary with synced/removed counts and duration in seconds
+        """
+        started = time.perf_counter()
+        logger.info(f"Starting full sync of space {self.storyblok_client.space_id}")
+
+        synced_ids, newest = await self._sync_listing()
+
+        stale_ids = set(await asyncio.to_thread(self.index.story_ids)) - synced_ids
+        removed = await asyncio.to_thread(self.index.delete_stories, stale_ids)
+        now = utc_now_iso()
+        await asyncio.to_thread(self.index.set_state, "last_full_sync", now)
+        await asyncio.to_thread(self.index.set_state, "last_deletion_sweep", now)
+        await self._record_success(newest)
+
+        duration = time.perf_counter() - started
+        self.metrics.observe("sync.full.duration", duration)
+        logger.info(f"Full sync finished: {len(synced_ids)} stories, {removed} removed, {duration:.1f}s")
+        return {"synced": len(synced_ids), "removed": removed, "duration": round(duration, 3)}
+
+    async def delta_sync(self, sweep_deletions: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Pull only the stories changed since the persisted watermark.
+
+        Falls back to a full sync when no watermark exists yet. Deleted
+        stories never show up in a filtered listing, so deletions are found
+        by a periodic sweep that compares the space's story IDs (listing
+        only, no content) with the mirror.
+
+        Args:
+            sweep_deletions: Force (True) or skip (False) the deletion sweep;
+                by default it runs every ``sync_deletion_sweep_interval`` seconds
+
+        Returns:
+            Summary with synced/removed counts, watermark and duration in seconds
+        """
+        watermark = await asyncio.to_thread(self.index.get_state, "watermark")
+        if not watermark:
+            logger.info("No sync watermark yet, running a full sync")
+            return await self.full_sync()
+
+        started = time.perf_counter()
+        synced_ids, newest = await self._sync_listing(updated_at_gt=watermark)
+
+        if sweep_deletions is None:
+            last_sweep = await asyncio.to_thread(self.index.get_state, "last_deletion_sweep")
+            sweep_deletions = (
+                not last_sweep
+                or seconds_since(last_sweep) >= self.settings.sync_deletion_sweep_interval
+            )
+
+        removed = 0
+        if sweep_deletions:
+            stale_ids = set(await asyncio.to_thread(self.index.story_ids)) - await self._listed_ids()
+            removed = await asyncio.to_thread(self.index.delete_stories, stale_ids)
+            await asyncio.to_thread(self.index.set_state, "last_deletion_sweep", utc_now_iso())
+
+        new_watermark = max(watermark, newest) if newest else watermark
+        await self._record_success(new_watermark)
+
+        duration = time.perf_counter() - started
+        self.metrics.observe("sync.delta.duration", duration)
+        self.metrics.increment("sync.delta.stories", len(synced_ids))
+        self.metrics.increment("sync.deleted", removed)
+        logger.info(
+            f"Delta sync finished: {len(synced_ids)} changed, {removed} removed, "
+            f"watermark={new_watermark}, {duration:.1f}s"
+        )
+        return {
+            "synced": len(synced_ids),
+            "removed": removed,
+            "watermark": new_watermark,
+            "duration": round(duration, 3)
+        }
+
+
+async def run_periodic_sync(sync: Optional[ContentSync] = None, interval: Optional[float] = None) -> None:
+    """
+    Run delta syncs forever on a fixed interval (started from the app lifespan).
+
+    Errors are logged and retried on the next tick; the freshness lag gauge
+    keeps growing while syncs fail.
+    """
+    sync = sync or ContentSync()
+    interval = interval or sync.settings.sync_interval
+    metrics = get_metrics()
+    logger.info(f"Background content sync every {interval}s")
+    while True:
+        try:
+            await sync.delta_sync()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            metrics.increment("sync.errors")
+            logger.error(f"Background content sync failed: {e}", exc_info=True)
+        await asyncio.sleep(interval)
+        last_sync = await asyncio.to_thread(sync.index.get_state, "last_sync")
+        if last_sync:
+            metrics.set_gauge("sync.freshness_lag_seconds", round(seconds_since(last_sync), 3))
+
+
+async def _run_sync(mode: str) -> Dict[str, Any]:
+    storyblok_client = get_storyblok_client()
+    try:
+        sync = ContentSync(storyblok_client=storyblok_client)
+        return await (sync.full_sync() if mode == "full" else sync.delta_sync(sweep_deletions=True))
+    finally:
+        await storyblok_client.aclose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.sync",
+        description="Mirror the Storyblok space into the local SQLite FTS index."
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("full", help="download every story and rebuild the index")
+    subcommands.add_parser("delta", help="sync stories changed since the last watermark")
+    query_parser = subcommands.add_parser("query", help="full-text search the local index")
+    query_parser.add_argument("text", help="search text (all words must match)")
+    query_parser.add_argument("--limit", type=int, default=10)
+    query_parser.add_argument("--content-type", default=None)
+    subcommands.add_parser("stats", help="show index statistics")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    if args.command in ("full", "delta"):
+        result = asyncio.run(_run_sync(args.command))
+    elif args.command == "query":
+        index = get_content_index()
+        stories = index.search(args.text, limit=args.limit, content_type=args.content_type)
+        result = {
+            "count": index.count(args.text, content_type=args.content_type),
+            "stories": [
+                {"story_id": s.story_id, "name": s.name, "slug": s.slug, "content_type": s.content_type}
+                for s in stories
+            ],
+        }
+    else:
+        result = get_content_index().stats()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Storyblok webhook handling.
+Verifies webhook signatures and turns publish/unpublish/delete events into
+batched invalidations of the story cache, search cache and local content index.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+from typing import Dict, Optional, Set
+
+from backend.config import get_settings
+from backend.content_index import ContentIndex, get_content_index
+from backend.metrics import get_metrics
+from backend.storyblok_client import StoryblokClient, get_storyblok_client
+
+logger = logging.getLogger(__name__)
+
+# Story events that remove a story from the space entirely
+DELETE_ACTIONS = {"deleted"}
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check a Storyblok ``webhook-signature`` header.
+
+    Storyblok signs the raw request body with HMAC-SHA1 using the webhook
+    secret and sends the hex digest.
+
+    Args:
+        body: Raw request body
+        signature: Value of the webhook-signature header
+        secret: Configured webhook secret
+
+    Returns:
+        True if the signature matches
+    """
+    if not signature or not secret:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+class InvalidationBatcher:
+    """
+    Collects story events and applies them in batches.
+
+    Events arriving within ``window`` seconds of the first queued event are
+    merged (the latest action per story wins), so a burst of publishes costs
+    one search cache flush and one refresh per story.
+    """
+
+    def __init__(
+        self,
+        storyblok_client: Optional[StoryblokClient] = None,
+        index: Optional[ContentIndex] = None,
+        window: Optional[float] = None
+    ):
+        self.settings = get_settings()
+        self.storyblok_client = storyblok_client or get_storyblok_client()
+        self._index = index
+        self.window = self.settings.webhook_batch_window if window is None else window
+        self.metrics = get_metrics()
+        self._pending: Dict[int, str] = {}
+        self._spaces: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def index(self) -> ContentIndex:
+        if self._index is None:
+            self._index = get_content_index()
+        return self._index
+
+    def enqueue(self, story_id: int, action: str, space_id: Optional[str] = None) -> int:
+        """
+        Queue one story event and schedule a flush.
+
+        Returns:
+            Number of stories waiting in the current batch
+        """
+        self._pending[int(story_id)] = action
+        self._spaces.add(str(space_id or self.storyblok_client.space_id))
+        self.metrics.increment("webhooks.events")
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return len(self._pending)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        try:
+            await self.flush()
+        except Exception as e:
+            self.metrics.increment("webhooks.errors")
+            logger.error(f"Failed to apply webhook batch: {e}", exc_info=True)
+        # Events that arrived while this batch was being applied saw a flush
+        # already scheduled; give them their own
+        if self._pending:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> Dict[str, int]:
+        """
+        Apply every queued event now.
+
+        Returns:
+            Counts of evicted, refreshed and deleted stories
+        """
+        pending, self._pending = self._pending, {}
+        spaces, self._spaces = self._spaces, set()
+        summary = {"evicted": 0, "refreshed": 0, "deleted": 0}
+        if not pending:
+            return summary
+
+        for space_id in spaces:
+            self.storyblok_client.invalidate_search_cache(space_id)
+
+        index_enabled = await asyncio.to_thread(self.index.get_state, "last_sync") is not None
+        deleted_ids = []
+        for story_id, action in pending.items():
+            if self.storyblok_client.invalidate_story(story_id):
+                summary["evicted"] += 1
+            if action in DELETE_ACTIONS:
+                deleted_ids.append(story_id)
+                continue
+            try:
+                # Re-warm the story cache and pick up the new version for the index
+                story = await self.storyblok_client.get_story_by_id(story_id)
+            except Exception as e:
+                logger.warning(f"Could not refresh story {story_id} after webhook: {e}")
+                continue
+            if story is None:
+                deleted_ids.append(story_id)
+            elif index_enabled:
+                await asyncio.to_thread(self.index.upsert_stories, [story])
+                summary["refreshed"] += 1
+
+        if deleted_ids and index_enabled:
+            summary["deleted"] = await asyncio.to_thread(self.index.delete_stories, deleted_ids)
+
+        self.metrics.increment("webhooks.batches")
+        self.metrics.increment("webhooks.stories_invalidated", len(pending))
+        logger.info(
+            f"Applied webhook batch of {len(pending)} stories: evicted={summary['evicted']}, "
+            f"refreshed={summary['refreshed']}, deleted={summary['deleted']}"
+        )
+        return summary
+
+    async def aclose(self) -> Dict[str, int]:
+        """Flush whatever is still queued (called on shutdown)."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        return await self.flush()
+
+
+# Singleton instance
+_invalidation_batcher: Optional[InvalidationBatcher] = None
+
+
+def get_invalidation_batcher() -> InvalidationBatcher:
+    """Get or create the invalidation batcher singleton."""
+    global _invalidation_batcher
+    if _invalidation_batcher is None:
+        _invalidation_batcher = InvalidationBatcher()
+    return _invalidation_batcher
@@ -0,0 +1,113 @@
+"""
+Unit tests for Bedrock admission control.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.admission import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    AdmissionController,
+    AdmissionTimeout,
+    Ticket,
+    estimate_request_tokens,
+)
+from tests.test_bedrock_client import converse_body, make_client
+
+
+class TestBuckets:
+    """Test RPM/TPM admission and queue-time limits."""
+
+    def test_estimate_counts_text_and_output_cap(self):
+        request = {
+            "system": [{"text": "x" * 400}, {"cachePoint": {"type": "default"}}],
+            "messages": [{"role": "user", "content": [{"text": "y" * 40}]}],
+            "inferenceConfig": {"maxTokens": 512},
+        }
+        assert estimate_request_tokens(request) == 100 + 10 + 512
+
+    @pytest.mark.asyncio
+    async def test_requests_within_quota_are_admitted_at_once(self):
+        controller = AdmissionController(rpm_limit=60, tpm_limit=60000, max_queue_time=0.5)
+        for _ in range(10):
+            await controller.acquire(100)
+        assert controller.requests < 1
+
+    @pytest.mark.asyncio
+    async def test_queue_time_limit(self):
+        controller = AdmissionController(rpm_limit=6, tpm_limit=60000, max_queue_time=0.05)
+        await controller.acquire(100)
+        with pytest.raises(AdmissionTimeout):
+            await controller.acquire(100)
+        assert not controller._queue or all(entry[2].done() for entry in controller._queue)
+
+    @pytest.mark.asyncio
+    async def test_interactive_calls_beat_background_work(self):
+        controller = AdmissionController(rpm_limit=600, tpm_limit=600000, max_queue_time=1.0)
+        controller.requests = 0
+        admitted = []
+
+        async def call(name, priority):
+            await controller.acquire(100, priority)
+            admitted.append(name)
+
+        background = asyncio.create_task(call("background", PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("planner", PRIORITY_INTERACTIVE))
+        await asyncio.gather(background, interactive)
+
+        assert admitted == ["planner", "background"]
+
+    @pytest.mark.asyncio
+    async def test_actual_usage_refunds_the_estimate(self):
+        controller = AdmissionController(rpm_limit=60, tpm_limit=60000)
+        full = controller.tokens
+        async with controller.admit({"inferenceConfig": {"maxTokens": 2000}}) as ticket:
+            ticket.used_tokens = 500
+        assert controller.tokens == pytest.approx(full - 500, abs=5)
+
+
+class TestAIMD:
+    """Test backing off on throttling and recovering on success."""
+
+    def test_throttle_decreases_once_per_burst(self):
+        controller = AdmissionController(rpm_limit=60, tpm_limit=60000)
+        controller.on_throttle()
+        controller.on_throttle()  # same burst of throttles
+        assert controller.rate == pytest.approx(0.7)
+        assert controller.requests <= 60 * 0.7 * 10 / 60
+
+        controller.settle(Ticket(0))
+        assert controller.rate == pytest.approx(0.72)
+
+    @pytest.mark.asyncio
+    async def test_client_reports_throttling(self):
+        client = make_client(lambda request: httpx.Response(
+            429, headers={"x-amzn-ErrorType": "ThrottlingException"}, json={"message": "Too many requests"}
+        ))
+        client.admission = AdmissionController(rpm_limit=60, tpm_limit=60000)
+        client.planner_cache = None
+
+        with pytest.raises(Exception, match="Request throttled"):
+            await client.aconverse(message="hi", conversation_history=[])
+        assert client.admission.rate < 1.0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_content_type_mapping_is_interactive_work(self):
+        client = make_client(lambda request: httpx.Response(200, json=converse_body("blog_post")))
+        client.admission = AdmissionController(rpm_limit=60, tpm_limit=60000)
+        priorities = []
+        acquire = client.admission.acquire
+
+        async def recording_acquire(tokens, priority=PRIORITY_INTERACTIVE):
+            priorities.append(priority)
+            return await acquire(tokens, priority)
+
+        client.admission.acquire = recording_acquire
+        assert await client.amap_content_type("weblog entry", ["blog_post", "page"]) == "blog_post"
+        assert priorities == [PRIORITY_INTERACTIVE]
+        await client.aclose()
@@ -0,0 +1,454 @@
+"""
+Unit tests for the Bedrock client.
+The async transport uses httpx.MockTransport so no AWS access is required.
+"""
+
+import asyncio
+import binascii
+import json
+import struct
+
+import boto3
+import httpx
+import pytest
+from botocore.stub import Stubber
+
+from backend.bedrock_client import BedrockClient
+from backend.bedrock_http import AsyncBedrockRuntime
+from backend.content_types import ContentTypeMemo
+from backend.metrics import get_metrics
+
+
+def converse_body(text: str) -> dict:
+    """A minimal Converse API response carrying one text block."""
+    return {
+        "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+        "stopReason": "end_turn",
+        "usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15},
+    }
+
+
+def encode_event(event_type: str, payload: dict, message_type: str = "event") -> bytes:
+    """Encode one message in the AWS event stream binary format."""
+    type_header = ":exception-type" if message_type == "exception" else ":event-type"
+    headers = b""
+    for name, value in ((":message-type", message_type), (type_header, event_type)):
+        headers += bytes([len(name)]) + name.encode() + b"\x07" + struct.pack(">H", len(value)) + value.encode()
+    body = json.dumps(payload).encode()
+    total_length = 12 + len(headers) + len(body) + 4
+    prelude = struct.pack(">II", total_length, len(headers))
+    prelude += struct.pack(">I", binascii.crc32(prelude) & 0xFFFFFFFF)
+    message = prelude + headers + body
+    return message + struct.pack(">I", binascii.crc32(message) & 0xFFFFFFFF)
+
+
+def stream_body(text: str, chunk_size: int = 6) -> bytes:
+    """A ConverseStream response body generating ``text`` in small deltas."""
+    events = [encode_event("messageStart", {"role": "assistant"})]
+    for i in range(0, len(text), chunk_size):
+        events.append(encode_event("contentBlockDelta", {
+            "contentBlockIndex": 0, "delta": {"text": text[i:i + chunk_size]}
+        }))
+    events.append(encode_event("messageStop", {"stopReason": "end_turn"}))
+    events.append(encode_event("metadata", {
+        "usage": {"inputTokens": 20, "outputTokens": 8, "cacheReadInputTokens": 1500, "cacheWriteInputTokens": 0},
+        "metrics": {"latencyMs": 120}
+    }))
+    return b"".join(events)
+
+
+def tool_use_body(tool_input: dict, stop_reason: str = "tool_use") -> dict:
+    """A Converse API response where the planner answered through its tool."""
+    return {
+        "output": {"message": {"role": "assistant", "content": [
+            {"toolUse": {"toolUseId": "tooluse_1", "name": "respond", "input": tool_input}}
+        ]}},
+        "stopReason": stop_reason,
+        "usage": {"inputTokens": 10, "outputTokens": 5, "totalTokens": 15},
+    }
+
+
+def tool_stream_body(tool_json: str, chunk_size: int = 6) -> bytes:
+    """A ConverseStream response body streaming the planner tool's input."""
+    events = [
+        encode_event("messageStart", {"role": "assistant"}),
+        encode_event("contentBlockStart", {
+            "contentBlockIndex": 0, "start": {"toolUse": {"toolUseId": "tooluse_1", "name": "respond"}}
+        }),
+    ]
+    for i in range(0, len(tool_json), chunk_size):
+        events.append(encode_event("contentBlockDelta", {
+            "contentBlockIndex": 0, "delta": {"toolUse": {"input": tool_json[i:i + chunk_size]}}
+        }))
+    events.append(encode_event("contentBlockStop", {"contentBlockIndex": 0}))
+    events.append(encode_event("messageStop", {"stopReason": "tool_use"}))
+    return b"".join(events)
+
+
+def make_client(handler) -> BedrockClient:
+    """Create a BedrockClient whose async transport uses a mock HTTP transport."""
+    client = BedrockClient()
+    session = boto3.Session(
+        aws_access_key_id="AKIDEXAMPLE",
+        aws_secret_access_key="secret",
+        region_name="us-east-1"
+    )
+    client.async_runtime = AsyncBedrockRuntime(session, region="us-east-1", timeout=5)
+    client.async_runtime._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._content_type_memo = ContentTypeMemo(":memory:")
+    return client
+
+
+class TestAsyncConverse:
+    """Test the native asyncio Converse path."""
+
+    @pytest.mark.asyncio
+    async def test_signed_request_and_same_return_shape(self):
+        """aconverse sends a SigV4-signed request and parses like converse."""
+        seen = {}
+        reply = '{"action": "search", "term": "drupal", "limit": 5, "response": "Here you go"}'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["url"] = str(request.url)
+            seen["auth"] = request.headers.get("Authorization", "")
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json=converse_body(reply))
+
+        client = make_client(handler)
+        result = await client.aconverse(message="find drupal", conversation_history=[])
+
+        assert seen["url"].startswith("https://bedrock-runtime.us-east-1.amazonaws.com/model/")
+        assert seen["url"].endswith("/converse")
+        assert seen["auth"].startswith("AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/")
+        assert seen["body"]["messages"][-1]["content"][0]["text"] == "find drupal"
+        assert "modelId" not in seen["body"]
+        assert result == client._parse_converse_response(converse_body(reply))
+        assert result["action"] == "search" and result["limit"] == 5
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_throttling_maps_to_same_error(self):
+        """Error responses are mapped like boto3 ClientErrors."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                429,
+                headers={"x-amzn-ErrorType": "ThrottlingException:http://internal.amazon.com/"},
+                json={"message": "Too many requests"}
+            )
+
+        client = make_client(handler)
+        with pytest.raises(Exception, match="Request throttled"):
+            await client.aconverse(message="hi", conversation_history=[])
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited_by_setting(self):
+        """No more than bedrock_max_concurrency calls are in flight at once."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=converse_body('{"action": "chat", "response": "ok"}'))
+
+        client = make_client(handler)
+        client._concurrency = asyncio.Semaphore(3)
+        results = await asyncio.gather(*(
+            client.aconverse(message=f"hi {i}", conversation_history=[]) for i in range(12)
+        ))
+
+        assert all(result["action"] == "chat" for result in results)
+        assert peak == 3
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_map_content_type(self):
+        """amap_content_type returns the mapped type or None like map_content_type."""
+        answers = iter(["resource_download", "something_else"])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=converse_body(next(answers)))
+
+        client = make_client(handler)
+        assert await client.amap_content_type("whitepaper", ["page", "resource_download"]) == "resource_download"
+        assert await client.amap_content_type("whitepaper", ["page", "gated_asset"]) is None
+        assert await client.amap_content_type("whitepaper", []) is None
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_sync_fallback_when_disabled(self, monkeypatch):
+        """With the async transport disabled, the boto3 client is used."""
+        client = make_client(lambda request: httpx.Response(500))
+        monkeypatch.setattr(client.settings, "bedrock_async_enabled", False)
+        calls = []
+
+        def fake_converse(**kwargs):
+            calls.append(kwargs)
+            return converse_body('{"action": "chat", "response": "from boto3"}')
+
+        monkeypatch.setattr(client.client, "converse", fake_converse)
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "from boto3"
+        assert calls[0]["modelId"] == client.router.model_for("planner")
+        await client.aclose()
+
+
+class TestConverseStream:
+    """Test the ConverseStream path."""
+
+    @pytest.mark.asyncio
+    async def test_streams_response_text_then_final_result(self):
+        """Response text is yielded while generating, then the parsed result."""
+        reply = '{"action": "search", "term": "drupal", "limit": 5, "response": "Here are the Drupal stories."}'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path.endswith("/converse-stream")
+            return httpx.Response(200, content=stream_body(reply))
+
+        client = make_client(handler)
+        events = [event async for event in client.aconverse_stream(message="drupal", conversation_history=[])]
+
+        texts = [value for kind, value in events if kind == "text"]
+        assert len(texts) > 1
+        kinds = [kind for kind, _ in events]
+        assert [value for kind, value in events if kind == "field"] == [
+            ("action", "search"), ("term", "drupal"), ("limit", 5)
+        ]
+        assert kinds.index("field") < kinds.index("text")
+        assert "".join(texts) == "Here are the Drupal stories."
+        assert events[-1] == ("final", client._parse_converse_response(converse_body(reply)))
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_plain_text_reply_is_yielded_at_the_end(self):
+        """Replies without JSON are still spoken (as one chunk)."""
+        client = make_client(lambda request: httpx.Response(200, content=stream_body("Hello there!")))
+        events = [event async for event in client.aconverse_stream(message="hi", conversation_history=[])]
+
+        # The unparseable reply is escalated first; the larger model's answer is spoken once
+        assert [event for event in events if event[0] == "text"] == [("text", "Hello there!")]
+        assert events[-1][1]["action"] == "chat"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_exception_is_mapped(self):
+        """An exception event in the stream raises like a ClientError."""
+        body = encode_event("throttlingException", {"message": "slow down"}, message_type="exception")
+        client = make_client(lambda request: httpx.Response(200, content=body))
+        with pytest.raises(Exception, match="Bedrock API error"):
+            async for _ in client.aconverse_stream(message="hi", conversation_history=[]):
+                pass
+        await client.aclose()
+
+
+class TestPromptCaching:
+    """Test the cached system prompt and cache token accounting."""
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_is_built_once_with_cache_point(self):
+        """Every turn sends the same system blocks, ending with a cachePoint."""
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            body = converse_body('{"action": "chat", "response": "ok"}')
+            body["usage"].update({"cacheReadInputTokens": 1500, "cacheWriteInputTokens": 0})
+            return httpx.Response(200, json=body)
+
+        get_metrics().reset()
+        client = make_client(handler)
+        assert client.system_blocks is client.system_blocks
+        await client.aconverse(message="one", conversation_history=[])
+        await client.aconverse(message="two", conversation_history=[])
+
+        assert bodies[0]["system"] == bodies[1]["system"]
+        assert bodies[0]["system"][-1] == {"cachePoint": {"type": "default"}}
+        assert get_metrics().counter("bedrock.tokens.cache_read") == 3000
+        assert get_metrics().counter("bedrock.tokens.input") == 20
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_model_without_caching_falls_back(self):
+        """A cachePoint validation error is retried without it and caching is turned off for that model."""
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            bodies.append(body)
+            if any("cachePoint" in block for block in body["system"]):
+                return httpx.Response(
+                    400,
+                    headers={"x-amzn-ErrorType": "ValidationException"},
+                    json={"message": "extraneous key [cachePoint] is not permitted"}
+                )
+            return httpx.Response(200, json=converse_body('{"action": "chat", "response": "ok"}'))
+
+        client = make_client(handler)
+        first = await client.aconverse(message="one", conversation_history=[])
+        second = await client.aconverse(message="two", conversation_history=[])
+
+        assert first["response"] == second["response"] == "ok"
+        assert len(bodies) == 3
+        assert not client.supports_prompt_cache(client.router.model_for("planner"))
+        assert client.supports_prompt_cache("anthropic.claude-3-opus-20240229-v1:0")
+        assert all("cachePoint" not in block for block in bodies[2]["system"])
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_other_validation_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(
+                400,
+                headers={"x-amzn-ErrorType": "ValidationException"},
+                json={"message": "messages: field required"}
+            )
+
+        client = make_client(handler)
+        with pytest.raises(Exception, match="ValidationException"):
+            await client.aconverse(message="hi", conversation_history=[])
+        assert len(calls) == 1
+        assert client.prompt_cache_enabled
+        await client.aclose()
+
+    def test_sync_path_with_caching_enabled(self):
+        """The boto3 path works even when the installed botocore doesn't know cachePoint."""
+        client = make_client(lambda request: httpx.Response(500))
+        assert client.prompt_cache_enabled
+        body = converse_body('{"action": "chat", "response": "from boto3"}')
+        body["metrics"] = {"latencyMs": 100}
+
+        with Stubber(client.client) as stubber:
+            stubber.add_response("converse", body)
+            result = client.converse(message="hi", conversation_history=[])
+            stubber.assert_no_pending_responses()
+
+        assert result["response"] == "from boto3"
+
+    @pytest.mark.asyncio
+    async def test_stream_usage_is_recorded(self):
+        """Cache reads reported in the stream metadata event are counted."""
+        get_metrics().reset()
+        reply = '{"action": "chat", "response": "Hi!"}'
+        client = make_client(lambda request: httpx.Response(200, content=stream_body(reply)))
+        async for _ in client.aconverse_stream(message="hi", conversation_history=[]):
+            pass
+
+        assert get_metrics().counter("bedrock.tokens.cache_read") == 1500
+        assert get_metrics().counter("bedrock.tokens.output") == 8
+        assert get_metrics().snapshot()["observations"]["bedrock.stream.first_token"]["count"] == 1
+        await client.aclose()
+
+
+class TestContentTypeMapping:
+    """Test the local matcher and memo in front of the mapping LLM call."""
+
+    @pytest.mark.asyncio
+    async def test_local_matches_skip_bedrock(self):
+        calls = []
+        client = make_client(lambda request: calls.append(request) or httpx.Response(500))
+
+        assert await client.amap_content_type("blog posts", ["page", "blog_post"]) == "blog_post"
+        assert await client.amap_content_type("article", ["page", "blog_post"]) == "blog_post"
+        assert client.map_content_type("Landing Pages", ["page", "landing_page"]) == "landing_page"
+        assert calls == []
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_llm_answers_are_memoized_and_coalesced(self):
+        """Concurrent identical mappings share one call; later ones hit the memo."""
+        get_metrics().reset()
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=converse_body("resource_download"))
+
+        client = make_client(handler)
+        types = ["page", "resource_download"]
+        results = await asyncio.gather(*(client.amap_content_type("whitepaper", types) for _ in range(3)))
+        # Same request in a different order and form
+        again = await client.amap_content_type("Whitepapers", list(reversed(types)))
+
+        assert results == ["resource_download"] * 3
+        assert again == "resource_download"
+        assert len(calls) == 1
+        assert get_metrics().counter("content_type.memo_hits") == 1
+        await client.aclose()
+
+
+class TestPlannerToolUse:
+    """Test structured planner output through Converse toolConfig."""
+
+    @pytest.mark.asyncio
+    async def test_request_forces_tool_with_tight_token_cap(self):
+        seen = {}
+        decision = {"action": "search", "term": "drupal", "limit": 5, "response": "Here you go"}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json=tool_use_body(decision))
+
+        client = make_client(handler)
+        result = await client.aconverse(message="find 5 drupal stories", conversation_history=[])
+
+        tool_config = seen["body"]["toolConfig"]
+        schema = tool_config["tools"][0]["toolSpec"]["inputSchema"]["json"]
+        assert tool_config["toolChoice"] == {"tool": {"name": "respond"}}
+        assert schema["properties"]["action"]["enum"] == ["search", "analyze", "list_analyzed", "clarify", "refine", "chat"]
+        assert schema["additionalProperties"] is False
+        assert seen["body"]["inferenceConfig"]["maxTokens"] == client.settings.bedrock_planner_max_tokens
+        assert "respond tool" in seen["body"]["system"][0]["text"]
+        assert result["action"] == "search" and result["term"] == "drupal" and result["limit"] == 5
+        assert result["response"] == "Here you go"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streamed_tool_input_yields_fields_and_text(self):
+        decision = {"action": "analyze", "term": "react", "content_type": "article", "response": "Let me check that."}
+        client = make_client(lambda request: httpx.Response(200, content=tool_stream_body(json.dumps(decision))))
+
+        events = [event async for event in client.aconverse_stream(message="how many react articles?", conversation_history=[])]
+
+        fields = [value[0] for kind, value in events if kind == "field"]
+        text = "".join(value for kind, value in events if kind == "text")
+        assert fields == ["action", "term", "content_type"]
+        assert text == "Let me check that."
+        assert events[-1][1]["action"] == "analyze" and events[-1][1]["content_type"] == "article"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_truncated_tool_input_is_counted(self):
+        get_metrics().reset()
+        client = make_client(lambda request: httpx.Response(200, json=tool_use_body(
+            {"action": "chat", "response": "Hello"}, stop_reason="max_tokens"
+        )))
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "Hello"
+        assert get_metrics().counter("bedrock.planner.truncated") == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_text_json_still_parsed_without_tool_use(self, monkeypatch):
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json=converse_body('{"action": "chat", "response": "ok"}'))
+
+        client = make_client(handler)
+        monkeypatch.setattr(client.settings, "bedrock_tool_use_enabled", False)
+        result = await client.aconverse(message="hello", conversation_history=[])
+
+        assert "toolConfig" not in seen["body"]
+        assert result["response"] == "ok"
+        await client.aclose()
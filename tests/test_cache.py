@@ -0,0 +1,179 @@
+"""
+Unit tests for the in-process caching primitives.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.cache import SingleFlight, TTLCache
+from backend.metrics import get_metrics
+
+
+class TestTTLCache:
+    """Test TTL expiry, LRU eviction and size bounds."""
+
+    def setup_method(self):
+        """Reset metrics so counters start at zero."""
+        get_metrics().reset()
+
+    def test_hit_and_miss_counters(self):
+        """Hits and misses are reported under the cache name."""
+        cache = TTLCache("unit", max_entries=10, ttl=60)
+        cache.set("a", {"x": 1})
+
+        assert cache.get("a") == {"x": 1}
+        assert cache.get("b") is None
+        assert get_metrics().counter("cache.unit.hits") == 1
+        assert get_metrics().counter("cache.unit.misses") == 1
+
+    def test_expired_entry_is_a_miss_but_kept_for_revalidation(self):
+        """Stale entries are not served but keep their validators."""
+        cache = TTLCache("unit", max_entries=10, ttl=60)
+        cache.set("a", "value", etag='"v1"', ttl=0)
+
+        assert cache.get("a") is None
+        entry = cache.get_entry("a")
+        assert entry.etag == '"v1"'
+
+        cache.touch("a")
+        assert cache.get("a") == "value"
+
+    def test_lru_eviction_by_entry_count(self):
+        """The least recently used entry is evicted first."""
+        cache = TTLCache("unit", max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert get_metrics().counter("cache.unit.evictions") == 1
+
+    def test_eviction_by_bytes(self):
+        """Total size stays under max_bytes."""
+        cache = TTLCache("unit", max_entries=100, ttl=60, max_bytes=10, sizeof=len)
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.set("c", "xxxx")
+
+        assert len(cache) == 2
+        assert cache.total_bytes == 8
+
+    def test_oversized_value_is_not_cached(self):
+        """A value larger than the whole cache is skipped."""
+        cache = TTLCache("unit", max_entries=100, ttl=60, max_bytes=3, sizeof=len)
+        cache.set("a", "xxxx")
+
+        assert len(cache) == 0
+
+    def test_predicate_rejects_value(self):
+        """A value failing the predicate counts as a miss."""
+        cache = TTLCache("unit", max_entries=10, ttl=60)
+        cache.set("a", {"id": 1})
+
+        assert cache.get("a", predicate=lambda v: "content" in v) is None
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """N concurrent callers trigger the underlying call once."""
+        flights = SingleFlight("unit")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        """Every waiter sees the shared exception."""
+        flights = SingleFlight("unit")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(
+            *(flights.do("k", work) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Cancelling one waiter leaves the shared call running for the rest."""
+        flights = SingleFlight("unit")
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return 42
+
+        first = asyncio.create_task(flights.do("k", work))
+        second = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == 42
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancelled_cancels_shared_call(self):
+        """When nobody waits any more, the shared call is cancelled and removed."""
+        flights = SingleFlight("unit")
+        started = asyncio.Event()
+        finished = False
+
+        async def work():
+            nonlocal finished
+            started.set()
+            await asyncio.sleep(1)
+            finished = True
+
+        waiter = asyncio.create_task(flights.do("k", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert len(flights) == 0
+        assert not finished
+
+    @pytest.mark.asyncio
+    async def test_caller_after_abandoned_call_starts_fresh(self):
+        """A caller arriving while an abandoned call is still cancelling gets its own call."""
+        flights = SingleFlight("unit")
+        started = asyncio.Event()
+
+        async def slow_to_cancel():
+            started.set()
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.02)  # cleanup on the way out
+                raise
+
+        async def fresh():
+            return "fresh"
+
+        waiter = asyncio.create_task(flights.do("k", slow_to_cancel))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert await flights.do("k", fresh) == "fresh"
+        await asyncio.sleep(0.05)
+        assert len(flights) == 0
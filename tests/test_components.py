@@ -0,0 +1,129 @@
+"""
+Unit tests for the component catalog and its use in the planner prompt.
+Uses httpx.MockTransport so no network access is required.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from backend import main
+from backend.bedrock_client import BedrockClient
+from backend.components import ComponentCatalog
+from backend.storyblok_client import StoryblokClient
+
+COMPONENTS = [
+    {"name": "blog_post", "display_name": "Blog Post", "is_root": True},
+    {"name": "case_study", "display_name": "Case Study", "is_root": True},
+    {"name": "page", "is_root": True},
+    {"name": "teaser", "is_root": False},
+]
+
+
+def make_catalog(handler) -> ComponentCatalog:
+    """Create a catalog whose Storyblok client uses a mock transport."""
+    storyblok_client = StoryblokClient()
+    storyblok_client._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        headers=storyblok_client._build_headers()
+    )
+    return ComponentCatalog(storyblok_client)
+
+
+class TestComponentCatalog:
+    """Test loading and refreshing the catalog."""
+
+    @pytest.mark.asyncio
+    async def test_loads_root_components_from_management_api(self):
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"components": COMPONENTS})
+
+        catalog = make_catalog(handler)
+        seen = []
+        catalog.add_listener(seen.append)
+
+        assert await catalog.refresh() is True
+        assert paths == [f"/v1/spaces/{catalog.storyblok_client.space_id}/components"]
+        assert catalog.content_types == ["blog_post", "case_study", "page"]
+        # An unchanged refresh doesn't notify listeners again
+        assert await catalog.refresh() is False
+        assert seen == [["blog_post", "case_study", "page"]]
+        await catalog.storyblok_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_previous_catalog(self):
+        responses = iter([httpx.Response(200, json={"components": COMPONENTS}), httpx.Response(500)])
+        catalog = make_catalog(lambda request: next(responses))
+
+        await catalog.refresh()
+        assert await catalog.refresh() is False
+        assert catalog.content_types == ["blog_post", "case_study", "page"]
+        await catalog.storyblok_client.aclose()
+
+    def test_resolve_only_exact_names(self):
+        catalog = ComponentCatalog(MagicMock())
+        assert catalog.resolve("blog_post") is None  # not loaded yet
+
+        catalog.components = COMPONENTS
+        catalog.loaded_at = 0.0
+        assert catalog.resolve("blog_post") == "blog_post"
+        assert catalog.resolve("Case Studies") == "case_study"
+        assert catalog.resolve("article") is None
+
+
+class TestPlannerPrompt:
+    """Test that the planner sees the catalog and mapping is skipped."""
+
+    def test_system_prompt_lists_catalog_names(self):
+        client = BedrockClient()
+        assert '"landing_page" - landing pages' in client.system_blocks[0]["text"]
+
+        client.set_content_types(["blog_post", "case_study"])
+        prompt = client.system_blocks[0]["text"]
+
+        assert '- "case_study"' in prompt
+        assert "landing_page" not in prompt
+        assert "use one of these exact names" in prompt
+
+    @pytest.mark.asyncio
+    async def test_exact_catalog_name_skips_mapping(self, monkeypatch):
+        catalog = ComponentCatalog(MagicMock())
+        catalog.components = COMPONENTS
+        catalog.loaded_at = 0.0
+        monkeypatch.setattr(main, "get_component_catalog", lambda: catalog)
+        bedrock_mock = MagicMock()
+        bedrock_mock.amap_content_type = AsyncMock(return_value="page")
+
+        assert await main._map_content_type(bedrock_mock, "case_study", ["page", "case_study"]) == "case_study"
+        bedrock_mock.amap_content_type.assert_not_called()
+        assert await main._map_content_type(bedrock_mock, "landing", ["page"]) == "page"
+        bedrock_mock.amap_content_type.assert_awaited_once_with("landing", ["page"])
+
+
+class TestLifespan:
+    """Test wiring the catalog into the app."""
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_duplicate_listener(self, monkeypatch):
+        catalog = make_catalog(lambda request: httpx.Response(200, json={"components": COMPONENTS}))
+        bedrock_mock = MagicMock()
+        bedrock_mock.aclose = AsyncMock()
+        storyblok_mock = MagicMock()
+        storyblok_mock.start = AsyncMock()
+        storyblok_mock.aclose = AsyncMock()
+        batcher_mock = MagicMock()
+        batcher_mock.aclose = AsyncMock()
+        monkeypatch.setattr(main, "get_component_catalog", lambda: catalog)
+        monkeypatch.setattr(main, "get_bedrock_client", lambda: bedrock_mock)
+        monkeypatch.setattr(main, "get_storyblok_client", lambda: storyblok_mock)
+        monkeypatch.setattr(main, "get_invalidation_batcher", lambda: batcher_mock)
+        monkeypatch.setattr(main, "run_periodic_refresh", AsyncMock())
+
+        for _ in range(2):
+            async with main.lifespan(main.app):
+                assert catalog._listeners == [bedrock_mock.set_content_types]
+        assert catalog._listeners == []
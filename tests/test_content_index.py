@@ -0,0 +1,176 @@
+"""
+Unit tests for the local SQLite FTS content mirror and its sync.
+"""
+
+import pytest
+
+from backend.content_index import ContentIndex, build_fts_query, flatten_content
+from backend.sync import ContentSync
+
+
+def make_story(story_id, name, text, component="article", **extra):
+    """Build a Management API style story with a nested body."""
+    return {
+        "id": story_id,
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "updated_at": "2025-01-01T00:00:00Z",
+        "content": {
+            "_uid": "abc",
+            "component": component,
+            "body": [{"component": "text", "_uid": "def", "text": text}],
+        },
+        **extra,
+    }
+
+
+@pytest.fixture
+def index():
+    """An in-memory content index."""
+    content_index = ContentIndex(":memory:")
+    yield content_index
+    content_index.close()
+
+
+class TestContentIndex:
+    """Test indexing, full-text search and counting."""
+
+    def test_flatten_content_skips_metadata(self):
+        """Only human-readable text is kept."""
+        text = flatten_content(make_story(1, "A", "Hello Drupal")["content"])
+        assert text == "Hello Drupal"
+
+    def test_build_fts_query_quotes_words(self):
+        """User text can't inject FTS5 syntax."""
+        assert build_fts_query('drupal OR "x') == '"drupal" "OR" "x"'
+        assert build_fts_query("?!") is None
+
+    def test_search_and_count(self, index):
+        """Body text is searchable and counted per content type."""
+        index.upsert_stories([
+            make_story(1, "Migrating from Drupal", "We moved off Drupal last year"),
+            make_story(2, "Pricing page", "Plans and pricing", component="page"),
+            make_story(3, "CMS comparison", "Drupal versus headless", component="page"),
+        ])
+
+        results = index.search("drupal", limit=10)
+
+        assert {r.story_id for r in results} == {1, 3}
+        assert results[0].story_id == 1  # name match ranks first
+        assert index.count("drupal") == 2
+        assert index.count("drupal", content_type="article") == 1
+        assert index.count_by_content_type("drupal") == {"article": 1, "page": 1}
+
+    def test_upsert_replaces_and_delete_removes(self, index):
+        """Updated stories are re-indexed; deleted ones disappear from FTS."""
+        index.upsert_stories([make_story(1, "Old", "drupal")])
+        index.upsert_stories([make_story(1, "New", "wordpress")])
+
+        assert index.count("drupal") == 0
+        assert index.count("wordpress") == 1
+
+        assert index.delete_stories([1]) == 1
+        assert index.count("wordpress") == 0
+        assert index.get_story(1) is None
+
+    def test_sync_state(self, index):
+        """State values persist and overwrite."""
+        index.set_state("watermark", "a")
+        index.set_state("watermark", "b")
+        assert index.get_state("watermark") == "b"
+
+
+class FakeStoryblok:
+    """Listing without content, full stories on demand."""
+
+    space_id = "1"
+
+    def __init__(self, stories):
+        self.stories = stories
+        self.filters = []
+
+    async def list_stories(self, page=1, per_page=100, **filters):
+        self.filters.append(filters)
+        matching = [
+            story for story in self.stories
+            if story.get("updated_at", "") > filters.get("updated_at_gt", "")
+        ]
+        start = (page - 1) * per_page
+        listed = [
+            {k: v for k, v in story.items() if k != "content"}
+            for story in matching[start:start + per_page]
+        ]
+        return listed, len(matching)
+
+    def invalidate_story(self, story_id, version=None):
+        return False
+
+    async def get_story_by_id(self, story_id):
+        return next(story for story in self.stories if story["id"] == story_id)
+
+
+class TestFullSync:
+    """Test the full sync into the mirror."""
+
+    @pytest.mark.asyncio
+    async def test_full_sync_pages_fetches_content_and_prunes(self, index):
+        """All pages are mirrored with content; stale stories are removed."""
+        index.upsert_stories([make_story(99, "Gone", "stale")])
+        stories = [make_story(i, f"Story {i}", f"topic{i} drupal") for i in range(1, 6)]
+        stories.append({"id": 50, "name": "Folder", "is_folder": True})
+        sync = ContentSync(storyblok_client=FakeStoryblok(stories), index=index)
+        sync.settings = sync.settings.model_copy(update={"storyblok_bulk_page_size": 2})
+
+        summary = await sync.full_sync()
+
+        assert summary["synced"] == 5
+        assert summary["removed"] == 1
+        assert index.count("drupal") == 5
+        assert index.get_story(99) is None
+        assert index.get_state("last_full_sync")
+
+
+class TestDeltaSync:
+    """Test incremental sync from the persisted watermark."""
+
+    @pytest.mark.asyncio
+    async def test_delta_pulls_only_changed_stories(self, index):
+        """Only stories newer than the watermark are fetched; watermark advances."""
+        stories = [make_story(i, f"Story {i}", "drupal") for i in range(1, 4)]
+        client = FakeStoryblok(stories)
+        sync = ContentSync(storyblok_client=client, index=index)
+        await sync.full_sync()
+        assert index.get_state("watermark") == "2025-01-01T00:00:00Z"
+
+        stories[1] = make_story(2, "Story 2", "wordpress", updated_at="2025-02-01T00:00:00Z")
+        summary = await sync.delta_sync(sweep_deletions=False)
+
+        assert summary["synced"] == 1
+        assert client.filters[-1] == {"updated_at_gt": "2025-01-01T00:00:00Z"}
+        assert index.count("wordpress") == 1
+        assert index.get_state("watermark") == "2025-02-01T00:00:00Z"
+
+    @pytest.mark.asyncio
+    async def test_deletion_sweep_removes_missing_stories(self, index):
+        """Stories deleted upstream are pruned by the sweep."""
+        stories = [make_story(i, f"Story {i}", "drupal") for i in range(1, 4)]
+        client = FakeStoryblok(stories)
+        sync = ContentSync(storyblok_client=client, index=index)
+        await sync.full_sync()
+
+        del stories[0]
+        summary = await sync.delta_sync(sweep_deletions=True)
+
+        assert summary["removed"] == 1
+        assert index.get_story(1) is None
+
+    @pytest.mark.asyncio
+    async def test_delta_without_watermark_runs_full_sync(self, index):
+        """The first delta on an empty mirror is a full sync."""
+        client = FakeStoryblok([make_story(1, "Story", "drupal")])
+        sync = ContentSync(storyblok_client=client, index=index)
+
+        summary = await sync.delta_sync()
+
+        assert summary["synced"] == 1
+        assert index.get_state("last_full_sync")
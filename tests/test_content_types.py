@@ -0,0 +1,56 @@
+"""
+Unit tests for the local content type matcher and the persistent mapping memo.
+"""
+
+from backend.content_types import ContentTypeMemo, canonical_type, match_content_type, memo_key
+
+
+class TestMatchContentType:
+    """Test mappings resolved without the LLM."""
+
+    def test_exact_plural_and_snake_case(self):
+        types = ["page", "blog_post", "case_study"]
+        assert canonical_type("Blog Posts") == "blog_post"
+        assert match_content_type("page", types) == "page"
+        assert match_content_type("blog posts", types) == "blog_post"
+        assert match_content_type("Case-Studies", types) == "case_study"
+        assert match_content_type("blogpost", types) == "blog_post"
+
+    def test_partial_and_synonym_matches(self):
+        assert match_content_type("landing", ["page", "landing_page"]) == "landing_page"
+        assert match_content_type("articles", ["page", "blog_post"]) == "blog_post"
+        assert match_content_type("webinars", ["page", "event"]) == "event"
+
+    def test_ambiguous_or_unknown_requests_go_to_the_llm(self):
+        assert match_content_type("page", ["landing_page", "targeted_page"]) is None
+        assert match_content_type("article", ["blog_post", "news"]) is None
+        assert match_content_type("whitepaper", ["page", "gated_asset"]) is None
+        assert match_content_type("", ["page"]) is None
+
+
+class TestContentTypeMemo:
+    """Test the persistent memo."""
+
+    def test_key_ignores_request_form_and_type_order(self):
+        assert memo_key("Whitepapers", ["b", "a", "a"]) == memo_key("whitepaper", ["a", "b"])
+        assert memo_key("whitepaper", ["a"]) != memo_key("whitepaper", ["a", "b"])
+
+    def test_mappings_survive_reopening(self, tmp_path):
+        path = str(tmp_path / "memo.db")
+        memo = ContentTypeMemo(path)
+        memo.set("whitepaper", ["page", "resource_download"], "resource_download")
+        memo.set("brochure", ["page"], None)
+        memo.close()
+
+        reopened = ContentTypeMemo(path)
+        assert reopened.get("whitepapers", ["resource_download", "page"]) == (True, "resource_download")
+        assert reopened.get("brochure", ["page"]) == (True, None)
+        assert reopened.get("brochure", ["page", "event"]) == (False, None)
+
+    def test_oldest_entries_are_dropped(self, tmp_path):
+        memo = ContentTypeMemo(str(tmp_path / "memo.db"), max_entries=2)
+        for name in ("one", "two", "three"):
+            memo.set(name, ["page"], "page")
+        assert len(memo) == 2
+        assert memo.get("one", ["page"]) == (False, None)
+        assert memo.get("three", ["page"]) == (True, "page")
@@ -0,0 +1,135 @@
+"""
+Unit tests for early action dispatch from streamed LLM output.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.early_dispatch import EarlyDispatcher, clamp_search_limit, dispatch_key
+from backend.metrics import get_metrics
+from backend.models import SearchResults, StoryResult
+
+
+def make_storyblok_mock(delay: float = 0.0):
+    """Storyblok client mock whose search takes ``delay`` seconds."""
+    async def search(term, limit=10, offset=0):
+        await asyncio.sleep(delay)
+        return SearchResults(
+            stories=[StoryResult(body="b", cursor=0, name=f"{term} story", slug="s", story_id=1)],
+            total=1
+        )
+
+    storyblok_mock = MagicMock()
+    storyblok_mock.search = AsyncMock(side_effect=search)
+    storyblok_mock.get_stories_by_ids = AsyncMock(return_value={})
+    return storyblok_mock
+
+
+class TestDispatchKey:
+    """Test the identity used to match early and final actions."""
+
+    def test_terms_are_normalized_and_limits_clamped(self):
+        assert dispatch_key("search", "  Drupal  CMS ", 5) == dispatch_key("search", "drupal cms", "5")
+        assert dispatch_key("search", "drupal", 10_000)[2] == clamp_search_limit(10_000)
+        assert dispatch_key("search", "drupal", None)[2] == clamp_search_limit(None)
+
+    def test_only_search_and_analyze_dispatch(self):
+        assert dispatch_key("chat", "drupal", 5) is None
+        assert dispatch_key("search", "", 5) is None
+        assert dispatch_key("analyze", "Drupal", 5) == ("analyze", "drupal", None)
+
+
+class TestEarlyDispatcher:
+    """Test starting and reusing searches from partial output."""
+
+    @pytest.mark.asyncio
+    async def test_search_starts_before_the_response_finishes(self):
+        """Once action, term and limit are known the search runs; the final action reuses it."""
+        get_metrics().reset()
+        storyblok_mock = make_storyblok_mock()
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=True)
+
+        dispatcher.on_field("action", "search")
+        dispatcher.on_field("term", "drupal")
+        assert dispatcher.task is None
+        dispatcher.on_field("limit", 5)
+        assert dispatcher.task is not None
+        await asyncio.sleep(0)
+        storyblok_mock.search.assert_awaited_once_with(term="drupal", limit=5)
+
+        results = await dispatcher.results("search", "Drupal", 5)
+
+        assert results.stories[0].name == "drupal story"
+        assert storyblok_mock.search.await_count == 1
+        assert get_metrics().counter("early_dispatch.used") == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_limit_dispatches_when_response_starts(self):
+        """Without a limit field the default is used once the response text begins."""
+        storyblok_mock = make_storyblok_mock()
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=True)
+
+        dispatcher.on_field("action", "search")
+        dispatcher.on_field("term", "drupal")
+        dispatcher.on_text()
+
+        assert dispatcher.key == ("search", "drupal", clamp_search_limit(None))
+        await dispatcher.results("search", "drupal", None)
+        assert storyblok_mock.search.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_final_action_cancels_and_searches_again(self):
+        """A mismatching early search is cancelled and the final values are used."""
+        get_metrics().reset()
+        storyblok_mock = make_storyblok_mock(delay=1.0)
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=True)
+        dispatcher.on_field("action", "search")
+        dispatcher.on_field("term", "drupal")
+        dispatcher.on_field("limit", 5)
+        early_task = dispatcher.task
+        await asyncio.sleep(0)
+
+        storyblok_mock.search.side_effect = None
+        storyblok_mock.search.return_value = SearchResults(stories=[], total=0)
+        results = await dispatcher.results("search", "wordpress", 5)
+        await asyncio.sleep(0)
+
+        assert results.total == 0
+        assert early_task.cancelled()
+        storyblok_mock.search.assert_awaited_with(term="wordpress", limit=5)
+        assert get_metrics().counter("early_dispatch.discarded") == 1
+
+    @pytest.mark.asyncio
+    async def test_restart_cancels_search_from_first_answer(self):
+        """When the planner turn is redone, the search from the first answer is dropped."""
+        get_metrics().reset()
+        storyblok_mock = make_storyblok_mock(delay=1.0)
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=True)
+        for name, value in (("action", "search"), ("term", "x"), ("limit", 5)):
+            dispatcher.on_field(name, value)
+        early_task = dispatcher.task
+
+        dispatcher.restart()
+        await asyncio.sleep(0)
+
+        assert early_task.cancelled()
+        assert dispatcher.task is None and dispatcher.fields == {}
+        assert get_metrics().counter("early_dispatch.discarded") == 1
+
+        dispatcher.on_field("action", "analyze")
+        dispatcher.on_field("term", "drupal")
+        assert dispatcher.key == ("analyze", "drupal", None)
+        dispatcher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_disabled_dispatcher_searches_on_demand(self):
+        storyblok_mock = make_storyblok_mock()
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=False)
+        dispatcher.on_field("action", "analyze")
+        dispatcher.on_field("term", "drupal")
+
+        assert dispatcher.task is None
+        results = await dispatcher.results("search", "drupal", 3)
+        assert results.total == 1
@@ -0,0 +1,209 @@
+"""
+Unit tests for hedged Bedrock requests.
+Both regions use httpx.MockTransport, so no AWS access is required.
+"""
+
+import asyncio
+import itertools
+import time
+
+import boto3
+import httpx
+import pytest
+
+from backend.admission import AdmissionController
+from backend.bedrock_http import AsyncBedrockRuntime
+from backend.hedging import HedgePolicy
+from backend.metrics import get_metrics
+from tests.test_bedrock_client import converse_body, make_client, stream_body
+
+REPLY = '{"action": "chat", "confidence": 0.9, "response": "%s"}'
+
+
+def make_hedged_client(primary, secondary, policy: HedgePolicy):
+    """A BedrockClient hedging from the primary handler to the secondary one."""
+    client = make_client(primary)
+    session = boto3.Session(aws_access_key_id="AKIDEXAMPLE", aws_secret_access_key="secret", region_name="us-west-2")
+    runtime = AsyncBedrockRuntime(session, region="us-west-2", timeout=5)
+    runtime._http_client = httpx.AsyncClient(transport=httpx.MockTransport(secondary))
+    client.hedge_runtimes = [runtime]
+    client._hedge_rotation = itertools.cycle(client.hedge_runtimes)
+    client._hedge_policy = lambda operation, model_id: policy
+    client.planner_cache = None
+    return client
+
+
+class TestHedgePolicy:
+    """Test the adaptive delay and the hedge budget."""
+
+    def test_delay_follows_recent_percentile(self):
+        policy = HedgePolicy(percentile=95, min_delay=0.1, initial_delay=2.0)
+        assert policy.delay() == 2.0
+
+        for i in range(100):
+            policy.record(0.5 if i < 95 else 3.0)
+        assert policy.delay() == 0.5
+        policy.record(0.01)
+        assert policy.delay() >= 0.1
+
+    def test_budget_limits_hedges(self):
+        policy = HedgePolicy(budget=0.5)
+        policy.tokens = 0
+        policy.earn()
+        assert policy.try_spend() is False
+        policy.earn()
+        assert policy.try_spend() is True
+        assert policy.try_spend() is False
+
+
+class TestHedgedConverse:
+    """Test racing the primary region against a secondary one."""
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        get_metrics().reset()
+        cancelled = []
+
+        async def primary(request: httpx.Request) -> httpx.Response:
+            try:
+                await asyncio.sleep(2)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return httpx.Response(200, json=converse_body(REPLY % "primary"))
+
+        def secondary(request: httpx.Request) -> httpx.Response:
+            assert request.url.host == "bedrock-runtime.us-west-2.amazonaws.com"
+            return httpx.Response(200, json=converse_body(REPLY % "secondary"))
+
+        client = make_hedged_client(primary, secondary, HedgePolicy(initial_delay=0.05))
+        started = time.perf_counter()
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "secondary"
+        assert time.perf_counter() - started < 1
+        assert cancelled == [True]
+        assert get_metrics().counter("bedrock.hedge.sent") == 1
+        assert get_metrics().counter("bedrock.hedge.wins") == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        get_metrics().reset()
+        secondary_calls = []
+
+        def secondary(request: httpx.Request) -> httpx.Response:
+            secondary_calls.append(1)
+            return httpx.Response(200, json=converse_body(REPLY % "secondary"))
+
+        client = make_hedged_client(
+            lambda request: httpx.Response(200, json=converse_body(REPLY % "primary")),
+            secondary,
+            HedgePolicy(initial_delay=1.0)
+        )
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "primary"
+        assert secondary_calls == []
+        assert get_metrics().counter("bedrock.hedge.sent") == 0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_throttled_primary_fails_over(self):
+        get_metrics().reset()
+        client = make_hedged_client(
+            lambda request: httpx.Response(
+                429, headers={"x-amzn-ErrorType": "ThrottlingException"}, json={"message": "Too many requests"}
+            ),
+            lambda request: httpx.Response(200, json=converse_body(REPLY % "secondary")),
+            HedgePolicy(initial_delay=1.0)
+        )
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "secondary"
+        assert get_metrics().counter("bedrock.hedge.failovers") == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_recovered_throttle_still_slows_admission(self):
+        """A throttle the failover absorbed is still reported to admission control."""
+        client = make_hedged_client(
+            lambda request: httpx.Response(
+                429, headers={"x-amzn-ErrorType": "ThrottlingException"}, json={"message": "Too many requests"}
+            ),
+            lambda request: httpx.Response(200, json=converse_body(REPLY % "secondary")),
+            HedgePolicy(initial_delay=1.0)
+        )
+        client.admission = AdmissionController(rpm_limit=60, tpm_limit=60000)
+
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "secondary"
+        assert client.admission.rate < 1.0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_waits_for_primary(self):
+        get_metrics().reset()
+
+        async def primary(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json=converse_body(REPLY % "primary"))
+
+        policy = HedgePolicy(initial_delay=0.01, budget=0.0)
+        policy.tokens = 0
+        client = make_hedged_client(
+            primary, lambda request: httpx.Response(200, json=converse_body(REPLY % "secondary")), policy
+        )
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "primary"
+        assert get_metrics().counter("bedrock.hedge.budget_exhausted") == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_hedge_is_skipped_without_admission(self):
+        """A hedge that would have to queue for admission is not sent."""
+        get_metrics().reset()
+        secondary_calls = []
+
+        async def primary(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json=converse_body(REPLY % "primary"))
+
+        def secondary(request: httpx.Request) -> httpx.Response:
+            secondary_calls.append(request)
+            return httpx.Response(200, json=converse_body(REPLY % "secondary"))
+
+        policy = HedgePolicy(initial_delay=0.01)
+        client = make_hedged_client(primary, secondary, policy)
+        client.admission = AdmissionController(rpm_limit=1, tpm_limit=60000)
+
+        result = await client.aconverse(message="hi", conversation_history=[])
+
+        assert result["response"] == "primary"
+        assert secondary_calls == []
+        assert get_metrics().counter("bedrock.hedge.not_admitted") == 1
+        assert policy.tokens >= 10
+        await client.aclose()
+
+
+class TestHedgedStream:
+    """Test hedging ConverseStream on the time to the first event."""
+
+    @pytest.mark.asyncio
+    async def test_first_stream_to_answer_is_used(self):
+        async def primary(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(2)
+            return httpx.Response(200, content=stream_body(REPLY % "primary"))
+
+        client = make_hedged_client(
+            primary,
+            lambda request: httpx.Response(200, content=stream_body(REPLY % "secondary")),
+            HedgePolicy(initial_delay=0.05)
+        )
+        events = [event async for event in client.aconverse_stream(message="hi", conversation_history=[])]
+
+        assert "".join(value for kind, value in events if kind == "text") == "secondary"
+        assert events[-1][1]["response"] == "secondary"
+        await client.aclose()
@@ -0,0 +1,76 @@
+"""
+Unit tests for the token-budgeted conversation history.
+"""
+
+from backend import main
+from backend.history import HistoryBuilder, estimate_tokens
+from backend.metrics import get_metrics
+from backend.models import ConversationRequest, Message
+
+
+def make_history(turns: int, reply_chars: int = 40):
+    history = []
+    for i in range(turns):
+        history.append(Message(role="user", content=f"question {i}"))
+        history.append(Message(role="assistant", content=f"Answer {i}. " + "x" * reply_chars))
+    return history
+
+
+class TestHistoryBuilder:
+    """Test fitting history to the token budget."""
+
+    def test_short_history_is_sent_unchanged(self):
+        history = make_history(2)
+        kept, current, stats = HistoryBuilder(token_budget=1000, max_messages=10).fit(history, "hello")
+
+        assert kept == history and current == "hello"
+        assert stats["summarized_messages"] == 0
+        assert stats["input_tokens"] == stats["history_tokens"] + stats["current_tokens"]
+
+    def test_long_turns_are_summarized_to_fit_the_budget(self):
+        history = make_history(6, reply_chars=800)
+        builder = HistoryBuilder(token_budget=700, summary_max_tokens=100, max_messages=50)
+        kept, current, stats = builder.fit(history, "what about drupal?")
+
+        assert stats["summarized_messages"] > 0
+        assert kept[0].role == "user"
+        assert kept[0].content.startswith("[EARLIER CONVERSATION, SUMMARIZED:")
+        assert '- User: "question 0"' in kept[0].content
+        assert kept[-1] == history[-1]
+        # The verbatim part stays within the budget left after the summary
+        assert stats["input_tokens"] - stats["summary_tokens"] <= 700
+        assert current == "what about drupal?"
+
+    def test_message_cap_still_applies(self):
+        history = make_history(10, reply_chars=0)
+        kept, _, stats = HistoryBuilder(token_budget=100_000, max_messages=4).fit(history, "next")
+
+        assert stats["kept_messages"] == 4
+        assert stats["summarized_messages"] == 16
+        assert kept[1:] == history[-3:]
+
+    def test_summary_goes_into_current_message_when_nothing_fits(self):
+        history = make_history(2, reply_chars=4000)
+        _, current, stats = HistoryBuilder(token_budget=300, summary_max_tokens=100).fit(history, "hi")
+
+        assert stats["kept_messages"] == 0
+        assert current.startswith("[EARLIER CONVERSATION, SUMMARIZED:") and current.endswith("hi")
+        assert estimate_tokens(current) < 300
+
+    def test_rolling_summary_reuses_cached_prefix(self):
+        get_metrics().reset()
+        builder = HistoryBuilder(token_budget=100_000, max_messages=4)
+        history = make_history(6, reply_chars=0)
+        builder.fit(history, "next")
+        builder.fit(history + make_history(1, reply_chars=0), "and then")
+
+        assert get_metrics().counter("cache.history_summary.hits") == 1
+        assert get_metrics().counter("history.summarized_turns") == 2
+
+
+def test_session_key_is_stable_as_history_grows():
+    """The session key comes from the full history, not the sent window."""
+    history = make_history(3)
+    first = main._load_session(ConversationRequest(message="more", conversation_history=history))[1]
+    later = main._load_session(ConversationRequest(message="more", conversation_history=make_history(30)))[1]
+    assert first == later
@@ -0,0 +1,174 @@
+"""
+Unit tests for the concurrent story hydration stage.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.hydration import hydrate_stories, search_and_hydrate
+from backend.models import StoryResult
+
+
+def make_stories(count: int):
+    """Build search results with story IDs 1..count."""
+    return [
+        StoryResult(body="", cursor=i, name=f"Story {i}", slug=f"story-{i}", story_id=i)
+        for i in range(1, count + 1)
+    ]
+
+
+class FakeStoryblok:
+    """Minimal stand-in for StoryblokClient.get_story_by_id."""
+
+    def __init__(self, delays=None, failing=(), cancelled=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.cancelled = set(cancelled)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_story_by_id(self, story_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(story_id, 0.01))
+            if story_id in self.failing:
+                raise RuntimeError("boom")
+            if story_id in self.cancelled:
+                raise asyncio.CancelledError()
+            return {"id": story_id, "content": {"component": f"type_{story_id}"}}
+        finally:
+            self.in_flight -= 1
+
+
+class FakeBulkStoryblok(FakeStoryblok):
+    """Stand-in that also supports get_stories_by_ids."""
+
+    def __init__(self, bulk_error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.bulk_error = bulk_error
+        self.bulk_calls = 0
+
+    async def get_stories_by_ids(self, story_ids, timeout=None):
+        self.bulk_calls += 1
+        self.bulk_timeout = timeout
+        if self.bulk_error:
+            raise self.bulk_error
+        return {
+            story_id: {"id": story_id, "content": {"component": f"type_{story_id}"}}
+            for story_id in story_ids if story_id != 2
+        }
+
+
+class TestHydrateStories:
+    """Test hydrate_stories ordering, concurrency and failure handling."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_and_sets_content_type(self):
+        """Slow early stories don't reorder results."""
+        stories = make_stories(5)
+        client = FakeStoryblok(delays={1: 0.05, 2: 0.0})
+
+        report = await hydrate_stories(client, stories, concurrency=5, timeout=5, bulk=False)
+
+        assert [s.story_id for s in stories] == [1, 2, 3, 4, 5]
+        assert [s.content_type for s in stories] == [f"type_{i}" for i in range(1, 6)]
+        assert report["hydrated"] == 5
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_limit(self):
+        """No more than `concurrency` fetches run at once."""
+        client = FakeStoryblok()
+
+        await hydrate_stories(client, make_stories(12), concurrency=3, timeout=5, bulk=False)
+
+        assert client.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_partial(self):
+        """A failing story stays without full details; others are hydrated."""
+        stories = make_stories(3)
+        client = FakeStoryblok(failing={2})
+
+        report = await hydrate_stories(client, stories, concurrency=3, timeout=5, bulk=False)
+
+        assert report["failed"] == 1
+        assert stories[1].full_story is None
+        assert stories[0].full_story and stories[2].full_story
+
+    @pytest.mark.asyncio
+    async def test_cancelled_fetch_is_a_partial_failure(self):
+        """A fetch cancelled from elsewhere doesn't fail the stage."""
+        stories = make_stories(3)
+        client = FakeStoryblok(cancelled={2})
+
+        report = await hydrate_stories(client, stories, concurrency=3, timeout=5, bulk=False)
+
+        assert report["failed"] == 1
+        assert stories[1].full_story is None
+        assert stories[0].full_story and stories[2].full_story
+
+    @pytest.mark.asyncio
+    async def test_time_budget_cancels_slow_fetches(self):
+        """Stories still pending when the budget runs out are left partial."""
+        stories = make_stories(3)
+        client = FakeStoryblok(delays={3: 5})
+
+        report = await hydrate_stories(client, stories, concurrency=3, timeout=0.2, bulk=False)
+
+        assert report["timed_out"] == 1
+        assert stories[2].full_story is None
+        assert client.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_hydration_sets_content_type(self):
+        """Bulk results hydrate in one call; missing IDs stay partial."""
+        stories = make_stories(3)
+        client = FakeBulkStoryblok()
+
+        report = await hydrate_stories(client, stories, timeout=5, bulk=True)
+
+        assert client.bulk_calls == 1
+        assert client.bulk_timeout == 5
+        assert client.max_in_flight == 0
+        assert report["hydrated"] == 2
+        assert report["timed_out"] == 0
+        assert stories[0].content_type == "type_1"
+        assert stories[1].full_story is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_failure_falls_back_to_per_story(self):
+        """If the bulk listing fails, stories are fetched one by one."""
+        stories = make_stories(3)
+        client = FakeBulkStoryblok(bulk_error=RuntimeError("listing down"))
+
+        report = await hydrate_stories(client, stories, concurrency=3, timeout=5, bulk=True)
+
+        assert report["hydrated"] == 3
+        assert client.max_in_flight > 0
+
+
+class FakePagedStoryblok(FakeStoryblok):
+    """Stand-in that yields search results in pages."""
+
+    async def search_pages(self, term, page_size=None, max_results=None):
+        stories = make_stories(max_results)
+        for start in range(0, len(stories), page_size):
+            await asyncio.sleep(0.01)
+            yield stories[start:start + page_size]
+
+
+class TestSearchAndHydrate:
+    """Test the paged search + hydration pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_hydrates_every_page_in_order(self):
+        """All pages are collected in order and hydrated."""
+        client = FakePagedStoryblok()
+
+        results = await search_and_hydrate(client, "drupal", limit=7, page_size=3)
+
+        assert results.total == 7
+        assert [s.story_id for s in results.stories] == list(range(1, 8))
+        assert all(s.full_story for s in results.stories)
@@ -0,0 +1,106 @@
+"""
+Unit tests for the local intent fast path.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.intent import IntentFastPath, resolve_intent
+from backend.metrics import get_metrics
+
+STORED = [
+    {"name": f"Story {i}", "body": "drupal" if i % 2 else "react", "slug": f"story-{i}", "cursor": i, "story_id": i}
+    for i in range(20)
+]
+ANALYSIS = {"description": "Analyzed drupal", "count": 20}
+
+
+def resolve(message, cursor=0, analysis=ANALYSIS, results=STORED):
+    resolved = resolve_intent(message, results, analysis, cursor=cursor)
+    if resolved is None:
+        return None
+    return resolved["action"], resolved.get("limit"), resolved.get("offset"), resolved.get("filter_term")
+
+
+class TestResolveIntent:
+    """Test the deterministic rules."""
+
+    def test_confirmations_and_limits(self):
+        assert resolve("yes please") == ("list_analyzed", 10, 0, None)
+        assert resolve("Show them!") == ("list_analyzed", 10, 0, None)
+        assert resolve("just show 3") == ("list_analyzed", 3, 0, None)
+        assert resolve("yes, but limit to 5") == ("list_analyzed", 5, 0, None)
+        assert resolve("show me the first five") == ("list_analyzed", 5, 0, None)
+
+    def test_paging_and_ordinals(self):
+        assert resolve("the next five", cursor=5) == ("list_analyzed", 5, 5, None)
+        assert resolve("show more", cursor=10) == ("list_analyzed", 10, 10, None)
+        assert resolve("the second one") == ("list_analyzed", 1, 1, None)
+        assert resolve("the last one") == ("list_analyzed", 1, 19, None)
+
+    def test_filters(self):
+        assert resolve("out of those, only drupal") == ("refine", None, None, "drupal")
+        assert resolve("from these, show me only the ones about AI") == ("refine", None, None, "AI")
+        assert resolve("only the react ones") == ("refine", None, None, "react")
+
+    def test_unsure_turns_fall_through(self):
+        assert resolve("find articles about drupal") is None
+        assert resolve("how many blog posts mention react?") is None
+        assert resolve("out of those, which one is the best?") is None
+        assert resolve("yes but only the recent marketing case studies from last year") is None
+        assert resolve("the next five", cursor=20) is None
+        assert resolve("yes please", results=[]) is None
+        # A bare confirmation before anything was analyzed or listed is ambiguous
+        assert resolve("yes please", analysis=None) is None
+
+    def test_acknowledgements_are_not_confirmations(self):
+        assert resolve("ok thanks") is None
+        assert resolve("okay") is None
+        # Once the analyzed results were listed, no offer is pending any more
+        assert resolve("yes please", cursor=10) is None
+        assert resolve("sure", cursor=10) is None
+        assert resolve("ok, show me 3") == ("list_analyzed", 3, 0, None)
+
+    def test_fast_path_records_hit_rate(self):
+        get_metrics().reset()
+        fast_path = IntentFastPath()
+        assert fast_path.resolve("just show 3", STORED, ANALYSIS) is not None
+        assert fast_path.resolve("find drupal", STORED, ANALYSIS) is None
+
+        assert get_metrics().counter("intent.local_hits") == 1
+        assert get_metrics().counter("intent.fallthrough") == 1
+        assert get_metrics().snapshot()["gauges"]["intent.hit_rate"] == 0.5
+
+
+class TestConversationFastPath:
+    """Test that resolved turns skip Bedrock."""
+
+    @pytest.mark.asyncio
+    @patch('backend.main.get_bedrock_client')
+    @patch('backend.main.get_storyblok_client')
+    async def test_follow_ups_skip_bedrock(self, mock_storyblok, mock_bedrock):
+        bedrock_mock = MagicMock()
+        mock_bedrock.return_value = bedrock_mock
+        mock_storyblok.return_value = MagicMock()
+
+        history = [
+            {"role": "user", "content": "how many stories mention drupal?"},
+            {"role": "assistant", "content": "I found 20 stories that mention drupal."},
+        ]
+        session_key = main._load_session(main.ConversationRequest(message="x", conversation_history=history))[1]
+        main.conversation_contexts[session_key] = list(STORED)
+        main.conversation_analyses[session_key] = dict(ANALYSIS)
+        main.conversation_cursors.pop(session_key, None)
+        client = TestClient(main.app)
+
+        first = client.post("/api/conversation", json={"message": "just show 3", "conversation_history": history})
+        following = client.post("/api/conversation", json={"message": "the next two", "conversation_history": history})
+
+        assert first.status_code == following.status_code == 200
+        assert [s["story_id"] for s in first.json()["results"]["stories"]] == [0, 1, 2]
+        assert [s["story_id"] for s in following.json()["results"]["stories"]] == [3, 4]
+        bedrock_mock.aconverse.assert_not_called()
+        bedrock_mock.aconverse_stream.assert_not_called()
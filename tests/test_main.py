@@ -3,6 +3,9 @@ Unit tests for the main FastAPI application.
 Tests core functionality and API endpoints.
 """
 
+import asyncio
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch, MagicMock
@@ -11,6 +14,19 @@ from backend.main import app
 from backend.models import SearchResults, StoryResult
 
 
+def make_bedrock_mock(claude_response):
+    """Bedrock client mock answering both the plain and the streamed API."""
+    async def stream(**kwargs):
+        if claude_response.get("response"):
+            yield ("text", claude_response["response"])
+        yield ("final", claude_response)
+
+    bedrock_mock = MagicMock()
+    bedrock_mock.aconverse = AsyncMock(return_value=claude_response)
+    bedrock_mock.aconverse_stream = MagicMock(side_effect=stream)
+    return bedrock_mock
+
+
 @pytest.fixture
 def client():
     """Create a test client for the FastAPI app."""
@@ -81,13 +97,12 @@ class TestConversationEndpoint:
     async def test_conversation_with_search(self, mock_storyblok, mock_bedrock, client, mock_bedrock_response, mock_storyblok_results):
         """Test conversation endpoint with search action."""
         # Setup mocks
-        bedrock_mock = MagicMock()
-        bedrock_mock.converse = MagicMock(return_value=mock_bedrock_response)  # Synchronous now
-        mock_bedrock.return_value = bedrock_mock
+        mock_bedrock.return_value = make_bedrock_mock(mock_bedrock_response)
         
         storyblok_mock = MagicMock()
         storyblok_mock.search = AsyncMock(return_value=mock_storyblok_results)
         storyblok_mock.get_story_by_id = AsyncMock(return_value=None)  # Mock full story fetching
+        storyblok_mock.get_stories_by_ids = AsyncMock(return_value={})  # Mock bulk story fetching
         mock_storyblok.return_value = storyblok_mock
         
         # Make request
@@ -140,9 +155,7 @@ class TestConversationEndpoint:
             "raw_response": "Hello! How can I help you search for content today?"
         }
         
-        bedrock_mock = MagicMock()
-        bedrock_mock.converse = MagicMock(return_value=chat_response)  # Synchronous now
-        mock_bedrock.return_value = bedrock_mock
+        mock_bedrock.return_value = make_bedrock_mock(chat_response)
         
         # Make request
         response = client.post(
@@ -159,6 +172,145 @@ class TestConversationEndpoint:
         assert data["results"] is None  # No search results for chat
 
 
+def parse_sse(body: str):
+    """Split a text/event-stream body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestConversationStream:
+    """Test the server-sent events conversation endpoint."""
+
+    @pytest.mark.asyncio
+    @patch('backend.main.get_bedrock_client')
+    @patch('backend.main.get_storyblok_client')
+    async def test_stream_emits_text_action_then_results(self, mock_storyblok, mock_bedrock, client, mock_bedrock_response, mock_storyblok_results):
+        """Text and sentences come first, then the action, then the results."""
+        async def fake_stream(**kwargs):
+            yield ("text", "I found some marketing ")
+            yield ("text", "articles for you. Have a look")
+            yield ("final", mock_bedrock_response)
+
+        bedrock_mock = MagicMock()
+        bedrock_mock.aconverse_stream = fake_stream
+        mock_bedrock.return_value = bedrock_mock
+
+        storyblok_mock = MagicMock()
+        storyblok_mock.search = AsyncMock(return_value=mock_storyblok_results)
+        storyblok_mock.get_stories_by_ids = AsyncMock(return_value={})
+        mock_storyblok.return_value = storyblok_mock
+
+        response = client.post(
+            "/api/conversation/stream",
+            json={"message": "Find marketing articles", "conversation_history": []}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        names = [name for name, _ in events]
+        assert names == ["text", "text", "sentence", "sentence", "action", "results", "done"]
+        assert events[2][1] == {"text": "I found some marketing articles for you."}
+        assert events[3][1] == {"text": "Have a look"}
+        assert events[4][1]["action"] == "search"
+        assert "raw_response" not in events[4][1]
+        assert len(events[5][1]["results"]["stories"]) == 2
+
+    @pytest.mark.asyncio
+    @patch('backend.main.get_bedrock_client')
+    @patch('backend.main.get_storyblok_client')
+    async def test_search_starts_while_response_is_generating(self, mock_storyblok, mock_bedrock, client, mock_storyblok_results):
+        """The Storyblok search is dispatched before the model finishes."""
+        searched_before_final = []
+
+        storyblok_mock = MagicMock()
+        storyblok_mock.search = AsyncMock(return_value=mock_storyblok_results)
+        storyblok_mock.get_stories_by_ids = AsyncMock(return_value={})
+        mock_storyblok.return_value = storyblok_mock
+
+        async def fake_stream(**kwargs):
+            yield ("field", ("action", "search"))
+            yield ("field", ("term", "marketing"))
+            yield ("field", ("limit", 2))
+            yield ("text", "Here are the marketing stories.")
+            await asyncio.sleep(0.01)
+            searched_before_final.append(storyblok_mock.search.await_count)
+            yield ("final", {"action": "search", "term": "marketing", "limit": 2,
+                             "response": "Here are the marketing stories."})
+
+        bedrock_mock = MagicMock()
+        bedrock_mock.aconverse_stream = fake_stream
+        mock_bedrock.return_value = bedrock_mock
+
+        response = client.post(
+            "/api/conversation",
+            json={"message": "Find two marketing stories", "conversation_history": []}
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["results"]["stories"]) == 2
+        assert searched_before_final == [1]
+        assert storyblok_mock.search.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch('backend.main.get_bedrock_client')
+    @patch('backend.main.get_storyblok_client')
+    async def test_escalated_turn_drops_the_first_search(self, mock_storyblok, mock_bedrock, client, mock_storyblok_results):
+        """A search started from the small model's answer isn't used after escalation."""
+        storyblok_mock = MagicMock()
+        storyblok_mock.search = AsyncMock(return_value=mock_storyblok_results)
+        storyblok_mock.get_stories_by_ids = AsyncMock(return_value={})
+        mock_storyblok.return_value = storyblok_mock
+
+        async def fake_stream(**kwargs):
+            yield ("field", ("action", "search"))
+            yield ("field", ("term", "x"))
+            yield ("field", ("limit", 2))
+            yield ("restart", "larger-model")
+            yield ("field", ("action", "search"))
+            yield ("field", ("term", "marketing"))
+            yield ("field", ("limit", 2))
+            yield ("text", "Here are the marketing stories.")
+            yield ("final", {"action": "search", "term": "marketing", "limit": 2,
+                             "response": "Here are the marketing stories."})
+
+        bedrock_mock = MagicMock()
+        bedrock_mock.aconverse_stream = fake_stream
+        mock_bedrock.return_value = bedrock_mock
+
+        response = client.post(
+            "/api/conversation",
+            json={"message": "Find two marketing stories", "conversation_history": []}
+        )
+
+        assert response.status_code == 200
+        assert [call.kwargs["term"] for call in storyblok_mock.search.await_args_list][-1] == "marketing"
+        assert all(call.kwargs["term"] != "x" for call in storyblok_mock.search.await_args_list[1:])
+
+    @patch('backend.main.get_bedrock_client')
+    def test_stream_reports_errors_as_events(self, mock_bedrock, client):
+        """A Bedrock failure ends the stream with an error event."""
+        async def failing_stream(**kwargs):
+            raise Exception("Request throttled. Please try again in a moment.")
+            yield  # pragma: no cover
+
+        bedrock_mock = MagicMock()
+        bedrock_mock.aconverse_stream = failing_stream
+        mock_bedrock.return_value = bedrock_mock
+
+        response = client.post(
+            "/api/conversation/stream",
+            json={"message": "Hello", "conversation_history": []}
+        )
+
+        events = parse_sse(response.text)
+        assert events[-1][0] == "error"
+        assert "throttled" in events[-1][1]["detail"]
+
+
 class TestConversationHistory:
     """Test conversation history handling."""
     
@@ -166,8 +318,7 @@ class TestConversationHistory:
     @patch('backend.main.get_bedrock_client')
     async def test_conversation_with_history(self, mock_bedrock, client):
         """Test that conversation history is passed correctly."""
-        bedrock_mock = MagicMock()
-        bedrock_mock.converse = MagicMock(return_value={  # Synchronous now
+        bedrock_mock = make_bedrock_mock({
             "action": "chat",
             "response": "Sure, I can help with that."
         })
@@ -188,7 +339,29 @@ class TestConversationHistory:
         
         assert response.status_code == 200
         # Verify bedrock client was called
-        bedrock_mock.converse.assert_called_once()
+        bedrock_mock.aconverse_stream.assert_called_once()
+        assert bedrock_mock.aconverse_stream.call_args.kwargs["conversation_history"][0].content == "Hello"
+
+    @pytest.mark.asyncio
+    @patch('backend.main.get_bedrock_client')
+    async def test_history_is_capped(self, mock_bedrock, client):
+        """Only the newest max_accepted_history messages are read."""
+        bedrock_mock = make_bedrock_mock({"action": "chat", "response": "Sure."})
+        mock_bedrock.return_value = bedrock_mock
+
+        history = [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"}
+            for i in range(250)
+        ]
+        response = client.post(
+            "/api/conversation",
+            json={"message": "Find articles", "conversation_history": history}
+        )
+
+        assert response.status_code == 200
+        sent = bedrock_mock.aconverse_stream.call_args.kwargs["conversation_history"]
+        assert len(sent) == 200
+        assert sent[-1].content == "message 249"
 
 
 class TestCORS:
@@ -0,0 +1,193 @@
+"""
+Unit tests for per-task Bedrock model routing.
+Uses the mocked Bedrock transport from test_bedrock_client.
+"""
+
+import json
+
+import httpx
+import pytest
+
+import backend.model_router as model_router_module
+from backend.config import get_settings
+from backend.metrics import get_metrics
+from backend.model_router import TASK_ESCALATION, TASK_MAPPER, TASK_PLANNER, ModelRouter, model_label
+from tests.test_bedrock_client import converse_body, make_client, stream_body, tool_use_body
+
+HAIKU = "anthropic.claude-3-haiku-20240307-v1:0"
+SONNET = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+
+
+def model_of(request: httpx.Request) -> str:
+    """Model ID from a Converse request URL."""
+    return request.url.path.split("/")[2]
+
+
+@pytest.fixture(autouse=True)
+def haiku_planner(monkeypatch):
+    """Route planner and mapper turns to Haiku (they default to bedrock_model_id)."""
+    settings = get_settings().model_copy(update={
+        "bedrock_planner_model_id": HAIKU,
+        "bedrock_mapper_model_id": HAIKU,
+    })
+    monkeypatch.setattr(model_router_module, "get_settings", lambda: settings)
+
+
+class TestModelRouter:
+    """Test model selection, latency fallback and unavailable models."""
+
+    def test_tasks_use_configured_models(self):
+        router = ModelRouter()
+        assert router.model_for(TASK_PLANNER) == HAIKU
+        assert router.model_for(TASK_MAPPER) == HAIKU
+        # An unset escalation model falls back to bedrock_model_id
+        assert router.model_for(TASK_ESCALATION) == SONNET
+        assert router.escalation_model(HAIKU) == SONNET
+        assert router.escalation_model(SONNET) is None
+        assert model_label(HAIKU) == "claude-3-haiku"
+
+    def test_slow_model_is_bypassed_while_fallback_is_faster(self):
+        get_metrics().reset()
+        router = ModelRouter()
+        router.latency_budget = 2.0
+        router.record(HAIKU, 6.0)
+        router.record(SONNET, 1.5)
+
+        assert router.model_for(TASK_PLANNER) == SONNET
+        assert get_metrics().counter("bedrock.routing.latency_fallbacks") == 1
+        # The bypassed model's average decays, so it is tried again eventually
+        for _ in range(30):
+            router.model_for(TASK_PLANNER)
+        assert router.model_for(TASK_PLANNER) == HAIKU
+
+    def test_per_model_latency_is_observed(self):
+        get_metrics().reset()
+        router = ModelRouter()
+        router.record(HAIKU, 0.4)
+        router.record(HAIKU, 0.8, error=True)
+
+        observations = get_metrics().snapshot()["observations"]
+        assert observations["bedrock.model.claude-3-haiku.latency"]["count"] == 2
+        assert get_metrics().counter("bedrock.model.claude-3-haiku.errors") == 1
+        assert router.latency[HAIKU] == 0.4
+
+    def test_unset_models_use_the_default_model(self, monkeypatch):
+        monkeypatch.setattr(model_router_module, "get_settings", get_settings)
+        router = ModelRouter()
+        assert router.model_for(TASK_PLANNER) == SONNET
+        assert router.model_for(TASK_MAPPER) == SONNET
+        assert router.escalation_model(SONNET) is None
+
+    def test_default_model_is_never_marked_unavailable(self):
+        router = ModelRouter()
+        assert router.mark_unavailable(SONNET) is False
+        assert router.mark_unavailable(HAIKU) is True
+        assert router.model_for(TASK_PLANNER) == SONNET
+
+
+class TestEscalation:
+    """Test that only unusable planner decisions reach the larger model."""
+
+    @pytest.mark.asyncio
+    async def test_confident_decision_stays_on_planner_model(self):
+        models = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            models.append(model_of(request))
+            return httpx.Response(200, json=tool_use_body(
+                {"action": "search", "confidence": 0.9, "term": "drupal", "response": "Searching."}
+            ))
+
+        client = make_client(handler)
+        client.planner_cache = None
+        result = await client.aconverse(message="find drupal", conversation_history=[])
+
+        assert models == [HAIKU]
+        assert result["term"] == "drupal" and result["confidence"] == 0.9
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_escalates(self):
+        get_metrics().reset()
+        models = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            models.append(model_of(request))
+            confidence = 0.2 if model_of(request) == HAIKU else 0.8
+            return httpx.Response(200, json=tool_use_body(
+                {"action": "search", "confidence": confidence, "term": "cms", "response": "Searching."}
+            ))
+
+        client = make_client(handler)
+        client.planner_cache = None
+        result = await client.aconverse(message="that cms thing", conversation_history=[])
+
+        assert models == [HAIKU, SONNET]
+        assert result["confidence"] == 0.8
+        assert get_metrics().counter("bedrock.routing.escalations") == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_search_without_term_escalates(self):
+        replies = {
+            HAIKU: '{"action": "search", "response": "Searching."}',
+            SONNET: '{"action": "search", "term": "drupal", "response": "Searching."}',
+        }
+        client = make_client(lambda request: httpx.Response(200, json=converse_body(replies[model_of(request)])))
+        client.planner_cache = None
+        result = await client.aconverse(message="find it", conversation_history=[])
+
+        assert result["term"] == "drupal"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_escalates_before_any_text(self):
+        """An unusable streamed decision is dropped before its text reaches the user."""
+        models = []
+        replies = {
+            HAIKU: '{"action": "search", "confidence": 0.1, "term": "x", "response": "Maybe this?"}',
+            SONNET: '{"action": "chat", "confidence": 0.9, "response": "Which topic do you mean?"}',
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            models.append(model_of(request))
+            return httpx.Response(200, content=stream_body(replies[model_of(request)]))
+
+        client = make_client(handler)
+        client.planner_cache = None
+        events = [event async for event in client.aconverse_stream(message="hmm", conversation_history=[])]
+
+        assert models == [HAIKU, SONNET]
+        assert ("restart", SONNET) in events
+        assert "".join(value for kind, value in events if kind == "text") == "Which topic do you mean?"
+        assert events[-1][1]["action"] == "chat"
+        await client.aclose()
+
+
+class TestUnavailableModel:
+    """Test falling back when a routed model isn't enabled in the account."""
+
+    @pytest.mark.asyncio
+    async def test_missing_model_falls_back_to_default(self):
+        models = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            models.append(model_of(request))
+            if model_of(request) == HAIKU:
+                return httpx.Response(
+                    403,
+                    headers={"x-amzn-ErrorType": "AccessDeniedException"},
+                    json={"message": "You don't have access to the model with the specified model ID."}
+                )
+            body = json.loads(request.content)
+            assert body["system"][-1] == {"cachePoint": {"type": "default"}}
+            return httpx.Response(200, json=converse_body('{"action": "chat", "response": "ok"}'))
+
+        client = make_client(handler)
+        client.planner_cache = None
+        await client.aconverse(message="one", conversation_history=[])
+        await client.aconverse(message="two", conversation_history=[])
+
+        assert models == [HAIKU, SONNET, SONNET]
+        assert client.router.model_for(TASK_PLANNER) == SONNET
+        await client.aclose()
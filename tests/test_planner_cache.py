@@ -0,0 +1,95 @@
+"""
+Unit tests for the planner response cache.
+"""
+
+import httpx
+import pytest
+
+from backend.models import Message
+from backend.planner_cache import PlannerCache, context_digest
+from tests.test_bedrock_client import converse_body, make_client, stream_body
+
+DECISION = {"action": "analyze", "term": "drupal", "content_type": "article", "response": "Let me check..."}
+
+
+class TestPlannerCache:
+    """Test exact and near-duplicate lookups."""
+
+    def test_exact_match_ignores_case_and_punctuation(self):
+        cache = PlannerCache(near_duplicates=False)
+        digest = context_digest([])
+        cache.set("How many articles mention Drupal?", digest, DECISION)
+
+        hit = cache.get("how many articles mention drupal", digest)
+        assert hit["term"] == "drupal" and hit["source"] == "cache"
+        assert cache.get("how many articles mention drupal please", digest) is None
+
+    def test_context_is_part_of_the_key(self):
+        cache = PlannerCache()
+        cache.set("yes please", context_digest([]), DECISION)
+        history = [Message(role="user", content="hi"), Message(role="assistant", content="Hello!")]
+
+        assert cache.get("yes please", context_digest(history)) is None
+        assert cache.get("yes please", context_digest([], previous_results=[{"story_id": 1}])) is None
+        assert context_digest([], extra=["page"]) != context_digest([], extra=["blog_post"])
+
+    def test_near_duplicates_above_threshold(self):
+        cache = PlannerCache(near_duplicates=True, similarity_threshold=0.9)
+        digest = context_digest([])
+        cache.set("how many articles mention drupal", digest, DECISION)
+        cache.set("show me the first 5 marketing stories", digest, {"action": "search", "limit": 5})
+        cache.set("find blog posts about react", digest, {"action": "search", "term": "react"})
+
+        assert cache.get("How many articles do mention Drupal, please?", digest)["term"] == "drupal"
+        assert cache.get("how many articles mention wordpress", digest) is None
+        assert cache.get("show me the first 10 marketing stories", digest) is None
+        assert cache.get("how many articles mention drupal", context_digest([], extra=["x"])) is None
+        assert cache.cache.metrics.counter("cache.planner.near_hits") >= 1
+
+    def test_errors_are_not_cached(self):
+        cache = PlannerCache()
+        cache.set("hi", "d", {"action": "error", "response": "Sorry"})
+        assert cache.get("hi", "d") is None
+
+
+class TestBedrockClientPlannerCache:
+    """Test that cache hits skip Bedrock."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_skips_bedrock(self):
+        calls = []
+        reply = '{"action": "analyze", "term": "drupal", "response": "Let me check..."}'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json=converse_body(reply))
+
+        client = make_client(handler)
+        first = await client.aconverse(message="How many articles mention drupal?", conversation_history=[])
+        second = await client.aconverse(message="how many articles mention Drupal", conversation_history=[])
+        streamed = [event async for event in client.aconverse_stream(
+            message="how many articles mention drupal?", conversation_history=[]
+        )]
+
+        assert len(calls) == 1
+        assert second["term"] == first["term"] == "drupal"
+        assert streamed == [("text", "Let me check..."), ("final", second)]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streamed_decisions_are_cached(self):
+        calls = []
+        reply = '{"action": "chat", "response": "Hi there!"}'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(200, content=stream_body(reply))
+
+        client = make_client(handler)
+        async for _ in client.aconverse_stream(message="hello", conversation_history=[]):
+            pass
+        result = await client.aconverse(message="Hello!", conversation_history=[])
+
+        assert len(calls) == 1
+        assert result["response"] == "Hi there!"
+        await client.aclose()
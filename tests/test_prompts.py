@@ -0,0 +1,68 @@
+"""
+Unit tests for planner prompt assembly.
+Uses the mocked Bedrock transport from test_bedrock_client.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from backend.prompts import ALL_EXAMPLES, assemble_prompt, select_examples
+from tests.test_bedrock_client import converse_body, make_client
+
+
+class TestSelectExamples:
+    """Test picking example blocks from local cues."""
+
+    def test_message_cues(self):
+        assert select_examples("find articles mentioning Drupal") == ("search",)
+        assert select_examples("how many articles mention react?") == ("analyze",)
+        assert select_examples("find stories about marketing") == ("search", "clarify")
+        assert select_examples("hello there") == ("search",)
+
+    def test_session_cues(self):
+        # Follow-up examples only when there is something to follow up on
+        assert select_examples("out of those, only the ones about AI") == ("search",)
+        assert select_examples("out of those, only the ones about AI", has_results=True) == ("refine",)
+        assert select_examples("yes, show me the first 5", has_results=True, has_analysis=True) == ("list_analyzed",)
+
+    def test_assembled_prompt_keeps_core_and_drops_other_examples(self):
+        full = assemble_prompt("FORMAT", "TYPES")
+        search_only = assemble_prompt("FORMAT", "TYPES", ("search",))
+
+        assert "Refine examples" in full and "Refine examples" not in search_only
+        assert '"find all marketing stories"' in search_only
+        # Every action stays defined in the core
+        assert '### 4. REFINE/FILTER PREVIOUS RESULTS (action: "refine")' in search_only
+        assert len(search_only) < len(full)
+        assert set(ALL_EXAMPLES) == {"search", "analyze", "list_analyzed", "clarify", "refine"}
+
+
+class TestPromptVariants:
+    """Test that variants are cached and sent per turn."""
+
+    @pytest.mark.asyncio
+    async def test_each_variant_is_built_once_with_a_cache_point(self):
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json=converse_body('{"action": "chat", "confidence": 0.9, "response": "ok"}'))
+
+        client = make_client(handler)
+        client.planner_cache = None
+        await client.aconverse(message="find drupal", conversation_history=[])
+        await client.aconverse(message="how many posts mention react?", conversation_history=[])
+        await client.aconverse(message="find react", conversation_history=[])
+
+        assert bodies[0]["system"] == bodies[2]["system"]
+        assert bodies[0]["system"] != bodies[1]["system"]
+        assert all(body["system"][-1] == {"cachePoint": {"type": "default"}} for body in bodies)
+        assert "Analyze examples" in bodies[1]["system"][0]["text"]
+        assert "Analyze examples" not in bodies[0]["system"][0]["text"]
+        assert client._system_blocks_for(("search",)) is client._system_blocks_for(("search",))
+
+        client.set_content_types(["blog_post"])
+        assert client._system_variants == {}
+        await client.aclose()
@@ -0,0 +1,84 @@
+"""
+Unit tests for speculative searches on the user's own key phrase.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.early_dispatch import EarlyDispatcher
+from backend.metrics import get_metrics
+from backend.speculation import extract_search_phrase
+from tests.test_early_dispatch import make_storyblok_mock
+
+
+class TestExtractSearchPhrase:
+    """Test which messages yield a key phrase."""
+
+    def test_plain_search_requests(self):
+        assert extract_search_phrase("Find drupal stories") == ("drupal", None)
+        assert extract_search_phrase("Can you show me 5 articles about headless CMS?") == ("headless cms", 5)
+        assert extract_search_phrase("find the first three blog posts about react please") == ("react", 3)
+        assert extract_search_phrase("What stories do we have about AI?") == ("ai", None)
+        assert extract_search_phrase("are there any articles on sustainability") == ("sustainability", None)
+
+    def test_follow_ups_and_chat_are_skipped(self):
+        for message in ("show me those", "show me more", "show me the next five", "hello", "list all case studies"):
+            assert extract_search_phrase(message) is None
+        assert extract_search_phrase("find " + "very " * 6 + "long") is None
+
+
+class TestSpeculativeDispatch:
+    """Test starting, keeping and discarding the speculative search."""
+
+    @pytest.mark.asyncio
+    async def test_matching_planner_term_reuses_speculation(self):
+        get_metrics().reset()
+        storyblok_mock = make_storyblok_mock(delay=0.01)
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=True, speculation_enabled=True)
+
+        dispatcher.speculate("find drupal stories")
+        assert dispatcher.task is not None
+        for name, value in (("action", "search"), ("term", "Drupal"), ("limit", 10)):
+            dispatcher.on_field(name, value)
+        results = await dispatcher.results("search", "Drupal", 10)
+
+        assert results.stories[0].name == "drupal story"
+        storyblok_mock.search.assert_awaited_once_with(term="drupal", limit=10)
+        assert get_metrics().counter("speculation.hits") == 1
+        assert get_metrics().snapshot()["gauges"]["speculation.hit_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_different_planner_term_cancels_speculation(self):
+        get_metrics().reset()
+        storyblok_mock = make_storyblok_mock(delay=1.0)
+        dispatcher = EarlyDispatcher(storyblok_mock, enabled=True, speculation_enabled=True)
+
+        dispatcher.speculate("find drupal stories")
+        speculative_task = dispatcher.task
+        for name, value in (("action", "search"), ("term", "drupal commerce"), ("limit", 10)):
+            dispatcher.on_field(name, value)
+        await asyncio.sleep(0)
+
+        assert speculative_task.cancelled()
+        assert dispatcher.key == ("search", "drupal commerce", 10)
+        assert get_metrics().counter("speculation.misses") == 1
+        assert get_metrics().snapshot()["gauges"]["speculation.hit_rate"] == 0.0
+        dispatcher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_non_search_answer_discards_speculation(self):
+        get_metrics().reset()
+        dispatcher = EarlyDispatcher(make_storyblok_mock(delay=1.0), enabled=False, speculation_enabled=True)
+
+        dispatcher.speculate("search for omnichannel")
+        dispatcher.cancel()
+
+        assert dispatcher.task is None
+        assert get_metrics().counter("speculation.misses") == 1
+        assert get_metrics().counter("early_dispatch.discarded") == 0
+
+    def test_off_by_default(self):
+        dispatcher = EarlyDispatcher(make_storyblok_mock())
+        dispatcher.speculate("find drupal stories")
+        assert dispatcher.task is None
@@ -0,0 +1,435 @@
+"""
+Unit tests for the Storyblok client.
+Uses httpx.MockTransport so no network access is required.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.metrics import get_metrics
+from backend.storyblok_client import StoryblokClient, normalize_search_term
+
+
+def make_client(handler) -> StoryblokClient:
+    """Create a StoryblokClient whose shared HTTP client uses a mock transport."""
+    client = StoryblokClient()
+    client._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        headers=client._build_headers()
+    )
+    return client
+
+
+class TestSharedHttpClient:
+    """Test the pooled, long-lived HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_search_and_story_share_one_client(self):
+        """Search and story fetches go through the same AsyncClient instance."""
+        seen_auth = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_auth.append(request.headers.get("Authorization"))
+            if request.url.path.endswith("/vsearches"):
+                return httpx.Response(200, json=[
+                    {"body": "b", "cursor": 0, "name": "Story", "slug": "story", "story_id": 7}
+                ])
+            return httpx.Response(200, json={"story": {"id": 7, "content": {"component": "page"}}})
+
+        client = make_client(handler)
+        shared = client.http_client
+
+        results = await client.search("drupal", limit=1)
+        story = await client.get_story_by_id(7)
+
+        assert client.http_client is shared
+        assert results.total == 1
+        assert story["content"]["component"] == "page"
+        assert seen_auth == [client.token, client.token]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_requests_are_counted(self):
+        """Every request is recorded in the metrics registry."""
+        get_metrics().reset()
+        client = make_client(lambda request: httpx.Response(404))
+
+        assert await client.get_story_by_id(1) is None
+        assert get_metrics().counter("storyblok.http.requests") == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_reopens_lazily(self):
+        """Closing the client releases it and a new one is created on next use."""
+        client = make_client(lambda request: httpx.Response(404))
+        first = client.http_client
+
+        await client.aclose()
+
+        assert first.is_closed
+        assert client._http_client is None
+        second = client.http_client
+        assert second is not first
+        await client.aclose()
+
+
+class TestGetStoriesByIds:
+    """Test the bulk by_ids story listing."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_requests_by_page_size(self):
+        """IDs are de-duplicated and split into per_page sized chunks."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            ids = [int(i) for i in request.url.params["by_ids"].split(",")]
+            requested.append(ids)
+            assert request.url.params["per_page"] == str(len(ids))
+            return httpx.Response(200, json={"stories": [
+                {"id": i, "name": f"S{i}", "content": {"component": "page"}} for i in ids
+            ]})
+
+        client = make_client(handler)
+        client.settings = client.settings.model_copy(update={"storyblok_bulk_page_size": 2})
+
+        stories = await client.get_stories_by_ids([1, 2, 2, 3, 4, 5])
+
+        assert sorted(len(chunk) for chunk in requested) == [1, 2, 2]
+        assert sorted(stories) == [1, 2, 3, 4, 5]
+        assert stories[3]["name"] == "S3"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_listing_entries_without_content_are_fetched_in_full(self):
+        """Stories the listing returns without content are fetched one by one."""
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            if "by_ids" in request.url.params:
+                return httpx.Response(200, json={"stories": [
+                    {"id": 1, "name": "S1", "content": {"component": "page"}},
+                    {"id": 2, "name": "S2", "content_type": "article"},
+                    {"id": 3, "name": "S3", "content_type": "article"},
+                ]})
+            if request.url.path.endswith("/stories/3"):
+                return httpx.Response(500)
+            return httpx.Response(200, json={"story": {"id": 2, "name": "S2", "content": {"component": "article"}}})
+
+        client = make_client(handler)
+        stories = await client.get_stories_by_ids([1, 2, 3])
+
+        assert sorted(stories) == [1, 2]
+        assert stories[2]["content"]["component"] == "article"
+        assert sorted(path.rsplit("/", 1)[-1] for path in paths[1:]) == ["2", "3"]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_time_budget_keeps_stories_fetched_in_time(self):
+        """A slow full fetch is cancelled without dropping the ones that finished."""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if "by_ids" in request.url.params:
+                return httpx.Response(200, json={"stories": [
+                    {"id": i, "name": f"S{i}", "content_type": "page"} for i in (1, 2, 3)
+                ]})
+            story_id = int(request.url.path.rsplit("/", 1)[-1])
+            if story_id == 3:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"story": {"id": story_id, "content": {"component": "page"}}})
+
+        client = make_client(handler)
+        stories = await asyncio.wait_for(client.get_stories_by_ids([1, 2, 3], timeout=0.2), timeout=2)
+
+        assert sorted(stories) == [1, 2]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_empty_input_makes_no_request(self):
+        """No IDs means no request at all."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("unexpected request")
+
+        client = make_client(handler)
+        assert await client.get_stories_by_ids([]) == {}
+        await client.aclose()
+
+
+class TestStoryCache:
+    """Test story caching and conditional revalidation."""
+
+    @pytest.mark.asyncio
+    async def test_second_fetch_is_served_from_cache(self):
+        """A fresh cached story is returned without another request."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"story": {"id": 5, "content": {"component": "page"}}})
+
+        client = make_client(handler)
+
+        first = await client.get_story_by_id(5)
+        second = await client.get_story_by_id(5)
+
+        assert first == second
+        assert len(calls) == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stale_story_is_revalidated_with_etag(self):
+        """An expired entry sends If-None-Match and reuses the body on 304."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if request.headers.get("If-None-Match") == '"abc"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json={"story": {"id": 5, "content": {"component": "page"}}},
+                headers={"ETag": '"abc"'}
+            )
+
+        client = make_client(handler)
+        first = await client.get_story_by_id(5)
+        client.story_cache.get_entry(5).expires_at = 0
+
+        second = await client.get_story_by_id(5)
+
+        assert second == first
+        assert len(calls) == 2
+        assert 5 in client.story_cache
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_bulk_keeps_full_story_when_version_matches(self):
+        """A listing entry with the same updated_at doesn't replace cached content."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/stories/9"):
+                return httpx.Response(200, json={"story": {
+                    "id": 9, "updated_at": "2025-01-01", "content": {"component": "article"}
+                }})
+            return httpx.Response(200, json={"stories": [
+                {"id": 9, "updated_at": "2025-01-01", "content_type": "article"}
+            ]})
+
+        client = make_client(handler)
+        await client.get_story_by_id(9)
+        client.story_cache.get_entry(9).expires_at = 0
+
+        stories = await client.get_stories_by_ids([9])
+
+        assert stories[9]["content"]["component"] == "article"
+        await client.aclose()
+
+
+class TestSearchCache:
+    """Test the normalized search cache and single-flight de-duplication."""
+
+    @staticmethod
+    def search_handler(calls):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.params["term"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[
+                {"body": "b", "cursor": 0, "name": "Drupal", "slug": "drupal", "story_id": 1}
+            ])
+        return handler
+
+    def test_normalize_search_term(self):
+        """Case, whitespace and Unicode width are normalized."""
+        assert normalize_search_term("  Drupal   CMS ") == "drupal cms"
+        assert normalize_search_term("ＤＲＵＰＡＬ") == "drupal"
+
+    @pytest.mark.asyncio
+    async def test_equivalent_terms_hit_the_cache(self):
+        """A rephrased-by-case search is served from the cache."""
+        calls = []
+        client = make_client(self.search_handler(calls))
+
+        await client.search("Drupal", limit=10)
+        results = await client.search("  drupal ", limit=10)
+
+        assert calls == ["Drupal"]
+        assert results.stories[0].name == "Drupal"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_share_one_request(self):
+        """N concurrent identical searches make one upstream call."""
+        calls = []
+        client = make_client(self.search_handler(calls))
+
+        results = await asyncio.gather(*(client.search("drupal", limit=5) for _ in range(4)))
+
+        assert len(calls) == 1
+        assert all(r.total == 1 for r in results)
+        results[0].stories[0].name = "mutated"
+        assert results[1].stories[0].name == "Drupal"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_space(self):
+        """Invalidating the space forces the next search upstream."""
+        calls = []
+        client = make_client(self.search_handler(calls))
+
+        await client.search("drupal", limit=5)
+        assert client.invalidate_search_cache() == 1
+        await client.search("drupal", limit=5)
+
+        assert len(calls) == 2
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_search_is_not_lost(self):
+        """A search in flight when the space is invalidated doesn't refill the cache."""
+        calls = []
+        client = make_client(self.search_handler(calls))
+
+        in_flight = asyncio.create_task(client.search("drupal", limit=5))
+        await asyncio.sleep(0)
+        client.invalidate_search_cache()
+        await in_flight
+        await client.search("drupal", limit=5)
+
+        assert len(calls) == 2
+        await client.aclose()
+
+
+class TestStoryCoalescing:
+    """Test that concurrent fetches of one story share a request."""
+
+    @staticmethod
+    def story_handler(calls, status=200):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            await asyncio.sleep(0.02)
+            if status != 200:
+                return httpx.Response(status)
+            return httpx.Response(200, json={"story": {"id": 3, "content": {"component": "page"}}})
+        return handler
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cache_enabled", [True, False])
+    async def test_concurrent_fetches_make_one_request(self, cache_enabled):
+        """Works both with and without the story cache in front."""
+        calls = []
+        client = make_client(self.story_handler(calls))
+        if not cache_enabled:
+            client.story_cache = None
+
+        stories = await asyncio.gather(*(client.get_story_by_id(3) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(story["id"] == 3 for story in stories)
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """A failed fetch raises in every concurrent caller."""
+        calls = []
+        client = make_client(self.story_handler(calls, status=500))
+
+        results = await asyncio.gather(
+            *(client.get_story_by_id(3) for _ in range(3)), return_exceptions=True
+        )
+
+        assert len(calls) == 1
+        assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_no_entry(self):
+        """Cancelling the only waiter removes the in-flight entry."""
+        calls = []
+        client = make_client(self.story_handler(calls))
+
+        task = asyncio.create_task(client.get_story_by_id(3))
+        await asyncio.sleep(0.005)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert len(client._story_flights) == 0
+        await client.aclose()
+
+
+class TestSearchPages:
+    """Test paging through vsearch results."""
+
+    @staticmethod
+    def paged_handler(total, calls):
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            calls.append((offset, limit))
+            return httpx.Response(200, json=[
+                {"body": "", "cursor": i, "name": f"S{i}", "slug": f"s{i}", "story_id": i}
+                for i in range(offset, min(total, offset + limit))
+            ])
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_pages_until_exhausted(self):
+        """Pages advance by offset and stop on a short page."""
+        calls = []
+        client = make_client(self.paged_handler(7, calls))
+
+        pages = [page async for page in client.search_pages("x", page_size=3, max_results=50, concurrency=1)]
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [offset for offset, _ in calls] == [0, 3, 6]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pages_are_fetched_concurrently(self):
+        """Several pages are in flight at once and still yielded in order."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            offset = int(request.url.params["offset"])
+            # Later pages answer first
+            await asyncio.sleep(0.04 - offset / 1000)
+            in_flight -= 1
+            return httpx.Response(200, json=[
+                {"body": "", "cursor": i, "name": f"S{i}", "slug": f"s{i}", "story_id": i}
+                for i in range(offset, min(10, offset + int(request.url.params["limit"])))
+            ])
+
+        client = make_client(handler)
+        ids = [story.story_id async for story in client.search_iter("x", page_size=4, max_results=20)]
+
+        assert ids == list(range(10))
+        assert max_in_flight == 4
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_iter_respects_max_results(self):
+        """search_iter yields at most max_results stories in order."""
+        calls = []
+        client = make_client(self.paged_handler(100, calls))
+
+        ids = [story.story_id async for story in client.search_iter("x", page_size=4, max_results=10)]
+
+        assert ids == list(range(10))
+        assert calls[-1] == (8, 2)
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_max_results_is_capped_by_settings(self):
+        """An oversized limit is clamped to search_max_results."""
+        calls = []
+        client = make_client(self.paged_handler(1000, calls))
+        client.settings = client.settings.model_copy(update={"search_max_results": 5})
+
+        ids = [story.story_id async for story in client.search_iter("x", page_size=2, max_results=500)]
+
+        assert len(ids) == 5
+        await client.aclose()
@@ -0,0 +1,81 @@
+"""
+Unit tests for the streaming helpers (JSON field streaming, sentence splitting).
+"""
+
+import json
+
+from backend.streaming import JSONFieldStreamer, SentenceSplitter, sse_event
+
+
+def stream_in_chunks(text: str, size: int, field: str = "response") -> str:
+    """Feed text to a JSONFieldStreamer in fixed-size chunks and join the output."""
+    streamer = JSONFieldStreamer(field)
+    return "".join(streamer.feed(text[i:i + size]) for i in range(0, len(text), size))
+
+
+class TestJSONFieldStreamer:
+    """Test incremental extraction of one string field."""
+
+    def test_streams_response_field_across_chunk_boundaries(self):
+        """The field is decoded correctly whatever the chunking."""
+        payload = json.dumps({
+            "action": "search",
+            "term": "drupal \"cms\"",
+            "limit": 5,
+            "options": ["a", {"response": "nested"}],
+            "response": "Here are 5 stories.\nEnjoy \u00e9t\u00e9 \U0001F600 \\o/"
+        })
+        expected = json.loads(payload)["response"]
+        for size in (1, 2, 3, 7, len(payload)):
+            assert stream_in_chunks(payload, size) == expected
+
+    def test_ignores_text_around_the_object(self):
+        """Preamble and trailing text are not streamed."""
+        text = 'Sure! {"action": "chat", "response": "Hi there"} Anything else? "response"'
+        assert stream_in_chunks(text, 4) == "Hi there"
+
+    def test_field_arrives_before_other_keys(self):
+        """Text is available as soon as the field starts, wherever it is."""
+        streamer = JSONFieldStreamer("response")
+        assert streamer.feed('{"response": "Let me') == "Let me"
+        assert streamer.feed(' check", "action": "analyze"}') == " check"
+        assert streamer.done
+
+    def test_other_fields_complete_before_the_streamed_one(self):
+        """action/term/limit are reported as soon as each value ends."""
+        streamer = JSONFieldStreamer("response")
+        streamer.feed('{"action": "search", "term": "dru')
+        assert streamer.pop_completed() == ["action"]
+        streamer.feed('pal", "limit": 5, "options": ["a", "b"], "respo')
+        assert streamer.pop_completed() == ["term", "limit", "options"]
+        assert streamer.fields == {"action": "search", "term": "drupal", "limit": 5, "options": ["a", "b"]}
+        assert not streamer.field_started
+        assert streamer.feed('nse": "Here') == "Here"
+        assert streamer.field_started
+        streamer.feed('", "content_type": null}')
+        assert streamer.pop_completed() == ["content_type"]
+        assert streamer.fields["content_type"] is None
+
+    def test_plain_text_yields_nothing(self):
+        """Without JSON there is nothing to stream."""
+        assert stream_in_chunks("Hello, how can I help?", 3) == ""
+
+
+class TestSentenceSplitter:
+    """Test sentence segmentation of streamed text."""
+
+    def test_sentences_are_emitted_once_complete(self):
+        splitter = SentenceSplitter()
+        assert splitter.feed("Here are the") == []
+        assert splitter.feed(" stories. I found") == ["Here are the stories."]
+        assert splitter.feed(" three! Want more?") == ["I found three!"]
+        assert splitter.flush() == "Want more?"
+        assert splitter.flush() is None
+
+    def test_blank_line_ends_a_sentence(self):
+        splitter = SentenceSplitter()
+        assert splitter.feed("Results\n\nFirst one") == ["Results"]
+
+
+def test_sse_event_format():
+    assert sse_event("text", {"delta": "Hi"}) == 'event: text\ndata: {"delta": "Hi"}\n\n'
@@ -0,0 +1,157 @@
+"""
+Unit tests for Storyblok webhook verification and batched invalidation.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.main as main_module
+from backend.content_index import ContentIndex
+from backend.main import app
+from backend.webhooks import InvalidationBatcher, verify_signature
+
+SECRET = "webhook-secret"
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    """Compute the signature Storyblok would send."""
+    return hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+
+
+class TestSignature:
+    """Test webhook signature verification."""
+
+    def test_valid_signature(self):
+        body = b'{"action": "published", "story_id": 1}'
+        assert verify_signature(body, sign(body), SECRET)
+
+    def test_invalid_or_missing_signature(self):
+        body = b'{"action": "published", "story_id": 1}'
+        assert not verify_signature(body, sign(body, "other"), SECRET)
+        assert not verify_signature(body, None, SECRET)
+        assert not verify_signature(body, sign(body), "")
+
+
+class TestWebhookEndpoint:
+    """Test POST /api/webhooks/storyblok."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(
+            main_module, "settings",
+            main_module.settings.model_copy(update={"storyblok_webhook_secret": SECRET})
+        )
+        return TestClient(app)
+
+    def test_rejects_bad_signature(self, client):
+        response = client.post(
+            "/api/webhooks/storyblok",
+            content=b'{"action": "published", "story_id": 1}',
+            headers={"webhook-signature": "nope"}
+        )
+        assert response.status_code == 401
+
+    @patch("backend.main.get_invalidation_batcher")
+    def test_accepts_and_queues_story_event(self, mock_batcher, client):
+        batcher = MagicMock()
+        batcher.enqueue.return_value = 1
+        mock_batcher.return_value = batcher
+        body = json.dumps({
+            "action": "published",
+            "story_id": 42,
+            "space_id": int(main_module.settings.storyblok_space_id)
+        }).encode()
+
+        response = client.post(
+            "/api/webhooks/storyblok", content=body, headers={"webhook-signature": sign(body)}
+        )
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+        batcher.enqueue.assert_called_once_with(42, "published", int(main_module.settings.storyblok_space_id))
+
+
+class FakeStoryblok:
+    """Records invalidations and serves refreshed stories."""
+
+    space_id = "1"
+
+    def __init__(self):
+        self.evicted = []
+        self.search_invalidations = []
+        self.fetched = []
+
+    def invalidate_story(self, story_id, version=None):
+        self.evicted.append(story_id)
+        return True
+
+    def invalidate_search_cache(self, space_id=None):
+        self.search_invalidations.append(space_id)
+        return 1
+
+    async def get_story_by_id(self, story_id):
+        self.fetched.append(story_id)
+        return {"id": story_id, "name": "Fresh", "content": {"component": "page", "text": "fresh text"}}
+
+
+class TestInvalidationBatcher:
+    """Test batching of webhook events."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_merged_into_one_batch(self):
+        """Repeated events for a story are applied once; the search cache is flushed once."""
+        storyblok = FakeStoryblok()
+        index = ContentIndex(":memory:")
+        index.set_state("last_sync", "2025-01-01T00:00:00+00:00")
+        index.upsert_stories([{"id": 2, "name": "Old", "content": {"text": "old"}}])
+        batcher = InvalidationBatcher(storyblok_client=storyblok, index=index, window=60)
+
+        batcher.enqueue(1, "published")
+        batcher.enqueue(1, "published")
+        batcher.enqueue(2, "deleted")
+        summary = await batcher.aclose()
+
+        assert storyblok.search_invalidations == ["1"]
+        assert sorted(storyblok.evicted) == [1, 2]
+        assert storyblok.fetched == [1]
+        assert index.get_story(1)["name"] == "Fresh"
+        assert index.get_story(2) is None
+        index.close()
+
+    @pytest.mark.asyncio
+    async def test_event_during_slow_flush_gets_its_own_batch(self):
+        """An event queued while a batch is being applied is flushed afterwards, not left pending."""
+        storyblok = FakeStoryblok()
+        release = asyncio.Event()
+        fetch = storyblok.get_story_by_id
+
+        async def slow_fetch(story_id):
+            if story_id == 1:
+                await release.wait()
+            return await fetch(story_id)
+
+        storyblok.get_story_by_id = slow_fetch
+        index = ContentIndex(":memory:")
+        batcher = InvalidationBatcher(storyblok_client=storyblok, index=index, window=0.01)
+
+        batcher.enqueue(1, "published")
+        while storyblok.evicted != [1]:
+            await asyncio.sleep(0.01)
+        batcher.enqueue(2, "published")
+        release.set()
+        for _ in range(100):
+            if not batcher._pending and 2 in storyblok.fetched:
+                break
+            await asyncio.sleep(0.01)
+
+        assert batcher._pending == {}
+        assert storyblok.fetched == [1, 2]
+        assert storyblok.search_invalidations == ["1", "1"]
+        await batcher.aclose()
+        index.close()